@@ -0,0 +1,79 @@
+"""Constant-time sampling from discrete distributions.
+
+Classes
+-------
+AliasTable
+    Walker/Vose alias table over a finite discrete distribution.
+"""
+import numpy as np
+
+from pyrameter import rng
+
+
+class AliasTable(object):
+    """Walker/Vose alias table over a finite discrete distribution.
+
+    Parameters
+    ----------
+    p : array_like
+        Non-negative weights of each outcome. Weights are normalized, so they
+        need not sum to 1.
+
+    Notes
+    -----
+    Building the table takes time linear in the number of outcomes. After
+    that, each draw takes constant time: one uniform integer picks a column
+    and one uniform float picks between the column's outcome and its alias.
+    """
+    def __init__(self, p):
+        p = np.asarray(p, dtype=np.float64)
+        n = p.shape[0]
+        if n == 0 or not p.sum() > 0:
+            raise ValueError('Cannot build an alias table without weights.')
+
+        scaled = p * (n / p.sum())
+        self.prob = np.ones((n,), dtype=np.float64)
+        self.alias = np.arange(n)
+
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while len(small) > 0 and len(large) > 0:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # Leftovers differ from 1 only by rounding error.
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return self.prob.shape[0]
+
+    def sample(self, size=None, random_state=None):
+        """Draw outcomes from the distribution.
+
+        Parameters
+        ----------
+        size : int, optional
+            The number of outcomes to draw. If None, draw a single outcome.
+        random_state : `numpy.random.Generator` or `numpy.random.RandomState`, optional
+            The random source to draw from. Defaults to the global NumPy
+            random state.
+
+        Returns
+        -------
+        idx : int or `numpy.ndarray`
+            The index of each outcome drawn.
+        """
+        random_state = np.random if random_state is None else random_state
+        col = rng.integers(random_state, len(self), size=size)
+        u = random_state.random(size)
+        if size is None:
+            return int(col) if u < self.prob[col] else int(self.alias[col])
+        return np.where(u < self.prob[col], col, self.alias[col])
@@ -1,10 +1,13 @@
+from pyrameter.cache import SpaceCache
 from pyrameter.db import backend_factory
 from pyrameter.modelgroup import ModelGroup
 from pyrameter.scope import Scope
 
 
 def build(specification, db=None, method='random', complexity_sort=True,
-          priority_sort=True, *args, **kwargs):
+          priority_sort=True, seed=None, shard=0, num_shards=1, lazy=False,
+          compile=False, cache_dir=None, n_jobs=1, priority_estimator=None,
+          refresh_interval=None, scheduler=None, *args, **kwargs):
     """Construct hierarchical hyperparameter search spaces.
 
     Parameters
@@ -13,8 +16,44 @@ def build(specification, db=None, method='random', complexity_sort=True,
         The specification of the hyperparameter search space.
     db : str, optional
         Path to the database that will store search information and results.
-    method : {"random","tpe","gp"}
-        The hyperparameter generation strategy to use.
+    method : {"random","sobol","halton","tpe","gp"}
+        The hyperparameter generation strategy to use. "sobol" and "halton"
+        search over scrambled low-discrepancy sequences.
+    seed : int, optional
+        Seed for model selection and every model's random stream. If supplied,
+        the sequence of suggestions is reproducible (see
+        `pyrameter.ModelGroup.seed`).
+    shard : int, optional
+        The shard of each exhaustive grid to search. Default 0.
+    num_shards : int, optional
+        The number of workers the exhaustive grids are split between. Workers
+        building the same specification with different shards search disjoint
+        grid points. Default 1.
+    lazy : bool, optional
+        If True, split the specification lazily and only create models when
+        they are first selected. Default False.
+    compile : bool, optional
+        If True, compile each model's domains into flat arrays so that values
+        are sampled with vectorized kernels. Default False.
+    cache_dir : str, optional
+        Directory of split search spaces keyed by the content hash of the
+        specification. If supplied, the models are loaded from the cache when
+        the same specification was built before, and stored in it otherwise.
+        Lazy builds are only loaded from, never stored to, the cache.
+    n_jobs : int, optional
+        The number of processes used to split the specification and to
+        recompute model priorities. -1 uses one process per CPU. Splitting is
+        serial for lazy builds. Default 1.
+    priority_estimator : callable, optional
+        Estimator of the model priority heuristic. Defaults to
+        `pyrameter.models.priority.DEFAULT_ESTIMATOR`.
+    refresh_interval : float, optional
+        If supplied, refresh model priorities in a background thread every
+        ``refresh_interval`` seconds instead of when models are sorted.
+    scheduler : `pyrameter.scheduler.Scheduler` or str, optional
+        Bandit policy used to select models from their observed losses, e.g.
+        "ucb" or "thompson". Successive rejects needs a budget, so it must be
+        passed as an instance. Models are selected by rank if not supplied.
 
     Returns
     -------
@@ -31,14 +70,41 @@ def build(specification, db=None, method='random', complexity_sort=True,
     # Prep the specification as a scope
     if isinstance(specification, dict):
         specification = Scope(**specification)
-    
+
     # Set the generation model to the requested method
     specification.model = method
 
-    # Split the models into a ModelGroup and set the db backend
-    models = specification.split()
+    # Split the models, reusing a previous split of the same specification
+    models = None
+    if cache_dir is not None:
+        cache = SpaceCache(cache_dir)
+        key = specification.content_hash()
+        if compile:
+            key += '-compiled'
+        models = cache.load(key)
+
+    if models is None and lazy:
+        models = specification.iter_split()
+    elif models is None:
+        models = specification.split(n_jobs=n_jobs)
+        if cache_dir is not None:
+            if compile:
+                for model in models:
+                    model.compile()
+            cache.save(key, models)
+
+    # Group the models and set the db backend
     backend = backend_factory(db, *args, **kwargs)
     model_group = ModelGroup(models=models, backend=backend,
                              complexity_sort=complexity_sort,
-                             priority_sort=priority_sort)
+                             priority_sort=priority_sort,
+                             priority_estimator=priority_estimator,
+                             n_jobs=n_jobs, scheduler=scheduler)
+    if seed is not None:
+        model_group.seed(seed)
+    model_group.set_shard(shard, num_shards)
+    if compile:
+        model_group.compile()
+    if refresh_interval is not None:
+        model_group.start_priority_refresh(interval=refresh_interval)
     return model_group
@@ -0,0 +1,150 @@
+"""On-disk cache of split search spaces.
+
+Classes
+-------
+SpaceCache
+    Pickle-backed store of the models a specification splits into, keyed by
+    the content hash of the specification.
+
+Functions
+---------
+schema_version
+    Fingerprint of the attributes of the objects stored in the cache.
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+
+CACHE_VERSION = 2
+
+_SCHEMA = None
+
+
+def schema_version():
+    """Fingerprint of the attributes of the objects stored in the cache.
+
+    Returns
+    -------
+    schema : str
+        Hex digest of the instance attributes of every model class and
+        domain class, and of the slots of results and values.
+
+    Notes
+    -----
+    Pickles restore objects without running ``__init__``, so a model pickled
+    before an attribute was added loads without error and fails later. The
+    fingerprint is part of every cache file name, so entries written by code
+    with a different object layout are never read. ``CACHE_VERSION`` only
+    needs bumping when the meaning of an attribute changes.
+    """
+    global _SCHEMA
+    if _SCHEMA is None:
+        import scipy.stats
+        from pyrameter.domain import ContinuousDomain, DiscreteDomain, \
+                                     ExhaustiveDomain
+        from pyrameter.models.model import Result, Value
+        from pyrameter.models.model_factory import get_model_class
+
+        layout = {}
+        for name in ['random', 'sobol', 'halton', 'tpe', 'gp']:
+            cls = get_model_class(name)
+            layout[cls.__name__] = sorted(vars(cls()))
+        for domain in [ContinuousDomain(scipy.stats.uniform),
+                       DiscreteDomain([1]), ExhaustiveDomain([1])]:
+            layout[domain.__class__.__name__] = sorted(vars(domain))
+        for cls in [Result, Value]:
+            layout[cls.__name__] = list(cls.__slots__)
+
+        blob = json.dumps(layout, sort_keys=True).encode('utf-8')
+        _SCHEMA = hashlib.sha256(blob).hexdigest()[:16]
+    return _SCHEMA
+
+
+class SpaceCache(object):
+    """Directory of pickled, split search spaces.
+
+    Parameters
+    ----------
+    path : str
+        The cache directory. Created if it does not exist.
+
+    Attributes
+    ----------
+    path : str
+        Absolute path to the cache directory.
+
+    Notes
+    -----
+    Cache entries are only read and written as a whole and are replaced
+    atomically, so multiple drivers may share a cache directory. Entries are
+    keyed by `pyrameter.cache.schema_version` as well, so entries written by
+    other versions of pyrameter are ignored. Entries that are missing,
+    truncated, or not pickles are treated as missing.
+
+    See Also
+    --------
+    `pyrameter.Scope.content_hash`
+    """
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def __contains__(self, key):
+        return os.path.isfile(self.filename(key))
+
+    def filename(self, key):
+        """Get the path to the cache entry for ``key``."""
+        name = '{}-v{}-{}.pkl'.format(key, CACHE_VERSION, schema_version())
+        return os.path.join(self.path, name)
+
+    def load(self, key):
+        """Load the models stored under ``key``.
+
+        Parameters
+        ----------
+        key : str
+            The cache key, usually a scope content hash.
+
+        Returns
+        -------
+        models : list of `pyrameter.models.Model` or None
+            The cached models, or None if no usable entry exists.
+        """
+        try:
+            with open(self.filename(key), 'rb') as f:
+                return pickle.load(f)
+        except (EnvironmentError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, key, models):
+        """Store models under ``key``.
+
+        Parameters
+        ----------
+        key : str
+            The cache key, usually a scope content hash.
+        models : list of `pyrameter.models.Model`
+            The models to store.
+
+        Returns
+        -------
+        saved : bool
+            True if the models were stored, False if they could not be pickled
+            (e.g. domains with lambda callbacks) or written.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(models, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp, self.filename(key))
+        except (EnvironmentError, pickle.PicklingError, AttributeError,
+                TypeError):
+            return False
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return True
@@ -0,0 +1,312 @@
+"""Array-backed representation of a model's search space.
+
+Classes
+-------
+CompiledSpace
+    A model's domains lowered into flat NumPy arrays, with vectorized
+    sampling, encoding, and decoding kernels.
+"""
+import numpy as np
+from six import string_types
+
+from pyrameter.domain import ContinuousDomain, DiscreteDomain, \
+                             ExhaustiveDomain, _identity, _object_array
+
+
+CONTINUOUS = 0
+DISCRETE = 1
+EXHAUSTIVE = 2
+
+
+class CompiledSpace(object):
+    """A model's domains lowered into flat arrays.
+
+    Parameters
+    ----------
+    domains : list of `pyrameter.Domain`
+        The domains to compile, in model order.
+
+    Attributes
+    ----------
+    kinds : `numpy.ndarray`
+        Domain type code of each domain: 0 for continuous, 1 for discrete, 2
+        for exhaustive.
+    sizes : `numpy.ndarray`
+        The number of values in each discrete/exhaustive domain, 0 for
+        continuous domains.
+    offsets : `numpy.ndarray`
+        Offset of the first value of each domain in ``categories``.
+    categories : `numpy.ndarray`
+        Object array of the values of all discrete/exhaustive domains,
+        concatenated.
+    bounds : `numpy.ndarray`
+        Array of shape (d, 2) with the lower and upper bound of each domain's
+        numeric encoding.
+    distributions : list of `scipy.stats.rv_frozen`
+        The frozen distribution of each continuous domain, None for discrete
+        domains.
+    callbacks : list of callable
+        The callback of each continuous domain, None for domains without one.
+    paths : list of str
+        Path to each domain in the search hierarchy.
+    layout : list of tuple of str
+        The non-empty components of each path.
+
+    Notes
+    -----
+    Compiled spaces only hold arrays, strings, frozen distributions and the
+    domain values, so they are cheap to pickle and send to worker processes.
+    Callbacks are often lambdas, so they are left out of the pickled state: an
+    unpickled space maps values without them until
+    `pyrameter.compiled.CompiledSpace.attach` is called with its domains.
+
+    Continuous domains with identical distributions are sampled and mapped as
+    a single block. Discrete domains whose values are all numbers or all
+    strings are encoded by binary search over their sorted values.
+    """
+    def __init__(self, domains):
+        d = len(domains)
+        self.kinds = np.zeros(d, dtype=np.int8)
+        self.sizes = np.zeros(d, dtype=np.int64)
+        self.offsets = np.zeros(d, dtype=np.int64)
+        self.bounds = np.zeros((d, 2), dtype=np.float64)
+        self.distributions = [None] * d
+        self.callbacks = [None] * d
+        self.paths = [domain.path for domain in domains]
+        self.layout = [tuple(p for p in path.split('/') if p != '')
+                       for path in self.paths]
+
+        values = []
+        keys = [None] * d
+        self._tables = [None] * d
+        self._lists = [None] * d
+        self._sorted = [None] * d
+        for i, domain in enumerate(domains):
+            if isinstance(domain, ContinuousDomain):
+                self.kinds[i] = CONTINUOUS
+                self.distributions[i] = domain.domain.freeze(
+                    *domain.domain_args, **domain.domain_kwargs)
+                self.bounds[i] = self.distributions[i].support()
+                keys[i] = (domain.domain, tuple(domain.domain_args),
+                           sorted(domain.domain_kwargs.items()))
+            elif isinstance(domain, (DiscreteDomain, ExhaustiveDomain)):
+                self.kinds[i] = EXHAUSTIVE \
+                    if isinstance(domain, ExhaustiveDomain) else DISCRETE
+                self.sizes[i] = len(domain.domain)
+                self.offsets[i] = len(values)
+                self.bounds[i] = (0, len(domain.domain) - 1)
+                self._tables[i] = domain._index
+                self._lists[i] = domain.domain
+                self._sorted[i] = self._sort_values(domain.domain)
+                values.extend(domain.domain)
+            else:
+                msg = 'Cannot compile domain of type {}.'
+                raise TypeError(msg.format(type(domain).__name__))
+        self.categories = _object_array(values)
+        self.attach(domains)
+
+        # Group continuous domains with the same distribution.
+        self._groups = []
+        seen = []
+        for i in np.flatnonzero(self.kinds == CONTINUOUS):
+            for j, key in enumerate(seen):
+                if key[0] is keys[i][0] and key[1:] == keys[i][1:]:
+                    self._groups[j][1].append(i)
+                    break
+            else:
+                seen.append(keys[i])
+                self._groups.append((self.distributions[i], [i]))
+        self._groups = [(dist, np.array(cols)) for dist, cols in self._groups]
+        self._discrete = np.flatnonzero(self.kinds != CONTINUOUS)
+
+    def __getstate__(self):
+        # Callbacks are often lambdas or closures, which cannot be pickled
+        state = self.__dict__.copy()
+        state['callbacks'] = [None] * len(self)
+        return state
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def attach(self, domains):
+        """Read the callbacks of the compiled domains.
+
+        Parameters
+        ----------
+        domains : list of `pyrameter.Domain`
+            The domains this space was compiled from, in the same order.
+        """
+        self.callbacks = [None] * len(self)
+        for i, domain in enumerate(domains):
+            callback = getattr(domain, 'callback', _identity)
+            if self.kinds[i] == CONTINUOUS and callback is not _identity:
+                self.callbacks[i] = callback
+
+    def ppf(self, u, columns=None):
+        """Map a matrix of quantiles into domain values.
+
+        Parameters
+        ----------
+        u : `numpy.ndarray`
+            Array of shape (n, d) of quantiles in [0, 1).
+        columns : array-like of int, optional
+            The domains to map. Defaults to all domains.
+
+        Returns
+        -------
+        columns : list of `numpy.ndarray`
+            One array of ``n`` values per domain, None for domains not in
+            ``columns``.
+        """
+        selected = np.ones(len(self), dtype=bool)
+        if columns is not None:
+            selected[:] = False
+            selected[np.asarray(columns, dtype=np.int64)] = True
+
+        out = [None] * len(self)
+        for dist, cols in self._groups:
+            cols = cols[selected[cols]]
+            if len(cols) == 0:
+                continue
+            vals = dist.ppf(u[:, cols])
+            for j, col in enumerate(cols):
+                out[col] = vals[:, j]
+
+        cols = self._discrete[selected[self._discrete]]
+        if len(cols) > 0:
+            idx = self.sizes[cols] * u[:, cols]
+            vals = self.categories[self.offsets[cols] + self._clip(idx, cols)]
+            for j, col in enumerate(cols):
+                out[col] = vals[:, j]
+
+        return self._apply_callbacks(out)
+
+    def sample(self, n, random_state, columns=None):
+        """Draw ``n`` values from every domain in one vectorized pass.
+
+        Parameters
+        ----------
+        n : int
+            The number of values to draw.
+        random_state : `numpy.random.Generator`
+            The random stream to draw from.
+        columns : array-like of int, optional
+            The domains to sample. Defaults to all domains.
+
+        Returns
+        -------
+        columns : list of `numpy.ndarray`
+            One array of ``n`` values per domain, None for domains not in
+            ``columns``.
+        """
+        return self.ppf(random_state.random((n, len(self))), columns=columns)
+
+    def encode(self, rows):
+        """Encode rows of domain values as a numeric matrix.
+
+        Continuous values are kept as-is and discrete values are replaced by
+        their index in the domain.
+
+        Parameters
+        ----------
+        rows : list of list
+            ``n`` rows with one value per domain.
+
+        Returns
+        -------
+        features : `numpy.ndarray`
+            Array of shape (n, d).
+        """
+        features = np.zeros((len(rows), len(self)), dtype=np.float64)
+        for j, column in enumerate(zip(*rows)):
+            if self.kinds[j] == CONTINUOUS:
+                features[:, j] = column
+            else:
+                features[:, j] = self._encode_column(j, column)
+        return features
+
+    def _encode_column(self, j, column):
+        """Find the indices of a column of values in a discrete domain."""
+        if self._sorted[j] is not None:
+            keys, order = self._sorted[j]
+            try:
+                vals = np.asarray(column)
+            except ValueError:
+                # Ragged sequences of values
+                vals = None
+            if vals is None or vals.ndim != 1:
+                kind = None
+            else:
+                kind = 'f' if vals.dtype.kind in 'biuf' else vals.dtype.kind
+            if kind == keys.dtype.kind:
+                vals = vals.astype(keys.dtype.type)
+                pos = np.minimum(np.searchsorted(keys, vals), len(keys) - 1)
+                return np.where(keys[pos] == vals, order[pos], np.nan)
+        return [self.index(j, val) for val in column]
+
+    @staticmethod
+    def _sort_values(values):
+        """Sort the values of a discrete domain for binary search.
+
+        Returns
+        -------
+        sorted : tuple of `numpy.ndarray` or None
+            The sorted values and their indices in the domain, or None if
+            the values are not all numbers or all strings.
+        """
+        if len(values) == 0:
+            return None
+        elif all(isinstance(v, (bool, int, float, np.number))
+                 for v in values):
+            try:
+                keys = np.asarray(values, dtype=np.float64)
+            except (TypeError, ValueError, OverflowError):
+                return None
+        elif all(isinstance(v, string_types) for v in values):
+            keys = np.asarray(values, dtype=np.str_)
+        else:
+            return None
+        # Equal values map to the first of them, like the domain's lookup.
+        order = np.argsort(keys, kind='mergesort')
+        return keys[order], order
+
+    def index(self, column, value):
+        """Get the index of ``value`` in a discrete domain, or NaN."""
+        idx = self._tables[column].index(self._lists[column], value)
+        return np.nan if idx is None else idx
+
+    def decode(self, features):
+        """Decode a numeric matrix into domain values.
+
+        Discrete features are rounded to the nearest index within the domain.
+
+        Parameters
+        ----------
+        features : `numpy.ndarray`
+            Array of shape (n, d).
+
+        Returns
+        -------
+        columns : list of `numpy.ndarray`
+            One array of ``n`` values per domain.
+        """
+        features = np.asarray(features, dtype=np.float64)
+        out = [features[:, j] for j in range(len(self))]
+        cols = self._discrete
+        if len(cols) > 0:
+            idx = np.round(features[:, cols])
+            vals = self.categories[self.offsets[cols] + self._clip(idx, cols)]
+            for j, col in enumerate(cols):
+                out[col] = vals[:, j]
+        return out
+
+    def _clip(self, idx, cols):
+        """Floor and clip fractional indices into each domain's range."""
+        idx = np.floor(idx).astype(np.int64)
+        return np.clip(idx, 0, self.sizes[cols] - 1)
+
+    def _apply_callbacks(self, out):
+        for j, callback in enumerate(self.callbacks):
+            if callback is not None and out[j] is not None:
+                out[j] = np.array([callback(v) for v in out[j]])
+        return out
@@ -1,8 +1,88 @@
-import uuid
+import copy
 
 import numpy as np
 import scipy.stats
-from scipy.stats import randint
+
+from pyrameter import ids, rng
+
+
+def _identity(x):
+    return x
+
+
+def _object_array(values):
+    """Store arbitrary objects in a 1-D array without NumPy unpacking them."""
+    arr = np.empty(len(values), dtype=object)
+    for i, val in enumerate(values):
+        arr[i] = val
+    return arr
+
+
+def _hashable(value):
+    """Convert a value into an equivalent hashable key.
+
+    Lists, tuples, sets and dicts are converted recursively into tagged
+    tuples/frozensets so that they may be used as dictionary keys.
+
+    Raises
+    ------
+    TypeError
+        Raised if ``value`` cannot be converted into a hashable key.
+    """
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_hashable(v) for v in value))
+    elif isinstance(value, dict):
+        return (dict, frozenset((_hashable(k), _hashable(v))
+                                for k, v in value.items()))
+    elif isinstance(value, set):
+        return (set, frozenset(_hashable(v) for v in value))
+    raise TypeError('unhashable type: {}'.format(type(value).__name__))
+
+
+class _IndexTable(object):
+    """Hash-based lookup table mapping discrete domain values to indices.
+
+    Parameters
+    ----------
+    values : list
+        The values in the domain.
+
+    Notes
+    -----
+    Values that cannot be converted into a hashable key are left out of the
+    table. Lookups that miss the table fall back to a linear search of
+    ``values`` only if the domain contained such values.
+    """
+    def __init__(self, values):
+        self.table = {}
+        self.complete = True
+        for i, val in enumerate(values):
+            try:
+                self.table.setdefault(_hashable(val), i)
+            except TypeError:
+                self.complete = False
+
+    def index(self, values, val):
+        """Find the index of ``val`` in ``values``, or None if not present."""
+        try:
+            return self.table[_hashable(val)]
+        except KeyError:
+            if self.complete:
+                return None
+        except TypeError:
+            pass
+
+        try:
+            idx = values.index(val)
+        except ValueError:
+            idx = None
+        return idx
 
 
 class Domain(object):
@@ -14,17 +94,21 @@ class Domain(object):
         The set or range of values to search.
     path : str
         Path to this domain in the search hierarchy.
+    random_state : `numpy.random.Generator` or `numpy.random.RandomState`, optional
+        The random stream to draw values from. If not supplied, a stream is
+        spawned from `pyrameter.rng` the first time one is needed.
 
     Notes
     -----
     ``path`` is automatically computed when models are created during the
     splitting process.
     """
-    def __init__(self, domain=None, path='', callback=None):
-        self.id = str(uuid.uuid4())
+    def __init__(self, domain=None, path='', callback=None, random_state=None):
+        self.id = ids.new_id()
         self.domain = domain
         self.path = path
-        self.callback = callback if callable(callback) else lambda x: x
+        self.callback = callback if callable(callback) else _identity
+        self.random_state = random_state
         self._complexity = None
 
     def __getitem__(self, key):
@@ -49,7 +133,91 @@ class Domain(object):
     def __str__(self):
         return str(self.to_json())
 
-    def generate(self, index=False):
+    @property
+    def random_state(self):
+        # Streams are created lazily so that unused and copied domains do not
+        # carry generator state around.
+        if self._random_state is None:
+            self._random_state = rng.default_rng()
+        return self._random_state
+
+    @random_state.setter
+    def random_state(self, value):
+        self._random_state = value
+
+    def bind(self, path):
+        """Create a lightweight copy of this domain at ``path``.
+
+        The copy shares the values, distribution, and lookup tables of this
+        domain, which are never modified after construction. It gets its own
+        id, so that results can tell copies of the same domain apart, and
+        its own random stream and generation state. Binding is constant-time
+        regardless of the size of the domain.
+
+        Parameters
+        ----------
+        path : str
+            Path to the copy in the search hierarchy.
+
+        Returns
+        -------
+        domain : `pyrameter.Domain`
+            The bound copy of this domain.
+        """
+        bound = copy.copy(self)
+        bound.id = ids.new_id()
+        bound.path = path
+        bound._random_state = None
+        return bound
+
+    def seed(self, seed=None):
+        """Reset the random stream of this domain.
+
+        Parameters
+        ----------
+        seed : int or `numpy.random.SeedSequence`, optional
+            The seed of the new stream. If not supplied, a new stream is
+            spawned from `pyrameter.rng`.
+        """
+        self.random_state = rng.default_rng(seed)
+
+    def generate(self, index=False, size=None, random_state=None):
+        raise NotImplementedError
+
+    def generate_batch(self, n, index=False, random_state=None):
+        """Generate multiple values from this domain in a single draw.
+
+        Parameters
+        ----------
+        n : int
+            The number of values to generate.
+        index : bool
+            If True, return the indices of the generated values along with the
+            values.
+        random_state : `numpy.random.Generator`, optional
+            The random stream to draw from instead of this domain's own.
+
+        Returns
+        -------
+        values : `numpy.ndarray`
+            ``n`` values drawn from this domain.
+        indices : `numpy.ndarray`, optional
+            The indices of ``values`` in this domain.
+        """
+        return self.generate(index=index, size=n, random_state=random_state)
+
+    def ppf(self, q):
+        """Map quantiles in [0, 1) to values in this domain.
+
+        Parameters
+        ----------
+        q : float or `numpy.ndarray`
+            The quantile(s) to map, e.g. from a low-discrepancy sequence.
+
+        Returns
+        -------
+        The value(s) in this domain at quantile(s) ``q``.
+        """
         raise NotImplementedError
 
     def complexity(self):
@@ -116,6 +284,8 @@ class ContinuousDomain(Domain):
         are drawn.
     path : str
         Path to this domain in the search hierarchy.
+    random_state : `numpy.random.Generator` or `numpy.random.RandomState`, optional
+        The random stream to draw values from.
 
     Other Parameters
     ----------------
@@ -128,16 +298,12 @@ class ContinuousDomain(Domain):
                  *args, **kwargs):
         if not isinstance(domain, scipy.stats.rv_continuous):
             domain = getattr(scipy.stats, str(domain))
-        if random_state:
-            self.random_state = random_state
-        else:
-            self.random_state = \
-                np.random.RandomState(np.random.randint(2147483647))
         self.domain_args = args
         self.domain_kwargs = kwargs
         super(ContinuousDomain, self).__init__(domain,
                                                path=path,
-                                               callback=callback)
+                                               callback=callback,
+                                               random_state=random_state)
 
     @property
     def complexity(self):
@@ -163,18 +329,55 @@ class ContinuousDomain(Domain):
             self._complexity = 2.0 + np.linalg.norm(b - a)
         return self._complexity
 
-    def generate(self, index=False):
+    def generate(self, index=False, size=None, random_state=None):
         """Generate a value from this domain.
 
+        Parameters
+        ----------
+        index : bool
+            Unused. Continuous values act as their own index.
+        size : int, optional
+            If supplied, draw this many values at once.
+        random_state : `numpy.random.Generator`, optional
+            The random stream to draw from instead of this domain's own.
+
         Returns
         -------
-        value : float
-            A value drawn from this domain's probability distribution.
+        value : float or `numpy.ndarray`
+            A value drawn from this domain's probability distribution, or an
+            array of ``size`` values if ``size`` is supplied.
         """
-        return self.callback(
-            self.domain.rvs(*self.domain_args,
-                            random_state=self.random_state,
-                            **self.domain_kwargs))
+        if random_state is None:
+            random_state = self.random_state
+        value = self.domain.rvs(*self.domain_args,
+                                size=size,
+                                random_state=random_state,
+                                **self.domain_kwargs)
+        if size is None:
+            return self.callback(value)
+        if self.callback is not _identity:
+            value = np.array([self.callback(v) for v in value])
+        return value
+
+    def ppf(self, q):
+        """Map quantiles in [0, 1) to values in this domain.
+
+        Parameters
+        ----------
+        q : float or `numpy.ndarray`
+            The quantile(s) to map, e.g. from a low-discrepancy sequence.
+
+        Returns
+        -------
+        value : float or `numpy.ndarray`
+            The value(s) of this domain's distribution at quantile(s) ``q``.
+        """
+        value = self.domain.ppf(q, *self.domain_args, **self.domain_kwargs)
+        if np.ndim(value) == 0:
+            return self.callback(value)
+        if self.callback is not _identity:
+            value = np.array([self.callback(v) for v in value])
+        return value
 
     def to_json(self):
         """Convert this domain into a JSON-serializable format.
@@ -204,19 +407,23 @@ class DiscreteDomain(Domain):
         The set of objects comprising this domain.
     path : str
         Path to this domain in the search hierarchy.
+    random_state : `numpy.random.Generator` or `numpy.random.RandomState`, optional
+        The random stream to draw values from.
 
     Notes
     -----
     If a single, non-list object is provided to a DiscreteDomain, it will be
     wrapped in a list to represent a domain with a single value.
     """
-    def __init__(self, domain, path=''):
+    def __init__(self, domain, path='', random_state=None):
         try:
-            self.rng = randint(0, len(domain))
-        except AttributeError:
+            len(domain)
+        except (AttributeError, TypeError):
             domain = [domain]
-            self.rng = randint(0, len(domain))
-        super(DiscreteDomain, self).__init__(domain, path=path)
+        self._values = _object_array(domain)
+        self._index = _IndexTable(domain)
+        super(DiscreteDomain, self).__init__(domain, path=path,
+                                             random_state=random_state)
 
     @property
     def complexity(self):
@@ -240,7 +447,7 @@ class DiscreteDomain(Domain):
             self._complexity = 2.0 - (1.0 / len(self.domain))
         return self._complexity
 
-    def generate(self, index=False):
+    def generate(self, index=False, size=None, random_state=None):
         """Generate a value from this domain.
 
         Parameters
@@ -248,25 +455,51 @@ class DiscreteDomain(Domain):
         index : bool
             If True, return the index of the generated value along with the
             value.
+        size : int, optional
+            If supplied, draw this many values at once.
+        random_state : `numpy.random.Generator`, optional
+            The random stream to draw from instead of this domain's own.
 
         Returns
         -------
         value
-            A value drawn from this domain.
-        index : int, optional
+            A value drawn from this domain, or an array of ``size`` values if
+            ``size`` is supplied.
+        index : int or `numpy.ndarray`, optional
             The index of ``value`` in this domain.
         """
-        idx = self.rng.rvs()
-        value = self.domain[idx]
+        if random_state is None:
+            random_state = self.random_state
+        idx = rng.integers(random_state, len(self.domain), size=size)
+        value = self.domain[idx] if size is None else self._values[idx]
         return value if not index else (value, idx)
 
+    def ppf(self, q):
+        """Map quantiles in [0, 1) to values in this domain.
+
+        Each value in the domain is assigned an equal-width bin of [0, 1).
+
+        Parameters
+        ----------
+        q : float or `numpy.ndarray`
+            The quantile(s) to map, e.g. from a low-discrepancy sequence.
+
+        Returns
+        -------
+        value
+            The value(s) in this domain at quantile(s) ``q``.
+        """
+        idx = np.clip(np.floor(np.asarray(q) * len(self.domain)).astype(int),
+                      0, len(self.domain) - 1)
+        return self._values[idx] if idx.ndim > 0 else self.domain[int(idx)]
+
     def map_to_domain(self, idx, bound=False):
         """Map a index to its value in the domain.
 
         Parameters
         ----------
-        idx : int
-            The index to retrieve in the domain.
+        idx : int or `numpy.ndarray`
+            The index or indices to retrieve in the domain.
         bound : bool
             If True, return the first or last element of the domain if ``idx``
             < 0 or idx > |domain|, respectively.
@@ -276,6 +509,11 @@ class DiscreteDomain(Domain):
         The value at ``idx`` in the domain if the domain is discrete, else
         return the index.
         """
+        if isinstance(idx, np.ndarray):
+            if bound:
+                idx = np.clip(np.round(idx).astype(int), 0,
+                              len(self.domain) - 1)
+            return self._values[idx]
         if bound:
             idx = int(round(idx))
             idx = min(len(self.domain) - 1, max(0, idx))
@@ -298,11 +536,7 @@ class DiscreteDomain(Domain):
         The index of ``value`` in the domain if the domain is discrete, else
         return the value.
         """
-        try:
-            idx = self.domain.index(val)
-        except ValueError:
-            idx = None
-        return idx
+        return self._index.index(self.domain, val)
 
     def to_json(self):
         """Convert this domain into a JSON-serializable format.
@@ -341,6 +575,8 @@ class ExhaustiveDomain(Domain):
         self.idx = idx
         if not isinstance(domain, list):
             domain = [domain]
+        self._values = _object_array(domain)
+        self._index = _IndexTable(domain)
         super(ExhaustiveDomain, self).__init__(domain, path=path)
 
     @property
@@ -365,7 +601,7 @@ class ExhaustiveDomain(Domain):
             self._complexity = 2.0 - (1.0 / len(self.domain))
         return self._complexity
 
-    def generate(self, index=False):
+    def generate(self, index=False, size=None, random_state=None):
         """Generate a value from this domain.
 
         Parameters
@@ -373,26 +609,55 @@ class ExhaustiveDomain(Domain):
         index : bool
             If True, return the index of the generated value along with the
             value.
+        size : int, optional
+            If supplied, return the next ``size`` values in order.
+        random_state : `numpy.random.Generator`, optional
+            Unused. Exhaustive domains are iterated in order.
 
         Returns
         -------
         value
-            A value drawn from this domain.
-        index : int, optional
+            A value drawn from this domain, or an array of ``size`` values if
+            ``size`` is supplied.
+        index : int or `numpy.ndarray`, optional
             The index of ``value`` in this domain.
         """
-        idx = self.idx
-        val = self.domain[idx]
-        self.idx = (self.idx + 1) % len(self.domain)
+        if size is None:
+            idx = self.idx
+            val = self.domain[idx]
+            self.idx = (self.idx + 1) % len(self.domain)
+        else:
+            idx = (self.idx + np.arange(size)) % len(self.domain)
+            val = self._values[idx]
+            self.idx = int((self.idx + size) % len(self.domain))
         return val if not index else (val, idx)
 
+    def ppf(self, q):
+        """Map quantiles in [0, 1) to values in this domain.
+
+        Each value in the domain is assigned an equal-width bin of [0, 1).
+
+        Parameters
+        ----------
+        q : float or `numpy.ndarray`
+            The quantile(s) to map, e.g. from a low-discrepancy sequence.
+
+        Returns
+        -------
+        value
+            The value(s) in this domain at quantile(s) ``q``.
+        """
+        idx = np.clip(np.floor(np.asarray(q) * len(self.domain)).astype(int),
+                      0, len(self.domain) - 1)
+        return self._values[idx] if idx.ndim > 0 else self.domain[int(idx)]
+
     def map_to_domain(self, idx, bound=False):
         """Map a index to its value in the domain.
 
         Parameters
         ----------
-        idx : int
-            The index to retrieve in the domain.
+        idx : int or `numpy.ndarray`
+            The index or indices to retrieve in the domain.
         bound : bool
             If True, return the first or last element of the domain if ``idx``
             < 0 or idx > |domain|, respectively.
@@ -402,6 +667,11 @@ class ExhaustiveDomain(Domain):
         The value at ``idx`` in the domain if the domain is discrete, else
         return the index.
         """
+        if isinstance(idx, np.ndarray):
+            if bound:
+                idx = np.clip(np.round(idx).astype(int), 0,
+                              len(self.domain) - 1)
+            return self._values[idx]
         if bound:
             idx = int(round(idx))
             idx = min(len(self.domain) - 1, max(0, idx))
@@ -424,11 +694,7 @@ class ExhaustiveDomain(Domain):
         The index of ``value`` in the domain if the domain is discrete, else
         return the value.
         """
-        try:
-            idx = self.domain.index(val)
-        except ValueError:
-            idx = None
-        return idx
+        return self._index.index(self.domain, val)
 
     def to_json(self):
         """Convert this domain into a JSON-serializable format.
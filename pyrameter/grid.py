@@ -0,0 +1,143 @@
+"""Mixed-radix enumeration of exhaustive search grids.
+
+Classes
+-------
+Grid
+    Random-access, shardable enumeration of the Cartesian product of a set of
+    discrete axes.
+"""
+import numpy as np
+
+
+class Grid(object):
+    """Random-access enumeration of the Cartesian product of discrete axes.
+
+    Each point of the grid is identified by a single integer, which is mapped
+    to one index per axis in mixed-radix order: the last axis varies fastest,
+    matching the order of `itertools.product`. Any point can be computed
+    directly from its integer, so the grid can be resumed or split between
+    workers without coordination.
+
+    Parameters
+    ----------
+    radices : list of int
+        The number of values along each axis.
+    shard : int, optional
+        The shard of the grid to enumerate. Default 0.
+    num_shards : int, optional
+        The number of shards the grid is split into. Shard ``s`` contains the
+        points ``s``, ``s + num_shards``, ``s + 2 * num_shards``, etc.
+        Default 1.
+
+    Attributes
+    ----------
+    total : int
+        The number of points in the full grid.
+    size : int
+        The number of points in this shard.
+
+    Notes
+    -----
+    Enumeration wraps around to the start of the shard once every point in it
+    has been visited. If there are more shards than grid points, the surplus
+    shards are empty rather than repeating points of other shards.
+    """
+    def __init__(self, radices, shard=0, num_shards=1):
+        if num_shards < 1 or not 0 <= shard < num_shards:
+            msg = 'Invalid shard {} of {}.'.format(shard, num_shards)
+            raise ValueError(msg)
+        self.radices = [int(r) for r in radices]
+        self.shard = int(shard)
+        self.num_shards = int(num_shards)
+
+        self.total = 1
+        for r in self.radices:
+            self.total *= r
+
+        # Place values of each axis, used to vectorize decoding.
+        strides = [1] * len(self.radices)
+        for i in range(len(self.radices) - 2, -1, -1):
+            strides[i] = strides[i + 1] * self.radices[i + 1]
+        self._strides = strides
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def size(self):
+        """The number of points in this shard."""
+        if self.shard >= self.total:
+            return 0
+        return (self.total - self.shard - 1) // self.num_shards + 1
+
+    def __getitem__(self, i):
+        return self.config(self.index(i))
+
+    def index(self, i):
+        """Get the grid index of the ``i``-th point in this shard.
+
+        Parameters
+        ----------
+        i : int or `numpy.ndarray`
+            Position(s) within this shard. Positions past the end of the shard
+            wrap around.
+
+        Returns
+        -------
+        k : int or `numpy.ndarray`
+            The index of the point(s) in the full grid.
+
+        Raises
+        ------
+        IndexError
+            Raised if this shard is empty.
+        """
+        size = self.size
+        if size == 0:
+            msg = 'Shard {} of {} of a grid with {} points is empty.'
+            raise IndexError(msg.format(self.shard, self.num_shards,
+                                        self.total))
+        return self.shard + (i % size) * self.num_shards
+
+    def config(self, k):
+        """Decode a grid index into one index per axis.
+
+        Parameters
+        ----------
+        k : int
+            The index of the point in the full grid.
+
+        Returns
+        -------
+        digits : list of int
+            The index along each axis.
+        """
+        digits = []
+        for r in reversed(self.radices):
+            k, d = divmod(k, r)
+            digits.append(d)
+        return digits[::-1]
+
+    def configs(self, start, n):
+        """Decode ``n`` consecutive points of this shard.
+
+        Parameters
+        ----------
+        start : int
+            The position within this shard of the first point.
+        n : int
+            The number of points to decode.
+
+        Returns
+        -------
+        digits : `numpy.ndarray`
+            Array of shape (``n``, number of axes) holding the index along each
+            axis for every point.
+        """
+        if self.total > np.iinfo(np.int64).max:
+            # Too large for fixed-width integers, decode in Python instead.
+            return np.array([self[i] for i in range(start, start + n)],
+                            dtype=np.int64).reshape(n, len(self.radices))
+        k = self.index(np.arange(start, start + n, dtype=np.int64))
+        strides = np.array(self._strides, dtype=np.int64)
+        return (k[:, None] // strides) % np.array(self.radices, dtype=np.int64)
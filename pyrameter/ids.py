@@ -0,0 +1,101 @@
+"""Unique ids for models, results and domains.
+
+Functions
+---------
+new_id
+    Create a new id with the current id generator.
+set_id_generator
+    Replace the id generator used throughout pyrameter.
+uuid_id
+    Create a random UUID4 string id.
+
+Classes
+-------
+IdGenerator
+    Counter-based generator of ids unique across processes.
+"""
+import itertools
+import os
+import uuid
+import weakref
+
+
+class IdGenerator(object):
+    """Generate ids from a per-process random prefix and a counter.
+
+    Ids are strings of the form '<prefix hex>-<counter hex>'.
+
+    Notes
+    -----
+    The prefix is drawn once per process from the OS entropy pool, and drawn
+    again in forked children, so ids are unique across worker processes with
+    overwhelming probability without any coordination. After that, creating
+    an id only advances a counter. Generated ids never have the 36-character
+    layout of UUID4 strings, so they cannot collide with UUID4 ids already in
+    storage.
+    """
+    def __init__(self):
+        self._reset()
+        _generators.add(self)
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._prefix = '{:016x}'.format(uuid.uuid4().int >> 64)
+        self._counter = itertools.count()
+
+    def __call__(self):
+        # Without fork hooks, detect forked children by their pid instead.
+        if not _FORK_HOOKS and self._pid != os.getpid():
+            self._reset()
+        return '{}-{:x}'.format(self._prefix, next(self._counter))
+
+
+def _reset_after_fork():
+    for generator in list(_generators):
+        generator._reset()
+
+
+_generators = weakref.WeakSet()
+_FORK_HOOKS = hasattr(os, 'register_at_fork')
+if _FORK_HOOKS:
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def uuid_id():
+    """Create a random UUID4 string id, as used before `IdGenerator`."""
+    return str(uuid.uuid4())
+
+
+_generator = IdGenerator()
+
+
+def new_id():
+    """Create a new id with the current id generator.
+
+    Returns
+    -------
+    id : str
+        The new id.
+    """
+    return _generator()
+
+
+def set_id_generator(generator=None):
+    """Replace the id generator used throughout pyrameter.
+
+    Parameters
+    ----------
+    generator : callable, optional
+        Function taking no arguments that returns a new, globally unique id
+        each time it is called, e.g. `pyrameter.ids.uuid_id`. Ids must be
+        strings. If not supplied, restore the default `IdGenerator`.
+
+    Returns
+    -------
+    previous : callable
+        The generator that was replaced.
+    """
+    global _generator
+    previous = _generator
+    _generator = IdGenerator() if generator is None else generator
+    return previous
@@ -1,10 +1,61 @@
+import collections
+import multiprocessing
 import os
+import pickle
+import threading
+import warnings
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 import numpy as np
 import scipy.stats
 
+from pyrameter import rng
 from pyrameter.models.model import Model
+from pyrameter.alias import AliasTable
 from pyrameter.db import backend_factory
+from pyrameter.ranking import RankIndex
+from pyrameter.scheduler import get_scheduler
+
+
+def _estimate_priority(args):
+    """Compute a model priority in a worker process."""
+    estimator, vec, seed = args
+    return float(estimator(vec[:, :-1], vec[:, -1], rng.default_rng(seed)))
+
+
+class _PriorityRefresher(threading.Thread):
+    """Daemon thread that periodically refreshes stale model priorities."""
+    def __init__(self, group, interval):
+        super(_PriorityRefresher, self).__init__()
+        self.daemon = True
+        self.group = group
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.group.refresh_priorities()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class _RankWatcher(object):
+    """Mark a model of a group for re-ranking when its heuristics change.
+
+    Holds the group weakly, so that models do not keep their group alive.
+    """
+    def __init__(self, group, model_id):
+        self.group = weakref.ref(group)
+        self.model_id = model_id
+
+    def __call__(self):
+        group = self.group()
+        if group is not None:
+            group._mark_unranked(self.model_id)
 
 
 class ModelGroup(object):
@@ -12,12 +63,24 @@ class ModelGroup(object):
 
     Parameters
     ----------
-    models : list of `pyrameter.models.Model`, optional
-        The models to include in this group.
+    models : list or iterator of `pyrameter.models.Model`, optional
+        The models to include in this group. If an iterator (e.g. from
+        `pyrameter.Scope.iter_split`), models are only created from it when
+        they are first needed for selection.
     complexity_sort : bool
         If true, sort models in this group by complexity.
     priority_sort : bool
         If true, sort models in this group by priority.
+    priority_estimator : callable, optional
+        Estimator of the priority heuristic used by every model in this group
+        (see `pyrameter.models.priority`). Defaults to each model's own.
+    n_jobs : int, optional
+        The number of processes used to recompute model priorities. -1 uses
+        one process per CPU. Default 1. The processes are started on the
+        first parallel refresh and kept until `pyrameter.ModelGroup.close`.
+    scheduler : `pyrameter.scheduler.Scheduler` or str, optional
+        Policy used to select models from their observed losses instead of
+        their complexity/priority rank (see `pyrameter.scheduler`).
 
     Attributes
     ----------
@@ -26,23 +89,79 @@ class ModelGroup(object):
     model_ids : list of str
         The ids of the models in this group. Used for sorting and selecting
         models during hyperparameter generation.
+    random_state : `numpy.random.Generator`
+        The random stream that models are selected with. Seeded by
+        `pyrameter.ModelGroup.seed`.
+
+    Notes
+    -----
+    When built from an iterator, only models that have been created count
+    towards the length of the group, sorting, and saving.
+
+    Groups may be used as context managers, which call
+    `pyrameter.ModelGroup.close` on exit.
     """
     def __init__(self, models=None, backend=None, complexity_sort=True,
-                 priority_sort=True):
+                 priority_sort=True, priority_estimator=None, n_jobs=1,
+                 scheduler=None):
         self.models = {}
         self.model_ids = []
         self.former_model_ids = []
         self.former_models = {}
         self.complexity_sort = complexity_sort
         self.priority_sort = priority_sort
-
-        if models is not None:
-            models = [models] if not isinstance(models, list) else models
+        self.priority_estimator = priority_estimator
+        self.n_jobs = n_jobs
+
+        self._pending = None
+        self._seed_sequence = None
+        self._random_state = None
+        self._shard = (0, 1)
+        self._compile = False
+        self._result_models = {}
+        self._refresher = None
+        self._executor = None
+        self._executor_size = None
+        self._executor_lock = threading.Lock()
+        self._selector = None
+        self._ranking = RankIndex()
+        self._ranked_by = None
+        self._unranked = set()
+        self._unranked_lock = threading.Lock()
+        self._watchers = {}
+        self.scheduler = None
+
+        if isinstance(models, Model):
+            models = [models]
+        if isinstance(models, (list, tuple)):
             for model in models:
                 self.add_model(model)
+        elif models is not None:
+            self._pending = iter(models)
 
         self.backend = backend_factory(backend) \
             if backend is not None else None
+        if scheduler is not None:
+            self.set_scheduler(scheduler)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Stop background refreshes and shut down the worker processes.
+
+        The group remains usable: a later parallel refresh starts new
+        worker processes.
+        """
+        self.stop_priority_refresh()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+                self._executor_size = None
 
     def __contains__(self, id):
         return id in self.models
@@ -51,12 +170,12 @@ class ModelGroup(object):
         return self.models[model_id]
 
     def __eq__(self, other):
-        return all(
-            any(
-                [[i == j for _, j in other.models.items()]
-                    for _, i in self.models.items()]
-            )
-        )
+        return isinstance(other, ModelGroup) and \
+            sorted(m.signature for m in self.models.values()) == \
+            sorted(m.signature for m in other.models.values())
+
+    def __ne__(self, other):
+        return not self == other
 
     def __len__(self):
         return len(self.model_ids)
@@ -84,21 +203,65 @@ class ModelGroup(object):
         if isinstance(model, Model):
             if not self.priority_sort:
                 model.priority_update_freq = -1
+            if self.priority_estimator is not None:
+                model.priority_estimator = self.priority_estimator
+            if self._refresher is not None:
+                model.defer_priority = True
             # Update if already present. Otherwise, add new.
             if not (model.id in self.models):
                 self.model_ids.append(model.id)
+            if not (model.id in self.former_models):
+                # Apply group-wide settings to models created after them.
+                if self._seed_sequence is not None:
+                    model.seed(rng.spawn(parent=self._seed_sequence))
+                if self._shard != (0, 1):
+                    model.set_shard(*self._shard)
+                if self._compile:
+                    model.compile()
             self.models[model.id] = model
             if not (model.id in self.former_models):
                 self.former_model_ids.append(model.id)
             self.former_models[model.id] = model
+            for r in model.results:
+                self._result_models[r.id] = model.id
+            self._watch(model)
+            self._schedule(model)
         else:
             msg = '{} is not an instance of pyrameter.models.Model'
             raise TypeError(msg.format(model))
 
     def clear(self):
         """Clear this model group of all models."""
+        for mid in list(self._watchers):
+            self._unwatch(mid)
         self.models = {}
         self.model_ids = []
+        self._pending = None
+        self._ranking = RankIndex()
+        self._ranked_by = None
+
+    @property
+    def pending(self):
+        """Whether models remain to be created from a lazy model iterator."""
+        return self._pending is not None
+
+    def _materialize(self, count=None):
+        """Create models from the pending iterator.
+
+        Parameters
+        ----------
+        count : int, optional
+            Create models until this group contains at least ``count`` models.
+            If not supplied, create every remaining model.
+        """
+        while self._pending is not None and \
+              (count is None or len(self.model_ids) < count):
+            try:
+                model = next(self._pending)
+            except StopIteration:
+                self._pending = None
+            else:
+                self.add_model(model)
 
     def remove_model(self, model_id):
         """Pop a model from the group.
@@ -119,8 +282,271 @@ class ModelGroup(object):
             self.model_ids.remove(model_id)
         except (KeyError, IndexError):
             model = None
+        self._ranking.remove(model_id)
+        if model is not None:
+            self._unwatch(model_id)
+        if self.scheduler is not None:
+            self.scheduler.remove_model(model_id)
         return model
 
+    def _watch(self, model):
+        """Re-rank a model whenever it or a model it copies changes."""
+        self._unwatch(model.id)
+        watcher = _RankWatcher(self, model.id)
+        watched = []
+        ancestor = model
+        while ancestor is not None:
+            ancestor.watch(watcher)
+            watched.append(ancestor)
+            ancestor = ancestor.parent
+        self._watchers[model.id] = (watcher, watched)
+        self._mark_unranked(model.id)
+
+    def _unwatch(self, model_id):
+        watcher, watched = self._watchers.pop(model_id, (None, []))
+        for model in watched:
+            model.unwatch(watcher)
+
+    def _mark_unranked(self, model_id):
+        # Called from the priority refresher thread as well
+        with self._unranked_lock:
+            self._unranked.add(model_id)
+
+    def set_scheduler(self, scheduler):
+        """Select models with a bandit policy instead of by rank.
+
+        Parameters
+        ----------
+        scheduler : `pyrameter.scheduler.Scheduler` or str or None
+            The policy, or the name of a policy to create with its default
+            arguments (see `pyrameter.scheduler.get_scheduler`). If None,
+            go back to selecting models by rank.
+
+        Notes
+        -----
+        Every model is created and added to the scheduler along with the
+        losses already registered with it.
+        """
+        if scheduler is None:
+            self.scheduler = None
+            return
+        self.scheduler = get_scheduler(scheduler)
+        if self._seed_sequence is not None:
+            self.scheduler.seed(rng.spawn(parent=self._seed_sequence))
+        self._materialize()
+        for mid in self.model_ids:
+            self._schedule(self.models[mid])
+
+    def _schedule(self, model):
+        """Add a model and its registered losses to the scheduler."""
+        if self.scheduler is not None and model.id not in self.scheduler:
+            self.scheduler.add_model(model.id)
+            for loss in model.store.losses:
+                self.scheduler.update(model.id, float(loss))
+
+    @property
+    def random_state(self):
+        """The random stream that models are selected with."""
+        if self._random_state is None:
+            self._random_state = rng.default_rng()
+        return self._random_state
+
+    @random_state.setter
+    def random_state(self, value):
+        self._random_state = value
+
+    def seed(self, seed=None):
+        """Reseed model selection and every model in this group from a
+        single seed.
+
+        Parameters
+        ----------
+        seed : int or `numpy.random.SeedSequence`, optional
+            The root seed of the search. One child seed is spawned for model
+            selection, then one for each model, in order of addition to the
+            group. Models created later from a lazy model iterator are seeded
+            as they are created.
+        """
+        self._seed_sequence = rng.as_seed_sequence(seed)
+        self._random_state = rng.default_rng(
+            rng.spawn(parent=self._seed_sequence))
+        for mid in self.former_model_ids:
+            self.former_models[mid].seed(rng.spawn(parent=self._seed_sequence))
+        if self.scheduler is not None:
+            self.scheduler.seed(rng.spawn(parent=self._seed_sequence))
+
+    def set_shard(self, shard=0, num_shards=1):
+        """Restrict the exhaustive grids of every model to one shard.
+
+        Parameters
+        ----------
+        shard : int
+            The shard of each grid to search.
+        num_shards : int
+            The number of shards each grid is split into.
+
+        See Also
+        --------
+        `pyrameter.models.Model.set_shard`
+        """
+        self._shard = (shard, num_shards)
+        for mid in self.former_model_ids:
+            self.former_models[mid].set_shard(shard, num_shards)
+
+    def compile(self):
+        """Compile the search space of every model in this group.
+
+        Models created later from a lazy model iterator are compiled as they
+        are created.
+
+        See Also
+        --------
+        `pyrameter.models.Model.compile`
+        """
+        self._compile = True
+        for mid in self.former_model_ids:
+            self.former_models[mid].compile()
+
+    def refresh_priorities(self, n_jobs=None):
+        """Recompute the priority of every model whose priority is stale.
+
+        Parameters
+        ----------
+        n_jobs : int, optional
+            The number of processes to compute priorities in. -1 uses one
+            process per CPU. Defaults to the ``n_jobs`` of this group.
+
+        Returns
+        -------
+        refreshed : int
+            The number of models whose priority was recomputed.
+
+        Notes
+        -----
+        In parallel, each stale model sends a copy of its results, its
+        estimator, and a seed drawn from its random stream to a worker
+        process. If the estimator cannot be sent, e.g. because it is a
+        lambda, priorities are computed serially instead.
+        """
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+
+        # Models that inherit results share the priority of their parent
+        roots = {}
+        for model in list(self.former_models.values()):
+            while model.parent is not None:
+                model = model.parent
+            roots[model.id] = model
+
+        if n_jobs != 1:
+            refreshed = self.__refresh_parallel(list(roots.values()),
+                                                n_jobs)
+            if refreshed is not None:
+                return refreshed
+
+        refreshed = 0
+        for model in roots.values():
+            try:
+                refreshed += int(model.refresh_priority())
+            except Exception as e:
+                msg = 'Could not refresh the priority of model {}: {}'
+                warnings.warn(msg.format(model.id, e))
+        return refreshed
+
+    def __refresh_parallel(self, models, n_jobs):
+        """Recompute stale priorities in this group's process pool.
+
+        Returns None without claiming any update if the pool cannot be used.
+        """
+        stale = [m for m in models
+                 if m.priority_update_freq > 0 and m.recompute_priority]
+        if len(stale) < 2:
+            return None
+        try:
+            for model in stale:
+                pickle.dumps(model.priority_estimator)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return None
+
+        claimed = []
+        tasks = []
+        for model in stale:
+            vec = model.claim_priority_update()
+            if vec is not None:
+                seed = int(rng.integers(model.random_state, 2 ** 32))
+                claimed.append(model)
+                tasks.append((model.priority_estimator, vec, seed))
+
+        refreshed = 0
+        if len(tasks) > 0:
+            processes = multiprocessing.cpu_count() if n_jobs < 0 else n_jobs
+            with self._executor_lock:
+                if self._executor is not None and \
+                   self._executor_size != processes:
+                    self._executor.shutdown()
+                    self._executor = None
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(processes)
+                    self._executor_size = processes
+                pool = self._executor
+
+            futures = [pool.submit(_estimate_priority, t) for t in tasks]
+            broken = False
+            for model, future in zip(claimed, futures):
+                try:
+                    model.publish_priority(future.result())
+                    refreshed += 1
+                except Exception as e:
+                    broken = broken or isinstance(e, BrokenProcessPool)
+                    msg = 'Could not refresh the priority of model {}: {}'
+                    warnings.warn(msg.format(model.id, e))
+
+            # A pool whose worker died cannot be used again
+            if broken:
+                with self._executor_lock:
+                    if self._executor is pool:
+                        self._executor = None
+                        self._executor_size = None
+                pool.shutdown(wait=False)
+        return refreshed
+
+    def start_priority_refresh(self, interval=1.0):
+        """Refresh model priorities in a background thread.
+
+        While running, reading a model's priority (e.g. in
+        `pyrameter.ModelGroup.sort_models`) returns the last published value
+        instead of recomputing it, so generating values never waits on the
+        priority heuristic.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds to wait between passes over the models. Default 1.0.
+
+        See Also
+        --------
+        `pyrameter.ModelGroup.stop_priority_refresh`
+        `pyrameter.models.Model.refresh_priority`
+        """
+        self.stop_priority_refresh()
+        for model in self.former_models.values():
+            model.defer_priority = True
+        self._refresher = _PriorityRefresher(self, interval)
+        self._refresher.start()
+
+    def stop_priority_refresh(self):
+        """Stop refreshing priorities in the background.
+
+        Models go back to recomputing stale priorities when they are read.
+        """
+        if self._refresher is not None:
+            self._refresher.stop()
+            self._refresher = None
+            for model in self.former_models.values():
+                model.defer_priority = False
+            # Priorities that went stale meanwhile are computed on next sort
+            for mid in self.model_ids:
+                self._mark_unranked(mid)
+
     def sort_models(self):
         """Sort models by their complexity/priority rank.
 
@@ -132,28 +558,53 @@ class ModelGroup(object):
         The complexity and priority heuristics are used as defined by
         Kinnison *et al*[1]_
 
+        Each model's rank is the product of its positions by decreasing
+        complexity and by decreasing priority. Both orders are kept in a
+        `pyrameter.ranking.RankIndex` between calls. Models notify the group
+        when their complexity or priority may have changed (see
+        `pyrameter.models.Model.watch`), and only those models are read and
+        repositioned. Sorting without changes does no work.
+
+        Moving one model shifts the positions, and so the ranks, of every
+        model between its old and new place, so whenever any model moves the
+        ranks are recomputed from both orders in one vectorized pass.
+
         References
         ---------
         .. _[1]
         """
-        for v in self.models.values():
-            v.rank = 1
-
-        if self.complexity_sort:
-            self.model_ids.sort(key=lambda m: self.models[m].complexity,
-                                reverse=True)
-            for i in range(len(self.model_ids)):
-                self.models[self.model_ids[i]].rank *= i
-
-        if self.priority_sort:
-            self.model_ids.sort(key=lambda m: self.models[m].priority,
-                                reverse=True)
-            for i in range(len(self.model_ids)):
-                self.models[self.model_ids[i]].rank *= i
-
-        self.model_ids.sort(key=lambda m: self.models[m].rank)
-
-    def generate(self, model_id=None):
+        # Fan stale priorities out to worker processes before reading them
+        if self.priority_sort and self.n_jobs != 1 and self._refresher is None:
+            self.refresh_priorities()
+
+        if not (self.complexity_sort or self.priority_sort):
+            for v in self.models.values():
+                v.rank = 1
+            return
+
+        ranked_by = (self.complexity_sort, self.priority_sort)
+        with self._unranked_lock:
+            unranked = self._unranked
+            self._unranked = set()
+        if self._ranked_by != ranked_by:
+            unranked = self.model_ids
+
+        for mid in unranked:
+            model = self.models.get(mid)
+            if model is not None:
+                self._ranking.update(
+                    mid,
+                    model.complexity if self.complexity_sort else 0.0,
+                    model.priority if self.priority_sort else 0.0)
+
+        if self._ranking.changed or self._ranked_by != ranked_by:
+            model_ids, ranks = self._ranking.rank(*ranked_by)
+            for mid, rank in zip(model_ids, ranks):
+                self.models[mid].rank = int(rank)
+            self.model_ids[:] = model_ids
+            self._ranked_by = ranked_by
+
+    def generate(self, model_id=None, output='nested'):
         """Generate a set of hyperparameter values from a model.
 
         Generate hyperparameter values for a probabilistically-selected or
@@ -164,6 +615,8 @@ class ModelGroup(object):
         model_id : str, optional
             The id of the model to generate values for. If not specified, the
             model is selected probabilistically.
+        output : {'nested','flat','record'}
+            Layout of the generated values. Default 'nested'.
 
         Returns
         -------
@@ -174,28 +627,151 @@ class ModelGroup(object):
         params
             The set of hyperparameter values.
 
+        See Also
+        --------
+        `pyrameter.models.Model.__call__`
+
         Notes
         -----
         Probabilistic model selection follows a discrete planck distribution
-        limited to the number of models in the group.
+        limited to the number of models in the group, unless a scheduler is
+        set.
         """
-        if model_id is None:
-            if self.complexity_sort or self.priority_sort:
-                p = np.array([scipy.stats.planck.pmf(i, 0.5)
-                             for i in range(len(self.models))])
-            else:
-                p = np.ones(len(self.models))
-            p = p / p.sum()
-            idx = np.random.choice(np.arange(len(self.models)), p=p)
+        if model_id is None and self.scheduler is not None:
+            model_id = self.scheduler.select()
+            params = (model_id,) + self.models[model_id](output=output)
+        elif model_id is None:
+            idx = self._select_pending() if self._pending is not None \
+                else None
+
+            if idx is None:
+                idx = self._selection_table().sample(
+                    random_state=self.random_state)
             params = (self.model_ids[idx],) + \
-                self.models[self.model_ids[idx]]()
+                self.models[self.model_ids[idx]](output=output)
         else:
             try:
-                params = (model_id,) + self.models[model_id]()
+                params = (model_id,) + self.models[model_id](output=output)
             except KeyError:
-                params = (None, {})
+                return (None, {})
+        self._result_models[params[1]] = params[0]
         return params
 
+    def generate_batch(self, n, model_id=None, output='nested'):
+        """Generate several sets of hyperparameter values at once.
+
+        Parameters
+        ----------
+        n : int
+            The number of sets of values to generate.
+        model_id : str, optional
+            The id of the model to generate values for. If not specified,
+            a model is selected probabilistically for each set.
+        output : {'nested','flat','record'}
+            Layout of the generated values. Default 'nested'.
+
+        Returns
+        -------
+        batch : list of tuple
+            One ``(model_id, result_id, params)`` triple per set of values, as
+            returned by `pyrameter.ModelGroup.generate`. Empty if ``model_id``
+            is not in this group.
+
+        See Also
+        --------
+        `pyrameter.models.Model.generate_batch`
+
+        Notes
+        -----
+        Models are selected for all ``n`` sets with a single draw from the
+        same distribution as `pyrameter.ModelGroup.generate`, and each
+        selected model generates its share of the sets in one batch.
+        """
+        if n <= 0:
+            return []
+
+        if model_id is not None:
+            if model_id not in self.models:
+                return []
+            ids = [model_id] * n
+        elif self.scheduler is not None:
+            ids = self.scheduler.select(size=n)
+        else:
+            idx = self._select_pending(size=n) \
+                if self._pending is not None else None
+            if idx is None:
+                idx = np.full((n,), len(self.model_ids), dtype=np.int64)
+
+            # Redraw ranks past the last model from the truncated distribution
+            redraw = idx >= len(self.model_ids)
+            if np.any(redraw):
+                idx[redraw] = self._selection_table().sample(
+                    size=int(redraw.sum()), random_state=self.random_state)
+            ids = [self.model_ids[i] for i in idx]
+
+        batches = {}
+        for mid, count in collections.Counter(ids).items():
+            batches[mid] = iter(self.models[mid].generate_batch(
+                count, output=output))
+
+        batch = []
+        for mid in ids:
+            result_id, params = next(batches[mid])
+            self._result_models[result_id] = mid
+            batch.append((mid, result_id, params))
+        return batch
+
+    def _selection_table(self):
+        """Alias table over the probability of selecting each model rank.
+
+        Notes
+        -----
+        Selection probabilities depend only on the number of models and
+        whether they are sorted, not on their order, so the table is cached
+        until either changes.
+        """
+        key = (len(self.model_ids), self.complexity_sort or self.priority_sort)
+        if self._selector is None or self._selector[0] != key:
+            n, ranked = key
+            if ranked:
+                p = scipy.stats.planck.pmf(np.arange(n), 0.5)
+            else:
+                p = np.ones(n)
+            self._selector = (key, AliasTable(p))
+        return self._selector[1]
+
+    def _select_pending(self, size=None):
+        """Select a model rank, creating pending models as needed.
+
+        Planck-distributed ranks are drawn without an upper bound and models
+        are created until the drawn rank exists. Uniform selection needs every
+        model, so all are created.
+
+        Parameters
+        ----------
+        size : int, optional
+            If supplied, select this many ranks.
+
+        Returns
+        -------
+        idx : int or `numpy.ndarray` or None
+            The selected rank, or None if every model has been created and the
+            rank should be drawn from the distribution truncated at the number
+            of models, which is equivalent to rejecting the out-of-range draw.
+            If ``size`` is supplied, an array of ranks in which out-of-range
+            ranks are left to be redrawn by the caller.
+        """
+        if not (self.complexity_sort or self.priority_sort):
+            self._materialize()
+            return None
+
+        idx = scipy.stats.planck.rvs(0.5, size=size,
+                                     random_state=self.random_state)
+        self._materialize(np.max(idx) + 1)
+        if size is not None:
+            return idx
+        return idx if idx < len(self.model_ids) else None
+
     def optimal(self, mode='best', count=1):
         """Get the optimal observed result(s) from among the models past and
         present.
@@ -272,31 +848,142 @@ class ModelGroup(object):
             optimal[mid] = results[:count]
         return optimal
 
-    def register_result(self, model_id, result_id, loss, results=None):
+    def register_result(self, model_id=None, result_id=None, loss=None,
+                        results=None):
         """Add a result to the given model (either past or present).
 
         Parameters
         ----------
-        model_id : str
-            The model that the result belongs to.
+        model_id : str, optional
+            The model that the result belongs to. If not supplied, the model is
+            found from ``result_id``.
         result_id : str
             The id of this result if available.
         loss : float
             The loss value associated with this result.
         results : dict, optional
             Additional values to store.
+
+        Raises
+        ------
+        KeyError
+            Raised if the model or result cannot be found.
         """
+        if model_id is None:
+            model_id = self.find_model(result_id)
+            if model_id is None:
+                msg = 'No model found with result {}'.format(result_id)
+                raise KeyError(msg)
         if model_id in self.former_models:
-            submissions, params = \
-                self.former_models[model_id].register_result(result_id,
-                                                             loss,
-                                                             results=results)
+            model = self.former_models[model_id]
+            previous = self._previous_loss(model, result_id)
+            submissions, params = model.register_result(result_id, loss,
+                                                        results=results)
+            if self.scheduler is not None:
+                self.scheduler.update(model_id, loss, previous=previous)
         else:
             msg = 'No model found with id {}'.format(model_id)
             raise KeyError(msg)
 
         return submissions, params
 
+    def register_results(self, results, save=False):
+        """Add many results to the models of this group at once.
+
+        Parameters
+        ----------
+        results : iterable of tuple
+            ``(result_id, loss)`` or ``(result_id, loss, results)`` for each
+            result, with the arguments of
+            `pyrameter.ModelGroup.register_result`.
+        save : bool, optional
+            If true, save the group to its backend once all results are
+            registered. Default False.
+
+        Returns
+        -------
+        registered : list of tuple
+            The ``(submissions, params)`` of each result, in order, as
+            returned by `pyrameter.ModelGroup.register_result`.
+
+        Raises
+        ------
+        KeyError
+            Raised if any result cannot be found, before any result is
+            updated.
+
+        See Also
+        --------
+        `pyrameter.models.Model.register_results`
+        """
+        batches = collections.OrderedDict()
+        order = []
+        for entry in results:
+            result_id, loss = entry[0], entry[1]
+            extra = entry[2] if len(entry) > 2 else None
+            model_id = self.find_model(result_id)
+            if model_id is None or model_id not in self.former_models:
+                msg = 'No model found with result {}'.format(result_id)
+                raise KeyError(msg)
+            batch = batches.setdefault(model_id, [])
+            order.append((model_id, len(batch)))
+            batch.append((result_id, loss, extra))
+
+        registered = {}
+        for model_id, batch in batches.items():
+            model = self.former_models[model_id]
+            # Results registered twice in a batch replace their first loss
+            previous = []
+            latest = {}
+            for result_id, loss, _ in batch:
+                previous.append(latest[result_id] if result_id in latest
+                                else self._previous_loss(model, result_id))
+                latest[result_id] = loss
+            registered[model_id] = model.register_results(batch)
+            if self.scheduler is not None:
+                for (_, loss, _), prev in zip(batch, previous):
+                    self.scheduler.update(model_id, loss, previous=prev)
+
+        if save and self.backend is not None:
+            self.save()
+        return [registered[model_id][i] for model_id, i in order]
+
+    @staticmethod
+    def _previous_loss(model, result_id):
+        """The loss a result is currently registered with, if any."""
+        result = model._result_index.get(result_id)
+        return None if result is None else result.loss
+
+    def find_model(self, result_id):
+        """Get the id of the model a result belongs to.
+
+        Parameters
+        ----------
+        result_id : str
+            The id of the result.
+
+        Returns
+        -------
+        model_id : str or None
+            The id of the model, past or present, containing the result, or
+            None if no model contains it.
+
+        Notes
+        -----
+        Results generated through this group are indexed as they are
+        generated. Results added to models directly are found by checking the
+        result index of each model once, then indexed.
+        """
+        try:
+            return self._result_models[result_id]
+        except KeyError:
+            pass
+        for mid in self.former_model_ids:
+            if result_id in self.former_models[mid]._result_index:
+                self._result_models[result_id] = mid
+                return mid
+        return None
+
     @property
     def result_count(self):
         return sum([len(m.results) for m in self.former_models.values()])
@@ -1,6 +1,8 @@
 from .model_factory import get_model_class
 from .random_search import RandomSearchModel
+from .quasi_random import QuasiRandomSearchModel, HaltonSearchModel
 from .tpe import TPEModel
 from .gp import GPBayesModel
 
-__all__ = ['RandomModel', 'TPEModel', 'GPBayesModel', 'get_model_class']
+__all__ = ['RandomModel', 'QuasiRandomSearchModel', 'HaltonSearchModel',
+           'TPEModel', 'GPBayesModel', 'get_model_class']
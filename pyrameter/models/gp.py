@@ -33,39 +33,78 @@ class GPBayesModel(RandomSearchModel):
         if 'kernel' not in self.gp_kws:
             self.gp_kws['kernel'] = RBF()
 
-    def generate(self):
-        if len(self.results) < self.warm_up or len(self.results) % self.warm_up == 0:
-            params = super(GPBayesModel, self).generate()
-        else:
-            vec = self.results_to_feature_vector()
-            features, losses = np.copy(vec[:, :-1]), np.copy(vec[:, -1])
-            #features = features.T
-            losses = np.reshape(losses, (-1, 1))
-
-            gp = GaussianProcessRegressor(**self.gp_kws)
-            gp.fit(features, losses)
-
-            potentials = np.zeros((self.n_samples, len(self.domains)))
-            for i in range(self.n_samples):
-                for j in range(len(self.domains)):
-                    val = self.domains[j].generate(index=True)
-                    if isinstance(val, tuple):
-                        val = val[1]
-                    potentials[i, j] += val
-
-            mu, sigma = gp.predict(potentials, return_std=True)
-            best = np.min(losses)
-            with np.errstate(divide='ignore'):
-                gamma = (mu - best) / sigma
-            ei = (mu - gamma) * norm.cdf(gamma) + sigma * norm.pdf(gamma)
-            ei[sigma == 0] = 0
-
-            best = potentials[np.argmax(ei, axis=1)]
-
-            params = np.zeros((len(self.domains),))
-            for i in range(len(self.domains)):
-                domain = self.domains[i]
-                params[i] += domain.map_to_domain(best[i][0],
-                                                  bound=True)
+    def generate(self, size=None):
+        """Generate hyperparameter values.
+
+        Parameters
+        ----------
+        size : int, optional
+            If supplied, generate this many sets of hyperparameter values.
+
+        Returns
+        -------
+        A list containing one hyperparameter value per domain in this model.
+        If ``size`` is supplied, a list of ``size`` such lists.
+
+        Notes
+        -----
+        Warm-up follows `pyrameter.models.TPEModel.generate`. Sets proposed
+        by expected improvement share one Gaussian process fit.
+        """
+        if size is None:
+            if self._warming_up(len(self.results)):
+                return super(GPBayesModel, self).generate()
+            return self._suggest(*self._fit())
+
+        position = len(self.results)
+        warm = [self._warming_up(position + k) for k in range(size)]
+        n_random = sum(warm)
+        randoms = iter(super(GPBayesModel, self).generate(size=n_random)
+                       if n_random > 0 else [])
+        fit = self._fit() if n_random < size else None
+        return [next(randoms) if w else self._suggest(*fit) for w in warm]
+
+    def _warming_up(self, position):
+        """Whether the set generated at ``position`` comes from random search."""
+        # Warm up with random search. The GP needs at least two finished
+        # results to fit.
+        return position < self.warm_up or position % self.warm_up == 0 or \
+            len(self.store) < 2
+
+    def _fit(self):
+        """Fit the Gaussian process to the finished results."""
+        vec = self.results_to_feature_vector()
+        features, losses = np.copy(vec[:, :-1]), np.copy(vec[:, -1])
+        #features = features.T
+        losses = np.reshape(losses, (-1, 1))
+
+        gp = GaussianProcessRegressor(**self.gp_kws)
+        gp.fit(features, losses)
+        return gp, np.min(losses)
+
+    def _suggest(self, gp, best):
+        """Choose one set of values by expected improvement."""
+        potentials = np.zeros((self.n_samples, len(self.domains)))
+        for i in range(self.n_samples):
+            for j in range(len(self.domains)):
+                val = self.domains[j].generate(
+                    index=True, random_state=self.random_state)
+                if isinstance(val, tuple):
+                    val = val[1]
+                potentials[i, j] += val
+
+        mu, sigma = gp.predict(potentials, return_std=True)
+        with np.errstate(divide='ignore'):
+            gamma = (mu - best) / sigma
+        ei = (mu - gamma) * norm.cdf(gamma) + sigma * norm.pdf(gamma)
+        ei[sigma == 0] = 0
+
+        best = potentials[np.argmax(ei, axis=1)]
+
+        params = np.zeros((len(self.domains),))
+        for i in range(len(self.domains)):
+            domain = self.domains[i]
+            params[i] += domain.map_to_domain(best[i][0],
+                                              bound=True)
 
         return params
@@ -1,15 +1,20 @@
-from pyrameter.domain import Domain
+from pyrameter import ids, rng
+from pyrameter.compiled import CompiledSpace
+from pyrameter.domain import Domain, ExhaustiveDomain
+from pyrameter.grid import Grid
+from pyrameter.store import ResultStore
+from pyrameter.template import OutputTemplate
 from pyrameter.models.model_factory import get_model_class
+from pyrameter.models.priority import DEFAULT_ESTIMATOR
 
 import copy
-import uuid
-import warnings
+import hashlib
+import json
+import threading
 import weakref
 
 import numpy as np
 from six import string_types
-from sklearn.gaussian_process import GaussianProcessRegressor
-from sklearn.gaussian_process.kernels import RBF
 
 
 class InvalidModelError(Exception):
@@ -71,7 +76,8 @@ class Model(object):
     Notes
     -----
     The complexity and priority heuristics are computed as described by
-    Kinnison *et al.* [1]_ .
+    Kinnison *et al.* [1]_ . The priority is computed by the callable in the
+    ``priority_estimator`` attribute, see `pyrameter.models.priority`.
 
     References
     ----------
@@ -84,9 +90,11 @@ class Model(object):
 
     def __init__(self, id=None, domains=None, results=None,
                  update_complexity=True, priority_update_freq=10):
-        self.id = str(uuid.uuid4()) if id is None else id
+        self.id = ids.new_id() if id is None else id
         self.domains = [] if domains is None else domains
         self.results = [] if results is None else results
+        self._result_index = {r.id: r for r in self.results}
+        self._store = None
 
         self._priority = 1.0
         self._complexity = 1.0
@@ -99,15 +107,44 @@ class Model(object):
         self.domain_added = bool(self.domains)
         self.priority_update_freq = priority_update_freq
         self.recompute_priority = False
+        self.priority_estimator = DEFAULT_ESTIMATOR
+        self.defer_priority = False
+
+        self._random_state = None
+
+        self.shard = 0
+        self.num_shards = 1
+        self._grid = None
+
+        self._compile = False
+        self._compiled = None
+        self._signature = None
+        self._template = None
+        self._watchers = []
+
+        # Guards the result store and the priority flags, which background
+        # priority refreshes read while results are added and registered.
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # Watchers belong to the process that registered them
+        state = self.__dict__.copy()
+        state['_watchers'] = []
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        # Compiled spaces are pickled without their callbacks
+        if self._compiled is not None:
+            self._compiled.attach(self.domains)
 
     def __eq__(self, other):
-        eq_domains = all(
-            map(lambda s: any(
-                    map(lambda o: s == o,
-                        other.domains)),
-                self.domains))
-        return isinstance(other, Model) and len(self) == len(other) and \
-               eq_domains
+        return isinstance(other, Model) and self.signature == other.signature
+
+    def __ne__(self, other):
+        return not self == other
 
     def __len__(self):
         return len(self.domains)
@@ -119,23 +156,200 @@ class Model(object):
     def __repr__(self):
         return str(self)
 
-    def __call__(self):
-        params = self.generate()
+    def __call__(self, output='nested'):
+        """Generate and record a set of hyperparameter values.
+
+        Parameters
+        ----------
+        output : {'nested','flat','record'}
+            Layout of the returned values: nested dictionaries following the
+            domain paths, a dictionary indexed by '/'-separated path, or a
+            NumPy record with one field per path. Default 'nested'.
+
+        Returns
+        -------
+        result_id : str
+            The id of the result these values are associated with.
+        params : dict or `numpy.record`
+            The generated values.
+
+        See Also
+        --------
+        `pyrameter.template.OutputTemplate`
+        """
+        return self._record(self.generate(), output)
+
+    def generate_batch(self, n, output='nested'):
+        """Generate and record ``n`` sets of hyperparameter values.
+
+        Parameters
+        ----------
+        n : int
+            The number of sets of values to generate.
+        output : {'nested','flat','record'}
+            Layout of the returned values. Default 'nested'.
+
+        Returns
+        -------
+        batch : list of tuple
+            One ``(result_id, params)`` pair per set of values, as returned by
+            `pyrameter.models.Model.__call__`.
+
+        Notes
+        -----
+        All ``n`` sets are drawn by a single call to
+        `pyrameter.models.Model.generate`, so models can vectorize their
+        draws or fit their surrogate once per batch.
+        """
+        if n <= 0:
+            return []
+        return [self._record(params, output)
+                for params in self.generate(size=n)]
+
+    def _record(self, params, output):
+        """Create the result placeholder of a set of generated values."""
         r = Result(model=self)
         self.add_result(r)
 
-        outparams = {}
         for i in range(len(params)):
             r.add_value(Value(params[i], self.domains[i]))
-            path = self.domains[i].path.split('/')
-            curr = outparams
-            for p in path[:-1]:
-                if p != '':
-                    if p not in curr:
-                        curr[p] = {}
-                    curr = curr[p]
-            curr[path[-1]] = params[i]
-        return r.id, outparams
+        return r.id, self.template.fill(params, output=output)
+
+    @property
+    def random_state(self):
+        # Spawned lazily so that copies made while splitting stay cheap.
+        if self._random_state is None:
+            self._random_state = rng.default_rng()
+        return self._random_state
+
+    @random_state.setter
+    def random_state(self, value):
+        self._random_state = value
+
+    def seed(self, seed=None):
+        """Reset the random stream of this model.
+
+        Parameters
+        ----------
+        seed : int or `numpy.random.SeedSequence`, optional
+            The seed to spawn the model stream from. If not supplied, a new
+            seed is spawned from `pyrameter.rng`.
+
+        Notes
+        -----
+        Models draw every value from their own stream, never from the
+        streams of their domains, which may be shared with other models of
+        the same search. The same seed always reproduces the same values.
+        """
+        self.random_state = rng.default_rng(
+            rng.spawn(parent=rng.as_seed_sequence(seed)))
+
+    @property
+    def grid(self):
+        """Enumeration of the exhaustive domains in this model.
+
+        Returns
+        -------
+        axes : list of int
+            Positions in ``self.domains`` of the exhaustive domains, in the
+            order they appear in each grid point.
+        grid : `pyrameter.grid.Grid`
+            Mixed-radix enumeration of the Cartesian product of the exhaustive
+            domains, restricted to this model's shard.
+        """
+        if self._grid is None:
+            axes = [i for i, d in enumerate(self.domains)
+                    if isinstance(d, ExhaustiveDomain)]
+            grid = Grid([len(self.domains[i].domain) for i in axes],
+                        shard=self.shard, num_shards=self.num_shards)
+            self._grid = (axes, grid)
+        return self._grid
+
+    def set_shard(self, shard=0, num_shards=1):
+        """Restrict the grid of exhaustive domains to one shard.
+
+        Parameters
+        ----------
+        shard : int
+            The shard of the grid this model generates values from.
+        num_shards : int
+            The number of shards the grid is split into. Models with the same
+            domains on different workers cover disjoint parts of the grid when
+            given different shards.
+        """
+        if num_shards < 1 or not 0 <= shard < num_shards:
+            msg = 'Invalid shard {} of {}.'.format(shard, num_shards)
+            raise ValueError(msg)
+        self.shard = shard
+        self.num_shards = num_shards
+        self._grid = None
+
+    @property
+    def signature(self):
+        """Structural signature of the domains in this model.
+
+        Two models have the same signature if they contain the same domains
+        (compared by path and `pyrameter.Domain.to_json`, ignoring iteration
+        state), regardless of domain order.
+
+        Returns
+        -------
+        signature : str
+            Hex SHA-256 digest of the sorted domain specifications.
+        """
+        if self._signature is None:
+            specs = []
+            for domain in self.domains:
+                j = domain.to_json()
+                j.pop('idx', None)
+                specs.append(json.dumps(j, sort_keys=True, default=repr))
+            specs.sort()
+            self._signature = hashlib.sha256(
+                '\n'.join(specs).encode('utf-8')).hexdigest()
+        return self._signature
+
+    @property
+    def template(self):
+        """Layout of this model's generated values, built once per domain set.
+
+        See Also
+        --------
+        `pyrameter.template.OutputTemplate`
+        """
+        if self._template is None:
+            self._template = OutputTemplate([d.path for d in self.domains])
+        return self._template
+
+    @property
+    def compiled(self):
+        """The compiled search space of this model, or None if not compiled.
+
+        See Also
+        --------
+        `pyrameter.models.Model.compile`
+        """
+        if self._compile and self._compiled is None:
+            self._compiled = CompiledSpace(self.domains)
+        return self._compiled
+
+    def compile(self):
+        """Lower the domains of this model into flat arrays.
+
+        Once compiled, sampling, encoding and decoding run as vectorized
+        kernels over all domains at once. The compiled space is rebuilt on
+        demand if domains are added later.
+
+        Returns
+        -------
+        compiled : `pyrameter.compiled.CompiledSpace`
+            The compiled search space.
+        """
+        with self._lock:
+            if not self._compile:
+                # Re-encode stored results with the compiled kernels
+                self._compile = True
+                self._store = None
+        return self.compiled
 
     def add_domain(self, domain):
         """Add a domain to this model.
@@ -150,9 +364,16 @@ class Model(object):
         If complexity updates are enabled, adding a domain with this method
         will trigger a recalculation of the complexity.
         """
-        self.domains.append(domain)
-        self.domain_added = True
-        self.domains.sort(key=lambda x: x.path)
+        with self._lock:
+            self.domains.append(domain)
+            self.domain_added = True
+            self.domains.sort(key=lambda x: x.path)
+            self._grid = None
+            self._compiled = None
+            self._signature = None
+            self._template = None
+            self._store = None
+        self._heuristics_changed()
 
     def add_result(self, result):
         """Add a result to this model.
@@ -167,10 +388,18 @@ class Model(object):
         If complexity updates are enabled, adding a domain with this method
         will trigger a recalculation of the complexity.
         """
-        self.results.append(result)
-        should_update = (len(self.results) % self.priority_update_freq == 0)
-        if not self.recompute_priority and should_update:
-            self.recompute_priority = True
+        with self._lock:
+            self.results.append(result)
+            self._result_index[result.id] = result
+            if self._store is not None:
+                self._store.update(result)
+            should_update = self.priority_update_freq > 0 and \
+                len(self.results) % self.priority_update_freq == 0
+            changed = not self.recompute_priority and should_update
+            if changed:
+                self.recompute_priority = True
+        if changed:
+            self._heuristics_changed()
         if self.parent is not None:
             self.parent.add_result(result)
 
@@ -186,41 +415,125 @@ class Model(object):
         results : dict, optional
             Key/value pairs of additional information to store with the result.
 
+        Returns
+        -------
+        submissions : int
+            The number of times the result has been registered.
+        params : dict
+            The hyperparameter values of the result if ``loss`` is None, so
+            that they may be resubmitted, else an empty dict.
+
+        Raises
+        ------
+        KeyError
+            Raised if no result with id ``result_id`` exists in this model.
+
+        Notes
+        -----
+        Results are looked up in a result id index in constant time.
+        """
+        found = self._find_result(result_id)
+        with self._lock:
+            found.loss = loss
+            found.results = results
+            found.submissions += 1
+            self._store_result(found)
+        params = self._resubmission(found) if loss is None else {}
+
+        # Results added through a copy are shared with its parent, so the
+        # parent only needs updating if it holds a different result object.
+        if self.parent is not None and \
+           self.parent._result_index.get(result_id) is not found:
+            self.parent.register_result(result_id, loss, results)
+
+        return found.submissions, params
+
+    def register_results(self, results):
+        """Update several existing Results by id.
+
+        Parameters
+        ----------
+        results : iterable of tuple
+            ``(result_id, loss, results)`` triples with the arguments of
+            `pyrameter.models.Model.register_result` for each result.
+
+        Returns
+        -------
+        registered : list of tuple
+            The ``(submissions, params)`` of each result, in order, as
+            returned by `pyrameter.models.Model.register_result`.
+
+        Raises
+        ------
+        KeyError
+            Raised if any result does not exist in this model, before any
+            result is updated.
+
         Notes
         -----
-        If the given result does not exist, a new result will be created with
-        the supplied loss and results dictionary.
+        Unlike registering results one at a time, this marks the priority of
+        the model stale, since a batch of new losses is likely to change it.
+        Parents holding different result objects are updated in one batch.
         """
-        found = None
-        for r in self.results:
-            if r.id == result_id:
-                r.loss = loss
-                r.results = results
-                r.submissions += 1
-                found = r
-
-        if found is None:
+        results = [(self._find_result(result_id), loss, extra)
+                   for result_id, loss, extra in results]
+
+        registered = []
+        inherited = []
+        for found, loss, extra in results:
+            with self._lock:
+                found.loss = loss
+                found.results = extra
+                found.submissions += 1
+                self._store_result(found)
+            registered.append((found.submissions,
+                               self._resubmission(found) if loss is None
+                               else {}))
+            if self.parent is not None and \
+               self.parent._result_index.get(found.id) is not found:
+                inherited.append((found.id, loss, extra))
+
+        # Copies read their priority from their parents, so mark those too
+        model = self if len(registered) > 0 else None
+        while model is not None:
+            if model.priority_update_freq > 0:
+                with model._lock:
+                    model.recompute_priority = True
+                model._heuristics_changed()
+            model = model.parent
+        if len(inherited) > 0:
+            self.parent.register_results(inherited)
+
+        return registered
+
+    def _find_result(self, result_id):
+        """Look up a result of this model by id."""
+        try:
+            return self._result_index[result_id]
+        except KeyError:
             msg = 'No result with id {} found in this model.'.format(result_id)
             msg += ' Did you generate the hyperparameter values with '
             msg += '`Model.generate()`?'
             raise KeyError(msg)
 
-        params = {}
-        if loss is None:
-            for value in found.values:
-                domain = value.domain()
-                curr = params
-                path = domain.path.split('/')
-                for p in path[:-1]:
-                    if p not in params:
-                        curr[p] = {}
-                    curr = curr[p]
-                curr[path[-1]] = value.value
-
-        if self.parent is not None:
-            self.parent.register_result(result_id, loss, results)
-
-        return found.submissions, params
+    def _resubmission(self, result):
+        """Lay out the values of a result so that they can be resubmitted."""
+        domains = [value.domain() for value in result.values]
+        if len(domains) == len(self.domains) and \
+           all(d is e for d, e in zip(domains, self.domains)):
+            template = self.template
+        else:
+            template = OutputTemplate([d.path for d in domains])
+        return template.nested([value.value for value in result.values])
+
+    def _store_result(self, result):
+        """Update the result store of this model and the parents sharing it."""
+        with self._lock:
+            if self._store is not None:
+                self._store.update(result)
+        if self.parent is not None and \
+           self.parent._result_index.get(result.id) is result:
+            self.parent._store_result(result)
 
     def copy(self, parent_inherits_results=False):
         """Make a copy of this model.
@@ -235,6 +548,10 @@ class Model(object):
                            results=[r for r in self.results],
                            update_complexity=self.update_complexity,
                            priority_update_freq=self.priority_update_freq)
+        m.set_shard(self.shard, self.num_shards)
+        m._compile = self._compile
+        m.priority_estimator = self.priority_estimator
+        m.defer_priority = self.defer_priority
         if parent_inherits_results:
             m.parent = self
         return m
@@ -242,9 +559,37 @@ class Model(object):
     def merge(self, other):
         """Merge the domains of two models."""
         # TODO: Implement results merging in a sane way (placeholder vals?)
-        self.domains.extend(other.domains)
+        with self._lock:
+            self.domains.extend(other.domains)
+            self.domain_added = self.domain_added or bool(other.domains)
+            self._grid = None
+            self._compiled = None
+            self._signature = None
+            self._template = None
+            self._store = None
+        self._heuristics_changed()
         # self.results.extend(other.results)
 
+    @property
+    def store(self):
+        """Encoded values and losses of the results with a finite loss.
+
+        The store is built from the existing results on first access and kept
+        up to date as results are added or registered.
+
+        See Also
+        --------
+        `pyrameter.store.ResultStore`
+        """
+        with self._lock:
+            if self._store is None:
+                store = ResultStore(len(self.domains),
+                                    capacity=len(self.results),
+                                    space=self.compiled)
+                store.extend(self.results)
+                self._store = store
+            return self._store
+
     def results_to_feature_vector(self):
         """Convert hyperparameter values to a feature vector.
 
@@ -254,25 +599,29 @@ class Model(object):
         Returns
         -------
         An array with shape (r, v + 1), where r is the number of results in
-        this model and v is the number of hyperparameter values. The last
-        entry in each row is the performance (e.g. loss).
+        this model with a finite loss and v is the number of hyperparameter
+        values. The last entry in each row is the performance (e.g. loss).
+
+        Notes
+        -----
+        The array is a view into this model's result store, not a copy. It
+        must be copied before being modified, and may not reflect results
+        added after it was returned. If the model is compiled, values are
+        encoded by its compiled space.
         """
-        vec = np.zeros((len(self.results), len(self.results[0].values) + 1),
-                       dtype=np.float32)
-        for i in range(len(self.results)):
-            loss = self.results[i].loss
-            if loss is not None and loss not in [np.inf, -np.inf, np.nan]:
-                vec[i, -1] += self.results[i].loss
-                for j in range(len(self.results[i].values)):
-                    vec[i, j] += self.results[i].values[j].to_numeric()
-        return vec
-
-    def generate(self):
+        return self.store.data
+
+    def generate(self, size=None):
         """Generate hyperparameter values for this model.
 
         This method must be overridden in subclasses to implement
         hyperparameter generation methods.
 
+        Parameters
+        ----------
+        size : int, optional
+            If supplied, generate this many sets of hyperparameter values.
+
         Raises
         ------
         NotImplementedError
@@ -286,6 +635,7 @@ class Model(object):
             self._complexity = 1.0
             for domain in self.domains:
                 self._complexity *= domain.complexity
+            self.domain_added = False
         return self._complexity
 
     @property
@@ -295,30 +645,96 @@ class Model(object):
             self._priority = self.parent.priority
             return self._priority
 
-        # Only compute priority if requested and an update is necessary
-        if self.priority_update_freq >= 0 and self.recompute_priority:
+        # Deferred priorities are refreshed elsewhere, e.g. in the background
+        if not self.defer_priority:
+            self.refresh_priority()
+        return self._priority
 
-            vec = self.results_to_feature_vector()
+    def refresh_priority(self):
+        """Recompute the priority heuristic if it is out of date.
 
-            split = int(np.ceil(vec.shape[0] *
-                        (0.8 if vec.shape[0] < 10 else 1.0)))
-            scales = np.zeros((50,), dtype=np.float32)
+        Returns
+        -------
+        refreshed : bool
+            True if the priority was recomputed.
 
-            for i in range(scales.shape[0]):
-                np.random.shuffle(vec)
-                features = np.copy(vec[:split, :-1])
-                losses = np.reshape(np.copy(vec[:split, -1]), (-1, 1))
-                est = np.random.uniform(0.1, 2.0)
-                gp = GaussianProcessRegressor(kernel=RBF(length_scale=est),
-                                              alpha=1e-5)
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore")
-                    gp.fit(features, losses)
-                scales[i] += (1.0 / gp.kernel.theta[0])
+        Notes
+        -----
+        The new priority is published with a single attribute assignment, so
+        readers in other threads see either the old or the new value.
+        """
+        if self.parent is not None:
+            return self.parent.refresh_priority()
 
-            self._priority = np.linalg.norm(scales.max() - scales.min())
+        vec = self.claim_priority_update()
+        if vec is None:
+            return False
+        self.publish_priority(self.priority_estimator(
+            vec[:, :-1], vec[:, -1], self.random_state))
+        return True
 
-        return self._priority
+    def publish_priority(self, priority):
+        """Set a newly computed priority and notify watchers.
+
+        Parameters
+        ----------
+        priority : float
+            The new priority of this model.
+
+        See Also
+        --------
+        `pyrameter.models.Model.claim_priority_update`
+        """
+        self._priority = float(priority)
+        self._heuristics_changed()
+
+    def watch(self, callback):
+        """Call ``callback()`` whenever the complexity or priority may change.
+
+        Parameters
+        ----------
+        callback : callable
+            Function taking no arguments. Called when domains are added, when
+            the priority becomes stale, and when a new priority is published.
+            Watchers are not pickled or copied.
+        """
+        self._watchers.append(callback)
+
+    def unwatch(self, callback):
+        """Stop calling a callback registered with `watch`."""
+        if callback in self._watchers:
+            self._watchers.remove(callback)
+
+    def _heuristics_changed(self):
+        for callback in list(self._watchers):
+            callback()
+
+    def claim_priority_update(self):
+        """Take the results needed to recompute a stale priority.
+
+        Marks the priority as up to date, so that the caller is responsible
+        for computing the new priority and passing it to
+        `pyrameter.models.Model.publish_priority`.
+
+        Returns
+        -------
+        vec : `numpy.ndarray` or None
+            A copy of the result rows, with the loss in the last column, or
+            None if no update is due or there are too few results to compute
+            one.
+
+        See Also
+        --------
+        `pyrameter.ModelGroup.refresh_priorities`
+        """
+        # Only compute priority if requested and an update is necessary
+        with self._lock:
+            if self.priority_update_freq <= 0 or not self.recompute_priority:
+                return None
+            self.recompute_priority = False
+            # Copy so that results registered meanwhile cannot change the rows
+            vec = np.array(self.results_to_feature_vector())
+        return vec if vec.shape[0] >= 2 else None
 
     def to_json(self):
         """Convert the model into a JSON-serializable format.
@@ -336,6 +752,8 @@ class Model(object):
             'priority': float(self.priority),
             'complexity': self.complexity,
             'rank': self.rank,
+            'shard': self.shard,
+            'num_shards': self.num_shards,
             'model_parameters': {
                 'update_complexity': self.update_complexity,
                 'priority_update_freq': self.priority_update_freq
@@ -369,11 +787,13 @@ class Model(object):
         domains = [Domain.from_json(d) for d in spec['domains']]
         results = [Result.from_json(r, domains) for r in spec['results']]
         model_class = get_model_class(spec['type'])
-        model = model_class(domains=domains,
+        model = model_class(id=spec.get('id'),
+                            domains=domains,
                             results=results,
                             **spec['model_parameters'])
         for r in model.results:
             r.model = model
+        model.set_shard(spec.get('shard', 0), spec.get('num_shards', 1))
         return model
 
 
@@ -397,8 +817,12 @@ class Result(object):
     id : str or int
 
     """
+    # Results are created for every suggestion, so they do without a __dict__
+    __slots__ = ('id', '_model', 'loss', 'results', 'values', 'submissions',
+                 '__weakref__')
+
     def __init__(self, model=None, loss=None, results=None, values=None):
-        self.id = str(uuid.uuid4())
+        self.id = ids.new_id()
         self.model = model
         self.loss = loss
         self.results = results
@@ -465,6 +889,8 @@ class Result(object):
                         loss=spec['loss'],
                         results=spec['results'],
                         values=values)
+        if 'id' in spec:
+            result.id = spec['id']
         return result
 
 
@@ -483,6 +909,8 @@ class Value(object):
     result : ``pyrameter.models.Result``
         The result generated by this value.
     """
+    __slots__ = ('value', 'domain', 'result')
+
     def __init__(self, value, domain, result=None):
         self.value = value
         if isinstance(domain, Domain):
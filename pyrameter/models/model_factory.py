@@ -6,7 +6,7 @@ class InvalidModelError(Exception):
     def __init__(self, model):
         msg = 'The supplied model {} is not a valid model type.'.format(model)
         msg += '\nValid inputs include subclasses of pyrameter.models.Model,'
-        msg += '\n "random", "tpe", and "gp".'
+        msg += '\n "random", "sobol", "halton", "tpe", and "gp".'
         super(InvalidModelError, self).__init__(msg)
 
 
@@ -15,7 +15,7 @@ def get_model_class(model):
 
     Parameters
     ----------
-    model : instance of `pyrameter.models.Model` or {"random", "tpe", "gp"}
+    model : instance of `pyrameter.models.Model` or {"random", "sobol", "halton", "tpe", "gp"}
         They type of model to retrieve.
 
     Returns
@@ -30,6 +30,8 @@ def get_model_class(model):
     """
     from pyrameter.models.model import Model
     from pyrameter.models.random_search import RandomSearchModel
+    from pyrameter.models.quasi_random import QuasiRandomSearchModel, \
+                                              HaltonSearchModel
     from pyrameter.models.tpe import TPEModel
     from pyrameter.models.gp import GPBayesModel
 
@@ -38,6 +40,10 @@ def get_model_class(model):
     elif isinstance(model, string_types):
         if model in ['random', u'random', RandomSearchModel.__name__]:
             model = RandomSearchModel
+        elif model in ['sobol', u'sobol', QuasiRandomSearchModel.__name__]:
+            model = QuasiRandomSearchModel
+        elif model in ['halton', u'halton', HaltonSearchModel.__name__]:
+            model = HaltonSearchModel
         elif model in ['tpe', u'tpe', TPEModel.__name__]:
             model = TPEModel
         elif model in ['gp', u'gp', GPBayesModel.__name__]:
@@ -0,0 +1,127 @@
+"""Estimators of the priority heuristic of a model.
+
+Classes
+-------
+GPLengthScalePriority
+    Spread of Gaussian process length scales fit to subsamples of the results.
+
+Attributes
+----------
+DEFAULT_ESTIMATOR
+    The estimator used by models unless another is supplied.
+
+Notes
+-----
+A priority estimator is any callable ``estimator(features, losses,
+random_state)`` that takes the encoded hyperparameter values and losses of a
+model's finished results and returns the priority of the model as a float.
+Models with higher priority are searched more often.
+"""
+import warnings
+
+import numpy as np
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import RBF
+
+from pyrameter import rng
+
+
+class GPLengthScalePriority(object):
+    """Spread of GP length scales fit to subsamples of the results.
+
+    A Gaussian process with an RBF kernel is fit to several random subsamples
+    of the results, each starting from a random length scale. The priority is
+    the range of the inverse fitted length scales: models whose loss surface
+    is poorly determined by the results so far get a higher priority.
+
+    Parameters
+    ----------
+    n_bootstraps : int, optional
+        The number of subsamples to fit. Default 20.
+    subsample : int, optional
+        The maximum number of results in each subsample. If None, subsamples
+        contain ``fraction`` of the results regardless of size. Default 256.
+    fraction : float, optional
+        The fraction of the results drawn into each subsample. Default 0.8.
+    n_restarts_optimizer : int, optional
+        Optimizer restarts of each fit. Default 0.
+    fitted : bool, optional
+        If true, use the length scales of the fitted kernels. If false, use
+        the initial length scale of each fit as the log-scale kernel
+        parameter, which does not depend on the results, and skip fitting.
+        Default True.
+
+    Notes
+    -----
+    Each fit costs time cubic in the subsample size, so capping the subsample
+    keeps the cost constant as results accumulate. The range of the fitted
+    scales is noisy with few subsamples, so 20 are fit by default. Models are
+    then ranked much like by the estimator of Kinnison *et al.* [1]_, which
+    corresponds to ``GPLengthScalePriority(n_bootstraps=50,
+    subsample=None)``.
+
+    Before priority estimators were pluggable, models read the length scale
+    of the kernel they passed to the regressor rather than of the fitted
+    kernel, so their priorities only depended on the random initial length
+    scales. ``GPLengthScalePriority(n_bootstraps=50, fitted=False)``
+    computes priorities the same way.
+
+    References
+    ----------
+    .. [1] Kinnison, J., Kremer-Herman, N., Thain, D., & Scheirer, W. (2017).
+       SHADHO: Massively Scalable Hardware-Aware Distributed Hyperparameter
+       Optimization. arXiv preprint arXiv:1707.01428.
+    """
+    def __init__(self, n_bootstraps=20, subsample=256, fraction=0.8,
+                 n_restarts_optimizer=0, fitted=True):
+        self.n_bootstraps = n_bootstraps
+        self.subsample = subsample
+        self.fraction = fraction
+        self.n_restarts_optimizer = n_restarts_optimizer
+        self.fitted = fitted
+
+    def __call__(self, features, losses, random_state):
+        """Estimate the priority of a model.
+
+        Parameters
+        ----------
+        features : `numpy.ndarray`
+            Array of shape (n, d) of encoded hyperparameter values.
+        losses : `numpy.ndarray`
+            Array of shape (n,) of losses.
+        random_state : `numpy.random.Generator` or `numpy.random.RandomState`
+            The random stream used to draw subsamples and initial length
+            scales.
+
+        Returns
+        -------
+        priority : float
+        """
+        n = features.shape[0]
+        size = int(np.ceil(n * self.fraction))
+        if self.subsample is not None:
+            size = min(size, self.subsample)
+        size = min(max(size, 2), n)
+
+        scales = np.zeros((self.n_bootstraps,), dtype=np.float64)
+        for i in range(self.n_bootstraps):
+            idx = random_state.choice(n, size=size, replace=False)
+            est = random_state.uniform(0.1, 2.0)
+            if not self.fitted:
+                scales[i] = 1.0 / np.log(est)
+                continue
+            gp = GaussianProcessRegressor(
+                kernel=RBF(length_scale=est),
+                alpha=1e-5,
+                n_restarts_optimizer=self.n_restarts_optimizer,
+                random_state=int(rng.integers(random_state, 2 ** 31 - 1)))
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                gp.fit(features[idx], losses[idx])
+            scales[i] = 1.0 / gp.kernel_.length_scale
+
+        return float(scales.max() - scales.min())
+
+
+# Estimators hold no per-model state, so one instance is shared by all models.
+DEFAULT_ESTIMATOR = GPLengthScalePriority()
@@ -0,0 +1,143 @@
+from pyrameter.models.random_search import RandomSearchModel
+
+import warnings
+
+import numpy as np
+
+
+class QuasiRandomSearchModel(RandomSearchModel):
+    """Generate hyperparameters from a low-discrepancy sequence.
+
+    Points are drawn from a scrambled quasi-random sequence over the unit
+    hypercube with one dimension per domain, then mapped into each domain
+    with `pyrameter.Domain.ppf`. Compared to random search, the points cover
+    the search space more evenly for the same number of evaluations.
+
+    Parameters
+    ----------
+    id : str, optional
+    domains : list of `pyrameter.Domain`, optional
+    results : list of `pyrameter.models.Result`, optional
+    update_complexity : bool, optional
+    priority_update_freq : int, optional
+    scramble : bool, optional
+        Whether to randomly scramble the sequence. Default True.
+    qmc_seed : int, optional
+        Seed of the scrambling. If not supplied, one is drawn from this model's
+        random stream the first time values are generated.
+    draws : int, optional
+        The number of points already drawn from the sequence. Defaults to the
+        number of results.
+
+    Attributes
+    ----------
+    draws : int
+        The number of points drawn from the sequence so far.
+
+    Notes
+    -----
+    The sequence is resumable: the next point generated is always point
+    ``draws`` of the sequence, so a model restored from storage with the same
+    ``qmc_seed`` continues where it left off. Points are never repeated, even
+    if they are generated without recording results.
+
+    `scipy.stats.qmc` requires scipy 1.7 or later. It is only imported when
+    values are first generated, so the rest of pyrameter works with older
+    versions of scipy.
+
+    See Also
+    --------
+    `pyrameter.models.RandomSearchModel`
+    `scipy.stats.qmc`
+    """
+
+    TYPE = 'sobol'
+    ENGINE = 'Sobol'
+
+    def __init__(self, id=None, domains=None, results=None,
+                 update_complexity=True, priority_update_freq=10,
+                 scramble=True, qmc_seed=None, draws=None):
+        super(QuasiRandomSearchModel, self).__init__(
+            id=id,
+            domains=domains,
+            results=results,
+            update_complexity=update_complexity,
+            priority_update_freq=priority_update_freq)
+        self.scramble = scramble
+        self.qmc_seed = qmc_seed
+        self.draws = len(self.results) if draws is None else draws
+        self._engine = None
+        self._position = 0
+
+    def _get_engine(self, position):
+        """Get a sequence engine positioned at point ``position``."""
+        d = len(self.domains)
+        if self._engine is None or self._engine.d != d or \
+           self._position != position:
+            from scipy.stats import qmc
+            if self.qmc_seed is None:
+                self.qmc_seed = int(self.random_state.integers(2 ** 31 - 1))
+            engine = getattr(qmc, self.ENGINE)
+            self._engine = engine(d, scramble=self.scramble,
+                                  seed=self.qmc_seed)
+            if position > 0:
+                self._engine.fast_forward(position)
+            self._position = position
+        return self._engine
+
+    def generate(self, size=None):
+        """Generate hyperparameter values.
+
+        Parameters
+        ----------
+        size : int, optional
+            If supplied, generate this many sets of hyperparameter values.
+
+        Returns
+        -------
+        A list containing one hyperparameter value per domain in this model.
+        If ``size`` is supplied, a list of ``size`` such lists.
+        """
+        n = 1 if size is None else size
+        if len(self.domains) == 0:
+            return [] if size is None else [[] for _ in range(n)]
+
+        engine = self._get_engine(self.draws)
+        with warnings.catch_warnings():
+            # Sobol warns when n is not a power of 2.
+            warnings.simplefilter('ignore')
+            points = engine.random(n)
+        self._position += n
+        self.draws += n
+
+        # Keep quantiles off of 0 and 1, where unbounded ppfs are infinite.
+        eps = np.finfo(points.dtype).eps
+        points = np.clip(points, eps, 1.0 - eps)
+
+        compiled = self.compiled
+        if compiled is not None:
+            columns = compiled.ppf(points)
+        else:
+            columns = [domain.ppf(points[:, j])
+                       for j, domain in enumerate(self.domains)]
+        params = [list(row) for row in zip(*columns)]
+        return params[0] if size is None else params
+
+    def to_json(self):
+        j = super(QuasiRandomSearchModel, self).to_json()
+        j['model_parameters'].update({'scramble': self.scramble,
+                                      'qmc_seed': self.qmc_seed,
+                                      'draws': self.draws})
+        return j
+
+
+class HaltonSearchModel(QuasiRandomSearchModel):
+    """Generate hyperparameters from a scrambled Halton sequence.
+
+    See Also
+    --------
+    `pyrameter.models.QuasiRandomSearchModel`
+    """
+
+    TYPE = 'halton'
+    ENGINE = 'Halton'
@@ -1,3 +1,4 @@
+from pyrameter.domain import ExhaustiveDomain
 from pyrameter.models.model import Model
 
 
@@ -41,16 +42,29 @@ class RandomSearchModel(Model):
 
     TYPE = 'random'
 
-    def generate(self):
+    def generate(self, size=None):
         """Generate hyperparameter values.
 
         Randomly generates hyperparameter values from each domain in this
-        model.
+        model using this model's random stream. Exhaustive domains are
+        enumerated together over their Cartesian product.
+
+        Parameters
+        ----------
+        size : int, optional
+            If supplied, generate this many sets of hyperparameter values with
+            a single vectorized draw per domain.
 
         Returns
         -------
-        A dictionary containing hyperparameter values structured the same as
-        the specification tree that created this model.
+        A list containing one hyperparameter value per domain in this model.
+        If ``size`` is supplied, a list of ``size`` such lists.
+
+        Raises
+        ------
+        IndexError
+            Raised if this model has exhaustive domains and its shard of their
+            grid is empty.
 
         Notes
         -----
@@ -64,8 +78,43 @@ class RandomSearchModel(Model):
            hyper-parameter optimization. Journal of Machine Learning Research,
            13(Feb), 281-305.
         """
-        # Create a list of randomly-generated paramters from each domain
-        params = []
-        for domain in self.domains:
-            params.append(domain.generate())
-        return params
+        # Exhaustive domains are enumerated jointly, resuming from the number
+        # of results already generated.
+        axes, grid = self.grid
+        position = len(self.results)
+        random_state = self.random_state
+        n = 1 if size is None else size
+
+        compiled = self.compiled
+        if compiled is not None:
+            # Sample every non-exhaustive domain in one vectorized pass
+            columns = compiled.sample(n, random_state, columns=[
+                i for i in range(len(self.domains)) if i not in axes])
+        elif size is None:
+            # Create a list of randomly-generated paramters from each domain
+            params = []
+            for domain in self.domains:
+                if isinstance(domain, ExhaustiveDomain):
+                    params.append(None)
+                else:
+                    params.append(domain.generate(random_state=random_state))
+            if axes:
+                for i, idx in zip(axes, grid[position]):
+                    params[i] = self.domains[i].map_to_domain(idx)
+            return params
+        else:
+            columns = []
+            for domain in self.domains:
+                if isinstance(domain, ExhaustiveDomain):
+                    columns.append(None)
+                else:
+                    columns.append(
+                        domain.generate_batch(size, random_state=random_state))
+
+        if axes:
+            digits = grid.configs(position, n)
+            for j, i in enumerate(axes):
+                columns[i] = self.domains[i].map_to_domain(digits[:, j])
+        params = [list(row) for row in zip(*columns)] if columns \
+            else [[] for _ in range(n)]
+        return params[0] if size is None else params
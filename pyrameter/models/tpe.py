@@ -1,3 +1,4 @@
+from pyrameter import rng
 from pyrameter.models.random_search import RandomSearchModel
 
 import numpy as np
@@ -65,49 +66,100 @@ class TPEModel(RandomSearchModel):
         self.n_samples = n_samples
         self.warm_up = warm_up
 
-    def generate(self):
+    def generate(self, size=None):
+        """Generate hyperparameter values.
+
+        Parameters
+        ----------
+        size : int, optional
+            If supplied, generate this many sets of hyperparameter values.
+
+        Returns
+        -------
+        A list containing one hyperparameter value per domain in this model.
+        If ``size`` is supplied, a list of ``size`` such lists.
+
+        Notes
+        -----
+        Each set in a batch is treated as though the sets before it had
+        already been recorded, so random search is injected at the same
+        positions as when generating one set at a time. The density models
+        are fit once per call and shared by the whole batch.
+        """
+        if size is None:
+            if self._warming_up(len(self.results)):
+                return super(TPEModel, self).generate()
+            return self._suggest(self._fit())
+
+        position = len(self.results)
+        warm = [self._warming_up(position + k) for k in range(size)]
+        n_random = sum(warm)
+        randoms = iter(super(TPEModel, self).generate(size=n_random)
+                       if n_random > 0 else [])
+        densities = self._fit() if n_random < size else None
+        return [next(randoms) if w else self._suggest(densities)
+                for w in warm]
+
+    def _warming_up(self, position):
+        """Whether the set generated at ``position`` comes from random search."""
         # Warm up with random search and inject new random search
         # hyperparameters at an interval. This attempts to prevent TPE from
-        # converging too quickly.
-        if len(self.results) < self.warm_up or len(self.results) % self.warm_up == 0:
-            params = super(TPEModel, self).generate()
-        else:
-            params = np.zeros((len(self.domains),))
-
-            # Collect all of the evaluated hyperparameter values and their
-            # associated objective function value into a feature vector.
-            vec = self.results_to_feature_vector()
-            features, losses = np.copy(vec[:, :-1]), np.copy(vec[:, -1])
-            features = features.T
-
-            # Sort the hyperparameters by their performance and split into
-            # the "best" and "rest" performers.
-            idx = np.argsort(losses, axis=0)
-            split = int(np.ceil(idx.shape[0] * self.best_split))
-            losses = np.reshape(losses, (-1, 1))
-
-            # Model the objective function based on each feature.
-            for j in range(features.shape[0]):
-                l = GaussianMixture(**self.gmm_kws)  # "best" hyperparameters
-                g = GaussianMixture(**self.gmm_kws)  # "rest" hyperparameters
-                l.fit(np.reshape(features[j, idx[:split]], (-1, 1)),
-                      losses[idx[:split]])
-                g.fit(np.reshape(features[j, idx[split:]], (-1, 1)),
-                      losses[idx[split:]])
-
-                # Sample hyperparameter values from the "best" model and score
-                # the samples with each model.
-                samples, _ = l.sample(n_samples=10)
-                score_l = l.score(samples)
-                score_g = g.score(samples)
-
-                # Compute the expected improvement; i.e. maximize the l score
-                # while minimizing the g score. Higher values are better.
-                ei = score_l / score_g
-                best = samples[np.argmax(np.squeeze(ei).ravel())]
-
-                # Add the value with the best expected improvement
-                domain = self.domains[j]
-                params[j] += domain.map_to_domain(best[0], bound=True)
+        # converging too quickly. The density models need at least two
+        # finished results to fit.
+        return position < self.warm_up or position % self.warm_up == 0 or \
+            len(self.store) < 2
+
+    def _fit(self):
+        """Fit the "best" and "rest" density models of each hyperparameter."""
+        # Collect all of the evaluated hyperparameter values and their
+        # associated objective function value into a feature vector.
+        vec = self.results_to_feature_vector()
+        features, losses = np.copy(vec[:, :-1]), np.copy(vec[:, -1])
+        features = features.T
+
+        # Sort the hyperparameters by their performance and split into
+        # the "best" and "rest" performers.
+        idx = np.argsort(losses, axis=0)
+        split = int(np.ceil(idx.shape[0] * self.best_split))
+        losses = np.reshape(losses, (-1, 1))
+
+        # Model the objective function based on each feature.
+        densities = []
+        for j in range(features.shape[0]):
+            l = self._mixture()  # "best" hyperparameters
+            g = self._mixture()  # "rest" hyperparameters
+            l.fit(np.reshape(features[j, idx[:split]], (-1, 1)),
+                  losses[idx[:split]])
+            g.fit(np.reshape(features[j, idx[split:]], (-1, 1)),
+                  losses[idx[split:]])
+            densities.append((l, g))
+        return densities
+
+    def _mixture(self):
+        """Create a density model that samples from this model's stream."""
+        kws = dict(self.gmm_kws)
+        if 'random_state' not in kws:
+            kws['random_state'] = np.random.RandomState(
+                rng.integers(self.random_state, 2 ** 31 - 1))
+        return GaussianMixture(**kws)
+
+    def _suggest(self, densities):
+        """Choose one set of values with the fitted density models."""
+        params = np.zeros((len(self.domains),))
+        for j, (l, g) in enumerate(densities):
+            # Sample hyperparameter values from the "best" model and score
+            # the samples with each model.
+            samples, _ = l.sample(n_samples=10)
+            score_l = l.score(samples)
+            score_g = g.score(samples)
+
+            # Compute the expected improvement; i.e. maximize the l score
+            # while minimizing the g score. Higher values are better.
+            ei = score_l / score_g
+            best = samples[np.argmax(np.squeeze(ei).ravel())]
+
+            # Add the value with the best expected improvement
+            domain = self.domains[j]
+            params[j] += domain.map_to_domain(best[0], bound=True)
 
         return params
@@ -0,0 +1,123 @@
+"""Incrementally maintained orderings of models.
+
+Classes
+-------
+RankIndex
+    Orders of models by complexity and by priority, in which a model whose
+    heuristics change is repositioned without re-sorting the others.
+"""
+import bisect
+import itertools
+
+import numpy as np
+
+
+class RankIndex(object):
+    """Orders of models by complexity and by priority.
+
+    Models are kept in two sorted lists of keys, one ordered by decreasing
+    complexity and one by decreasing priority. Updating a model removes and
+    reinserts only its own keys.
+
+    Notes
+    -----
+    Ties in complexity are broken by the order in which models were added to
+    the index. Ties in priority are broken by complexity, then by the order
+    models were added, matching a stable sort by priority of the models
+    sorted by complexity.
+
+    Finding the position of a key takes logarithmic time. Inserting into or
+    deleting from the lists shifts the keys after it with a single memory
+    move.
+    """
+    def __init__(self):
+        self._keys = {}
+        self._by_complexity = []
+        self._by_priority = []
+        self._seq = itertools.count()
+        self._added = {}
+        self.changed = False
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, model_id):
+        return model_id in self._keys
+
+    def update(self, model_id, complexity, priority):
+        """Add a model or reposition it after its heuristics changed.
+
+        Parameters
+        ----------
+        model_id : str
+            The id of the model.
+        complexity : float
+            The complexity of the model.
+        priority : float
+            The priority of the model.
+
+        Returns
+        -------
+        moved : bool
+            True if the model was added or repositioned.
+        """
+        old = self._keys.get(model_id)
+        if old is not None and old[1][0] == -priority and \
+           old[1][1] == -complexity:
+            return False
+        if model_id not in self._added:
+            self._added[model_id] = next(self._seq)
+        seq = self._added[model_id]
+        keys = ((-complexity, seq, model_id),
+                (-priority, -complexity, seq, model_id))
+        if old is not None:
+            self._delete(self._by_complexity, old[0])
+            self._delete(self._by_priority, old[1])
+        bisect.insort(self._by_complexity, keys[0])
+        bisect.insort(self._by_priority, keys[1])
+        self._keys[model_id] = keys
+        self.changed = True
+        return True
+
+    def remove(self, model_id):
+        """Remove a model from the index. Unknown models are ignored."""
+        keys = self._keys.pop(model_id, None)
+        self._added.pop(model_id, None)
+        if keys is not None:
+            self._delete(self._by_complexity, keys[0])
+            self._delete(self._by_priority, keys[1])
+            self.changed = True
+
+    @staticmethod
+    def _delete(keys, key):
+        del keys[bisect.bisect_left(keys, key)]
+
+    def rank(self, complexity=True, priority=True):
+        """Rank the models by their positions in each order.
+
+        Parameters
+        ----------
+        complexity : bool
+            If true, include the position of each model by complexity.
+        priority : bool
+            If true, include the position of each model by priority.
+
+        Returns
+        -------
+        model_ids : list of str
+            The ids of the models, sorted by rank. Ties are broken by
+            position in the priority order.
+        ranks : `numpy.ndarray`
+            The rank of each model in ``model_ids``: the product of its
+            included positions, counted from 0.
+        """
+        self.changed = False
+        ids = [key[-1] for key in self._by_priority]
+        ip = np.arange(len(ids))
+        rank = ip.copy() if priority else np.ones_like(ip)
+        if complexity:
+            position = dict((key[-1], i)
+                            for i, key in enumerate(self._by_complexity))
+            rank *= np.array([position[mid] for mid in ids], dtype=ip.dtype)
+        order = np.lexsort((ip, rank))
+        return [ids[i] for i in order], rank[order]
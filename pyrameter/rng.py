@@ -0,0 +1,121 @@
+"""Reproducible random number streams for pyrameter.
+
+Every domain and model draws from its own `numpy.random.Generator` backed by
+a PCG64 bit generator. Streams are spawned from a single root
+`numpy.random.SeedSequence`, so an entire search is reproducible from one
+seed, while each stream stays statistically independent of the others.
+
+Functions
+---------
+seed
+    Reset the root seed that new streams are spawned from.
+spawn
+    Spawn independent child seed sequences, e.g. to hand to worker processes.
+default_rng
+    Create a new random stream.
+integers
+    Draw integers from either a Generator or a legacy RandomState.
+"""
+import numpy as np
+
+
+_ROOT = np.random.SeedSequence()
+
+
+def as_seed_sequence(seed=None):
+    """Convert a seed into a `numpy.random.SeedSequence`.
+
+    Parameters
+    ----------
+    seed : int, sequence of int, or `numpy.random.SeedSequence`, optional
+        The seed to convert. If None, a new child of the root seed is spawned.
+
+    Returns
+    -------
+    seed_sequence : `numpy.random.SeedSequence`
+    """
+    if seed is None:
+        return spawn()
+    elif isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def seed(entropy=None):
+    """Reset the root seed that all new random streams are spawned from.
+
+    Parameters
+    ----------
+    entropy : int, sequence of int, or `numpy.random.SeedSequence`, optional
+        The new root seed. If None, fresh entropy is drawn from the OS.
+
+    Returns
+    -------
+    root : `numpy.random.SeedSequence`
+        The new root seed sequence.
+    """
+    global _ROOT
+    if isinstance(entropy, np.random.SeedSequence):
+        _ROOT = entropy
+    else:
+        _ROOT = np.random.SeedSequence(entropy)
+    return _ROOT
+
+
+def spawn(n=None, parent=None):
+    """Spawn independent child seed sequences.
+
+    Parameters
+    ----------
+    n : int, optional
+        The number of children to spawn. If None, spawn a single child.
+    parent : `numpy.random.SeedSequence`, optional
+        The seed sequence to spawn from. Defaults to the root seed.
+
+    Returns
+    -------
+    children : `numpy.random.SeedSequence` or list thereof
+        A single child if ``n`` is None, otherwise a list of ``n`` children.
+        Child seed sequences are small and may be sent to worker processes to
+        create independent streams there.
+    """
+    parent = _ROOT if parent is None else parent
+    return parent.spawn(1)[0] if n is None else parent.spawn(n)
+
+
+def default_rng(seed=None):
+    """Create a new random stream.
+
+    Parameters
+    ----------
+    seed : int, sequence of int, or `numpy.random.SeedSequence`, optional
+        The seed of the new stream. If None, a new child of the root seed is
+        spawned.
+
+    Returns
+    -------
+    rng : `numpy.random.Generator`
+        A PCG64-backed random generator.
+    """
+    return np.random.Generator(np.random.PCG64(as_seed_sequence(seed)))
+
+
+def integers(random_state, high, size=None):
+    """Draw integers in [0, ``high``) from any NumPy random source.
+
+    Parameters
+    ----------
+    random_state : `numpy.random.Generator` or `numpy.random.RandomState`
+        The random source to draw from.
+    high : int
+        One greater than the largest integer to draw.
+    size : int, optional
+        The number of integers to draw. If None, draw a single integer.
+
+    Returns
+    -------
+    ints : int or `numpy.ndarray`
+    """
+    if isinstance(random_state, np.random.Generator):
+        return random_state.integers(0, high, size=size)
+    return random_state.randint(0, high, size=size)
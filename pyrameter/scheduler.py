@@ -0,0 +1,432 @@
+"""Policies for allocating evaluations between the models of a search.
+
+Classes
+-------
+Scheduler
+    Base class of bandit policies that choose which model to evaluate next.
+UCBScheduler
+    Choose the model with the highest upper confidence bound.
+ThompsonScheduler
+    Choose models by Thompson sampling of their mean loss.
+SuccessiveRejectsScheduler
+    Evaluate models in rounds, rejecting the worst model after each round.
+
+Functions
+---------
+get_scheduler
+    Create a scheduler from its name.
+
+Notes
+-----
+By default, `pyrameter.ModelGroup` selects models by their complexity and
+priority rank. A scheduler replaces that selection: each model is treated as
+an arm of a multi-armed bandit whose rewards are the losses of its results,
+so that models that are clearly worse than the rest are evaluated less.
+"""
+import numpy as np
+from six import string_types
+
+from pyrameter import rng
+
+
+class InvalidSchedulerError(Exception):
+    """Raised when an invalid scheduler is supplied to get_scheduler."""
+    def __init__(self, scheduler):
+        msg = 'The supplied scheduler {} is not a valid scheduler.'
+        msg += '\nValid inputs include instances of pyrameter.scheduler.'
+        msg += 'Scheduler,\n "ucb", "thompson", and "successive_rejects".'
+        super(InvalidSchedulerError, self).__init__(msg.format(scheduler))
+
+
+class MissingBudgetError(Exception):
+    """Raised when a budgeted scheduler is requested by name alone."""
+    def __init__(self, scheduler):
+        msg = 'The "{}" scheduler requires the total number of evaluations.'
+        msg += '\nPass an instance instead, e.g.\n scheduler='
+        msg += 'pyrameter.scheduler.SuccessiveRejectsScheduler(budget=1000).'
+        super(MissingBudgetError, self).__init__(msg.format(scheduler))
+
+
+class Scheduler(object):
+    """Base class of bandit policies that choose which model to evaluate.
+
+    Parameters
+    ----------
+    random_state : `numpy.random.Generator`, optional
+        The random stream of the policy. Spawned from `pyrameter.rng` if not
+        supplied.
+
+    Attributes
+    ----------
+    model_ids : list of str
+        The ids of the scheduled models.
+
+    Notes
+    -----
+    Statistics of each model are kept in preallocated arrays and updated in
+    constant time as results are registered. A model is "pulled" each time
+    it is selected, and "observed" each time one of its results is
+    registered with a finite loss. Subclasses implement
+    `pyrameter.scheduler.Scheduler.choose`.
+    """
+    # Columns of the statistics array
+    PULLS, COUNT, TOTAL, SQUARES, ACTIVE = range(5)
+
+    def __init__(self, random_state=None):
+        self.model_ids = []
+        self._index = {}
+        self._stats = np.zeros((16, 5), dtype=np.float64)
+        self._random_state = random_state
+        self._lo = np.inf
+        self._hi = -np.inf
+
+    def __len__(self):
+        return len(self.model_ids)
+
+    def __contains__(self, model_id):
+        return model_id in self._index
+
+    @property
+    def random_state(self):
+        if self._random_state is None:
+            self._random_state = rng.default_rng()
+        return self._random_state
+
+    @random_state.setter
+    def random_state(self, value):
+        self._random_state = value
+
+    def seed(self, seed=None):
+        """Reset the random stream of this scheduler.
+
+        Parameters
+        ----------
+        seed : int or `numpy.random.SeedSequence`, optional
+            The seed of the new stream.
+        """
+        self._random_state = rng.default_rng(seed)
+
+    @property
+    def stats(self):
+        """View of the statistics of each scheduled model."""
+        return self._stats[:len(self.model_ids)]
+
+    @property
+    def pulls(self):
+        """Number of times each model has been selected."""
+        return self.stats[:, self.PULLS]
+
+    @property
+    def counts(self):
+        """Number of finite losses observed for each model."""
+        return self.stats[:, self.COUNT]
+
+    @property
+    def active(self):
+        """Whether each model may still be selected."""
+        return self.stats[:, self.ACTIVE] > 0
+
+    def means(self):
+        """Mean observed loss of each model, NaN if none were observed."""
+        stats = self.stats
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return stats[:, self.TOTAL] / stats[:, self.COUNT]
+
+    def normalized_means(self):
+        """Mean observed losses scaled to [0, 1] by the observed range.
+
+        Models without observations get 0, the best possible value.
+        """
+        means = self.means()
+        scale = self._hi - self._lo
+        if not np.isfinite(scale) or scale <= 0:
+            return np.zeros(means.shape)
+        return np.where(np.isnan(means), 0.0, (means - self._lo) / scale)
+
+    def add_model(self, model_id):
+        """Start scheduling a model.
+
+        Parameters
+        ----------
+        model_id : str
+            The id of the model. Models already scheduled are ignored.
+        """
+        if model_id in self._index:
+            return
+        n = len(self.model_ids)
+        if n == self._stats.shape[0]:
+            grown = np.zeros((2 * n, self._stats.shape[1]),
+                             dtype=self._stats.dtype)
+            grown[:n] = self._stats
+            self._stats = grown
+        self._stats[n] = 0.0
+        self._stats[n, self.ACTIVE] = 1.0
+        self._index[model_id] = n
+        self.model_ids.append(model_id)
+
+    def remove_model(self, model_id):
+        """Stop scheduling a model.
+
+        Parameters
+        ----------
+        model_id : str
+            The id of the model. Unknown models are ignored.
+        """
+        row = self._index.pop(model_id, None)
+        if row is None:
+            return
+        last = len(self.model_ids) - 1
+        if row != last:
+            self._stats[row] = self._stats[last]
+            self.model_ids[row] = self.model_ids[last]
+            self._index[self.model_ids[row]] = row
+        self.model_ids.pop()
+
+    def update(self, model_id, loss, previous=None):
+        """Record the loss of a registered result.
+
+        Parameters
+        ----------
+        model_id : str
+            The id of the model the result belongs to. Unknown models are
+            ignored.
+        loss : float or None
+            The registered loss. Missing and non-finite losses are ignored.
+        previous : float, optional
+            The loss the result was registered with before, if any, which is
+            replaced by ``loss``.
+        """
+        row = self._index.get(model_id)
+        if row is None:
+            return
+        for value, sign in [(previous, -1.0), (loss, 1.0)]:
+            if value is not None and np.isfinite(value):
+                self._stats[row, self.COUNT] += sign
+                self._stats[row, self.TOTAL] += sign * value
+                self._stats[row, self.SQUARES] += sign * value ** 2
+        if loss is not None and np.isfinite(loss):
+            self._lo = min(self._lo, loss)
+            self._hi = max(self._hi, loss)
+            self.observed(row)
+
+    def observed(self, row):
+        """Update the policy after an observation of the model in ``row``."""
+        pass
+
+    def select(self, size=None):
+        """Select the models to evaluate next.
+
+        Parameters
+        ----------
+        size : int, optional
+            The number of models to select. Models are selected one after
+            another, each counting as pulled before the next is chosen.
+
+        Returns
+        -------
+        model_id : str or list of str
+            The id of the selected model, or a list of ``size`` ids.
+
+        Raises
+        ------
+        ValueError
+            Raised if no models are scheduled.
+        """
+        if len(self.model_ids) == 0:
+            raise ValueError('No models to schedule.')
+        ids = []
+        for _ in range(1 if size is None else size):
+            row = self.choose()
+            self._stats[row, self.PULLS] += 1
+            ids.append(self.model_ids[row])
+        return ids[0] if size is None else ids
+
+    def choose(self):
+        """Choose the row of the next model to pull.
+
+        This method must be overridden in subclasses to implement a policy.
+
+        Returns
+        -------
+        row : int
+            Index of the chosen model in ``model_ids``.
+
+        Raises
+        ------
+        NotImplementedError
+        """
+        raise NotImplementedError
+
+
+class UCBScheduler(Scheduler):
+    """Choose the model with the highest upper confidence bound.
+
+    Implements UCB1 [1]_ with rewards of one minus the normalized mean loss.
+    Every model is pulled once before any is pulled twice.
+
+    Parameters
+    ----------
+    c : float, optional
+        Weight of the exploration bonus. Default 1.0.
+    random_state : `numpy.random.Generator`, optional
+        Unused by this policy.
+
+    References
+    ----------
+    .. [1] Auer, P., Cesa-Bianchi, N., & Fischer, P. (2002). Finite-time
+       analysis of the multiarmed bandit problem. Machine Learning, 47(2-3),
+       235-256.
+    """
+    def __init__(self, c=1.0, random_state=None):
+        super(UCBScheduler, self).__init__(random_state=random_state)
+        self.c = c
+
+    def choose(self):
+        pulls = self.pulls
+        unpulled = np.flatnonzero(pulls == 0)
+        if unpulled.shape[0] > 0:
+            return int(unpulled[0])
+        bonus = np.sqrt(2.0 * np.log(pulls.sum()) / pulls)
+        score = 1.0 - self.normalized_means() + self.c * bonus
+        return int(np.argmax(score))
+
+
+class ThompsonScheduler(Scheduler):
+    """Choose models by Thompson sampling of their mean loss.
+
+    The mean loss of each model has a normal posterior centered on its
+    observed losses plus one pseudo-observation of the mean loss over all
+    models, with the spread of all observed losses. The model with the lowest
+    sampled mean is chosen.
+
+    Parameters
+    ----------
+    random_state : `numpy.random.Generator`, optional
+        The random stream used for sampling.
+    """
+    def choose(self):
+        stats = self.stats
+        n = stats[:, self.COUNT]
+        total = n.sum()
+        if total > 0:
+            prior = stats[:, self.TOTAL].sum() / total
+            var = stats[:, self.SQUARES].sum() / total - prior ** 2
+        else:
+            prior, var = 0.0, 0.0
+        scale = np.sqrt(var) if var > 0 else 1.0
+
+        mean = (stats[:, self.TOTAL] + prior) / (n + 1.0)
+        std = scale / np.sqrt(n + 1.0)
+        return int(np.argmin(self.random_state.normal(mean, std)))
+
+
+class SuccessiveRejectsScheduler(Scheduler):
+    """Evaluate models in rounds, rejecting the worst model after each round.
+
+    Implements successive rejects [1]_ for a fixed budget of evaluations. In
+    round k, every remaining model is evaluated until it has at least n_k
+    finished results, then the model with the highest mean loss is rejected
+    and never selected again.
+
+    Parameters
+    ----------
+    budget : int
+        The total number of evaluations of the search.
+    random_state : `numpy.random.Generator`, optional
+        Unused by this policy.
+
+    Attributes
+    ----------
+    phase : int
+        The current round, starting from 1.
+
+    Notes
+    -----
+    Within a round, the remaining model with the fewest pulls is selected,
+    so that evaluations still running count towards the round. Models added
+    during the search join the current round.
+
+    References
+    ----------
+    .. [1] Audibert, J.-Y., & Bubeck, S. (2010). Best arm identification in
+       multi-armed bandits. Proceedings of the 23rd Conference on Learning
+       Theory.
+    """
+    def __init__(self, budget, random_state=None):
+        super(SuccessiveRejectsScheduler, self).__init__(
+            random_state=random_state)
+        self.budget = budget
+        self.phase = 1
+
+    def round_size(self, phase=None):
+        """The number of results each model needs in a round.
+
+        Parameters
+        ----------
+        phase : int, optional
+            The round. Defaults to the current round.
+
+        Returns
+        -------
+        n_k : int
+        """
+        phase = self.phase if phase is None else phase
+        k = len(self.model_ids)
+        if k < 2:
+            return 1
+        logbar = 0.5 + sum(1.0 / i for i in range(2, k + 1))
+        n_k = np.ceil((self.budget - k) / (logbar * (k + 1 - phase)))
+        return max(int(n_k), 1)
+
+    def choose(self):
+        active = np.flatnonzero(self.active)
+        return int(active[np.argmin(self.pulls[active])])
+
+    def observed(self, row):
+        active = np.flatnonzero(self.active)
+        while active.shape[0] > 1 and \
+              np.all(self.counts[active] >= self.round_size()):
+            worst = active[np.argmax(self.means()[active])]
+            self._stats[worst, self.ACTIVE] = 0.0
+            self.phase += 1
+            active = np.flatnonzero(self.active)
+
+
+def get_scheduler(scheduler, *args, **kwargs):
+    """Create a scheduler from its name.
+
+    Parameters
+    ----------
+    scheduler : instance of `pyrameter.scheduler.Scheduler` or {"ucb", "thompson", "successive_rejects"}
+        The scheduler to create. Instances are returned as-is.
+
+    Other Parameters
+    ----------------
+    *args
+        Arguments to the scheduler.
+    **kwargs
+        Keyword arguments to the scheduler.
+
+    Returns
+    -------
+    scheduler : `pyrameter.scheduler.Scheduler`
+
+    Raises
+    ------
+    InvalidSchedulerError
+        Raised when an invalid scheduler is supplied.
+    MissingBudgetError
+        Raised when "successive_rejects" is requested without a budget.
+    """
+    if isinstance(scheduler, Scheduler):
+        return scheduler
+    elif isinstance(scheduler, string_types):
+        if scheduler == 'ucb':
+            return UCBScheduler(*args, **kwargs)
+        elif scheduler == 'thompson':
+            return ThompsonScheduler(*args, **kwargs)
+        elif scheduler == 'successive_rejects':
+            if len(args) == 0 and 'budget' not in kwargs:
+                raise MissingBudgetError(scheduler)
+            return SuccessiveRejectsScheduler(*args, **kwargs)
+    raise InvalidSchedulerError(scheduler)
@@ -1,6 +1,9 @@
-import copy
+import hashlib
+import json
+import multiprocessing
+import pickle
 
-from pyrameter.domain import Domain, DiscreteDomain
+from pyrameter.domain import Domain, DiscreteDomain, _identity
 from pyrameter.models import get_model_class
 
 
@@ -13,6 +16,12 @@ class DuplicateDomainError(Exception):
         super(DuplicateDomainError, self).__init__(msg)
 
 
+def _split_scope(task):
+    """Split a pickled sub-scope in a worker process."""
+    scope, path, dedupe = pickle.loads(task)
+    return scope.split(path=path, dedupe=dedupe)
+
+
 class Scope(object):
     """A container for related hyperparameter domains.
 
@@ -32,7 +41,7 @@ class Scope(object):
         False.
     optional : bool
         If True, split this scope by creating an empty clone. Default: False.
-    model : {'random','tpe','gp'}
+    model : {'random','sobol','halton','tpe','gp'}
         The search strategy to use.
 
     Attributes
@@ -66,6 +75,7 @@ class Scope(object):
             model = 'random'
 
         self.children = {}
+        self._leaves = {}
 
         for arg in args:
             key, val = arg
@@ -106,8 +116,9 @@ class Scope(object):
         ----------
         name : str
             The name of this child node.
-        val : `pyrameter.Domain` or `pyrameter.Scope`
-            The Domain or Scope to add.
+        val : `pyrameter.Domain` or `pyrameter.Scope` or dict
+            The Domain or Scope to add. Dicts are converted into Scopes once
+            here, so the leaves bound while splitting them are reused.
 
         Raises
         ------
@@ -115,6 +126,8 @@ class Scope(object):
             Raised when attempting to add a child with a duplicate key.
         """
         if name not in self.children:
+            if isinstance(val, dict):
+                val = Scope(**val)
             self.children[name] = val
         else:
             raise DuplicateDomainError(name, self.children[name], val)
@@ -130,24 +143,51 @@ class Scope(object):
             if isinstance(val, self.__class__):
                 val.model = value
 
-    def split(self, path=''):
+    def split(self, path='', dedupe=True, n_jobs=1):
         """Split this scope into its constituent models.
 
-
+        Parameters
+        ----------
+        path : str
+            The path to this scope in the search hierarchy.
+        dedupe : bool, optional
+            If True, keep only the last of any models with the same
+            `pyrameter.models.Model.signature`, e.g. the empty models of
+            nested optional scopes. Default True.
+        n_jobs : int, optional
+            The number of processes used to split sub-scopes. Sub-scopes are
+            independent, so those of the first scope with more than one are
+            split in a process pool and their models are merged here. -1 uses
+            one process per CPU. Default 1, splitting serially.
+
+        Returns
+        -------
+        models : list of `pyrameter.models.Model`
+            Every model described by this scope.
+
+        Notes
+        -----
+        Parallel splitting requires the sub-scopes to be picklable. If they
+        are not (e.g. domains with lambda callbacks), they and everything
+        below them are split serially. Errors raised while splitting in a
+        worker process are raised here.
+
+        See Also
+        --------
+        `pyrameter.Scope.iter_split`
         """
         models = [] if self.exclusive else [self.__create_model()]
 
-        for child in self.children:
-            # Update the path to the current child in the tree
-            cpath = '/'.join([path, child])
-            cval = self.children[child]
-
-            if isinstance(cval, dict):
-                cval = Scope(**cval)
+        children = list(self.__iter_children(path))
+        subscopes = [(cpath, cval) for cpath, cval in children
+                     if isinstance(cval, Scope)]
+        splits = dict(zip([cpath for cpath, _ in subscopes],
+                          self.__split_subscopes(subscopes, dedupe, n_jobs)))
 
+        for cpath, cval in children:
             # If a Scope, do DFS to process sub-scopes
             if isinstance(cval, Scope):
-                submodels = cval.split(path=cpath)
+                submodels = splits.pop(cpath)
 
                 # If the current scope is exclusive, simple append sub-models.
                 # Otherwise merge new sub-models with existing sub-models.
@@ -157,23 +197,19 @@ class Scope(object):
                     newmodels = []
                     for model in models:
                         for submodel in submodels:
-                            m = model.copy()
+                            m = self.__create_model()
+                            m.merge(model)
                             m.merge(submodel)
                             newmodels.append(m)
                     models = newmodels
             else:
-                # Convert non-Domain values into single-value domains
-                if not isinstance(cval, Domain):
-                    cval = DiscreteDomain([cval])
-
                 # Store the Domain into its own Model to merge later
-                cval = copy.deepcopy(cval)
-                cval.path = cpath
-                m = self.__create_model()
-                m.add_domain(cval)
+                m = self.__create_leaf_model(cpath, cval)
 
-                # Store as individual models if exclusive, otherwise merge
-                if self.exclusive or len(models) == 0:
+                # Store as individual models if exclusive, otherwise merge.
+                # A sub-scope with no models leaves nothing to merge into,
+                # as in `pyrameter.Scope.iter_split`.
+                if self.exclusive:
                     models.append(m)
                 else:
                     for model in models:
@@ -183,16 +219,401 @@ class Scope(object):
         if self.optional:
             models.append(self.__create_model())
 
+        # Products of duplicate-free sub-models are duplicate-free, so only
+        # exclusive and optional scopes can introduce duplicates.
+        if dedupe and (self.exclusive or self.optional):
+            models = self.__dedupe(models)
+
         return models
 
+    @staticmethod
+    def __split_subscopes(subscopes, dedupe, n_jobs):
+        """Split (path, scope) pairs, in a process pool if requested."""
+        if n_jobs != 1 and len(subscopes) > 1:
+            # Pickle up front so that only unpicklable sub-scopes fall back,
+            # while errors raised in the workers propagate.
+            try:
+                tasks = [pickle.dumps((cval, cpath, dedupe),
+                                      pickle.HIGHEST_PROTOCOL)
+                         for cpath, cval in subscopes]
+            except (pickle.PicklingError, AttributeError, TypeError):
+                n_jobs = 1
+            else:
+                processes = multiprocessing.cpu_count() if n_jobs < 0 \
+                    else n_jobs
+                pool = multiprocessing.Pool(min(processes, len(subscopes)))
+                try:
+                    return pool.map(_split_scope, tasks)
+                finally:
+                    pool.terminate()
+                    pool.join()
+        return [cval.split(path=cpath, dedupe=dedupe, n_jobs=n_jobs)
+                for cpath, cval in subscopes]
+
+    @staticmethod
+    def __dedupe(models):
+        """Keep the last of each set of models with the same signature.
+
+        A kept empty model is moved to the end, matching the order of
+        `pyrameter.Scope.iter_split` and `pyrameter.Scope.model_at`.
+        """
+        # Models are bucketed by their domain paths first, so signatures are
+        # only computed for models that could be duplicates.
+        seen = {}
+        unique = []
+        empty = None
+        for model in reversed(models):
+            if len(model) == 0:
+                if empty is None:
+                    empty = model
+                continue
+            key = tuple(sorted(d.path for d in model.domains))
+            bucket = seen.setdefault(key, [])
+            if all(m.signature != model.signature for m in bucket):
+                bucket.append(model)
+                unique.append(model)
+        unique.reverse()
+        if empty is not None:
+            unique.append(empty)
+        return unique
+
+    def iter_split(self, path='', dedupe=True):
+        """Lazily split this scope into its constituent models.
+
+        Models are created one at a time, in the same order as
+        `pyrameter.Scope.split`, so that the first models are available
+        without building the full Cartesian product of sub-scopes.
+
+        Parameters
+        ----------
+        path : str
+            The path to this scope in the search hierarchy.
+        dedupe : bool, optional
+            If True, drop duplicate models as `pyrameter.Scope.split` does.
+            Default True.
+
+        Yields
+        ------
+        model : `pyrameter.models.Model`
+            The next model described by this scope.
+
+        Notes
+        -----
+        Sub-scopes of non-exclusive scopes are re-split for every model they
+        are merged into, trading repeated work for memory proportional to the
+        depth of the tree.
+
+        Sibling subtrees hold disjoint domain paths, so only empty models can
+        be duplicates. When deduplicating, they are held back and a single
+        empty model is yielded last, matching the order of
+        `pyrameter.Scope.split` without storing signatures.
+        """
+        children = []
+        for cpath, cval in self.__iter_children(path):
+            if not isinstance(cval, Scope):
+                cval = self.__create_leaf_model(cpath, cval)
+            children.append((cpath, cval))
+
+        if self.exclusive:
+            models = self.__iter_exclusive(children, dedupe)
+        else:
+            models = self.__iter_product(children, self.__create_model(),
+                                         dedupe)
+
+        defer = dedupe and (self.exclusive or self.optional)
+        empty = False
+        for model in models:
+            if defer and len(model) == 0:
+                empty = True
+            else:
+                yield model
+
+        # Create an empty model to account for optional scopes
+        if self.optional or empty:
+            yield self.__create_model()
+
+    def __iter_exclusive(self, children, dedupe):
+        """Lazily yield the models of each child in turn."""
+        for cpath, cval in children:
+            if isinstance(cval, Scope):
+                for model in cval.iter_split(path=cpath, dedupe=dedupe):
+                    yield model
+            else:
+                yield cval
+
+    def __iter_product(self, children, model, dedupe):
+        """Lazily merge ``model`` with every combination of ``children``."""
+        if len(children) == 0:
+            yield model
+            return
+
+        cpath, cval = children[0]
+        if isinstance(cval, Scope):
+            for submodel in cval.iter_split(path=cpath, dedupe=dedupe):
+                m = self.__create_model()
+                m.merge(model)
+                m.merge(submodel)
+                for merged in self.__iter_product(children[1:], m, dedupe):
+                    yield merged
+        else:
+            model.merge(cval)
+            for merged in self.__iter_product(children[1:], model, dedupe):
+                yield merged
+
+    def count_models(self, dedupe=True):
+        """Count the models this scope splits into without splitting it.
+
+        Parameters
+        ----------
+        dedupe : bool, optional
+            Count the models of ``split(dedupe=dedupe)``. Default True.
+
+        Returns
+        -------
+        count : int
+            The number of models `pyrameter.Scope.split` would create.
+
+        Notes
+        -----
+        Counts are computed combinatorially in time proportional to the size
+        of the tree: non-exclusive scopes multiply the counts of their
+        children, exclusive scopes add them, and optional scopes add one for
+        the empty model. Empty models are counted separately, since they are
+        the only models deduplication can remove.
+        """
+        nonempty, empty, _ = self.__tally(lambda val: 1, dedupe)
+        return nonempty + empty
+
+    def total_complexity(self, dedupe=True):
+        """Sum the complexities of the models this scope splits into.
+
+        Parameters
+        ----------
+        dedupe : bool, optional
+            Sum over the models of ``split(dedupe=dedupe)``. Default True.
+
+        Returns
+        -------
+        complexity : float
+            The sum of `pyrameter.models.Model.complexity` over every model
+            `pyrameter.Scope.split` would create, computed without splitting.
+        """
+        nonempty, empty, _ = self.__tally(
+            lambda val: self.__as_domain(val).complexity, dedupe)
+        return float(nonempty) + float(empty)
+
+    def __tally(self, leaf, dedupe):
+        """Total ``leaf`` over the non-empty models, and count empty models.
+
+        Parameters
+        ----------
+        leaf : callable
+            Maps a leaf value to its contribution to a single-domain model.
+            Contributions are combined like `pyrameter.Scope.count_models`.
+        dedupe : bool
+            Whether duplicate empty models are removed.
+
+        Returns
+        -------
+        nonempty
+            The combined contribution of all models with domains.
+        empty : int
+            The number of empty models, each contributing 1.
+        tallies : list of tuple
+            The ``(nonempty, empty, tallies)`` of each child in order, with
+            None in place of the tallies of leaves.
+        """
+        tallies = [cval.__tally(leaf, dedupe) if isinstance(cval, Scope)
+                   else (leaf(cval), 0, None)
+                   for _, cval in self.__iter_children()]
+
+        if self.exclusive:
+            nonempty = sum(t[0] for t in tallies)
+            empty = sum(t[1] for t in tallies)
+        else:
+            total = 1
+            empty = 1
+            for t in tallies:
+                total *= t[0] + t[1]
+                empty *= t[1]
+            nonempty = total - empty
+
+        if self.optional:
+            empty += 1
+        if dedupe and (self.exclusive or self.optional):
+            empty = min(empty, 1)
+        return nonempty, empty, tallies
+
+    def model_at(self, index, path='', dedupe=True):
+        """Create a single model of this scope by its index.
+
+        Parameters
+        ----------
+        index : int
+            The index of the model in the order of `pyrameter.Scope.split`.
+            Negative indices count from the end.
+        path : str
+            The path to this scope in the search hierarchy.
+        dedupe : bool, optional
+            Index into the models of ``split(dedupe=dedupe)``. Default True.
+
+        Returns
+        -------
+        model : `pyrameter.models.Model`
+            The model at ``index``. Drawing ``index`` uniformly from
+            ``range(self.count_models())`` selects a model uniformly at random
+            without enumerating the others.
+
+        Raises
+        ------
+        IndexError
+            Raised if ``index`` is out of range.
+
+        Notes
+        -----
+        The models below every scope are counted once, in a single pass over
+        the tree, and the counts are reused while descending to the model.
+        """
+        tally = self.__tally(lambda val: 1, dedupe)
+        n = tally[0] + tally[1]
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError('Model index {} out of range.'.format(index))
+        return self.__model_at(index, path, dedupe, tally)
+
+    def __model_at(self, index, path, dedupe, tally):
+        """Create the model at ``index`` given the tally of this scope."""
+        nonempty, empty, tallies = tally
+        n = nonempty + empty
+
+        # The empty model of an optional scope, or the one kept when
+        # deduplicating, comes last
+        if (self.optional or (dedupe and self.exclusive and empty)) and \
+           index == n - 1:
+            return self.__create_model()
+
+        children = list(self.__iter_children(path))
+
+        if self.exclusive:
+            for (cpath, cval), ctally in zip(children, tallies):
+                # Deduplicated children only contribute their non-empty models
+                count = ctally[0] if dedupe else ctally[0] + ctally[1]
+                if index < count:
+                    if isinstance(cval, Scope):
+                        return cval.__model_at(index, cpath, dedupe, ctally)
+                    return self.__create_leaf_model(cpath, cval)
+                index -= count
+
+        # Decode the index in mixed radix, the first child varying slowest
+        digits = []
+        for ctally in reversed(tallies):
+            index, digit = divmod(index, ctally[0] + ctally[1])
+            digits.append(digit)
+        digits.reverse()
+
+        model = self.__create_model()
+        for (cpath, cval), ctally, digit in zip(children, tallies, digits):
+            if isinstance(cval, Scope):
+                model.merge(cval.__model_at(digit, cpath, dedupe, ctally))
+            else:
+                model.merge(self.__create_leaf_model(cpath, cval))
+        return model
+
+    def __iter_children(self, path=''):
+        """Iterate over (path, child) pairs."""
+        for child in self.children:
+            yield '/'.join([path, child]), self.children[child]
+
     def copy(self, with_children=True):
         return Scope(exclusive=self.exclusive,
                      optional=self.optional,
                      **self.children)
 
+    def to_json(self):
+        """Convert this scope into a canonical JSON-serializable format.
+
+        Returns
+        -------
+        scope : dict
+            The exclusive/optional flags, search strategy, and children of this
+            scope in insertion order. Domains are represented by their
+            `pyrameter.Domain.to_json` output without their path or iteration
+            state.
+        """
+        children = []
+        for name, cval in self.__iter_children():
+            if isinstance(cval, Scope):
+                children.append([name, cval.to_json()])
+            else:
+                children.append([name, self.__domain_json(cval)])
+        return {
+            'exclusive': self.exclusive,
+            'optional': self.optional,
+            'model': self.model.TYPE,
+            'children': children
+        }
+
+    def content_hash(self):
+        """Compute a hash of the content of this scope tree.
+
+        Returns
+        -------
+        digest : str
+            Hex SHA-256 digest of `pyrameter.Scope.to_json`. Scopes with equal
+            digests split into equivalent models in the same order.
+
+        Notes
+        -----
+        Values that are not JSON-serializable are hashed by their ``repr``, so
+        objects without a stable ``repr`` produce a different digest in every
+        process.
+        """
+        s = json.dumps(self.to_json(), sort_keys=True, default=repr,
+                       separators=(',', ':'))
+        return hashlib.sha256(s.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def __domain_json(val):
+        if not isinstance(val, Domain):
+            return {'value': val}
+        j = val.to_json()
+        j.pop('path', None)
+        j.pop('idx', None)
+        callback = getattr(val, 'callback', _identity)
+        if callback is not _identity:
+            j['callback'] = '.'.join([
+                str(getattr(callback, '__module__', '')),
+                getattr(callback, '__qualname__',
+                        getattr(callback, '__name__', repr(callback)))])
+        return j
+
     def __create_model(self):
         return self.model()
 
+    @staticmethod
+    def __as_domain(val):
+        # Convert non-Domain values into single-value domains
+        return val if isinstance(val, Domain) else DiscreteDomain([val])
+
+    def __create_leaf_model(self, path, val):
+        """Create a model containing only the domain at ``path``.
+
+        Each leaf is bound to its path once and the bound domain is shared by
+        every model it is merged into, so splitting does not copy domains per
+        model.
+        """
+        try:
+            orig, domain = self._leaves[path]
+        except KeyError:
+            orig = None
+        if orig is not val:
+            domain = self.__as_domain(val).bind(path)
+            self._leaves[path] = (val, domain)
+        m = self.__create_model()
+        m.add_domain(domain)
+        return m
+
     def merge(self, other):
         for k, v in other.children.items():
             self.add_child(k, v)
@@ -0,0 +1,162 @@
+"""Columnar storage of evaluated hyperparameters.
+
+Classes
+-------
+ResultStore
+    Growable array of the encoded hyperparameter values and losses of a
+    model's finished results.
+"""
+import numpy as np
+
+
+class ResultStore(object):
+    """Growable array of encoded hyperparameter values and losses.
+
+    Each row holds the numeric encoding of one result's values (see
+    `pyrameter.models.model.Value.to_numeric`) followed by its loss. Only
+    results with a finite loss are stored, packed into the leading rows of a
+    preallocated array so that they can be read without copying.
+
+    Parameters
+    ----------
+    width : int
+        The number of hyperparameter values per result.
+    capacity : int, optional
+        The number of rows to preallocate. The array doubles in size whenever
+        it fills up.
+    space : `pyrameter.compiled.CompiledSpace`, optional
+        The compiled search space of the results. If supplied, values are
+        encoded with its vectorized kernels instead of one at a time.
+
+    Attributes
+    ----------
+    width : int
+        The number of hyperparameter values per result.
+    space : `pyrameter.compiled.CompiledSpace` or None
+        The compiled search space used to encode values.
+
+    Notes
+    -----
+    Rows are stored in the order results finish. Removing a result, e.g.
+    because it was resubmitted without a loss, moves the last row into its
+    place.
+    """
+    def __init__(self, width, capacity=64, space=None):
+        self.width = width
+        self.space = space
+        self._data = np.zeros((max(capacity, 1), width + 1), dtype=np.float32)
+        self._n = 0
+        self._ids = []
+        self._rows = {}
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, result_id):
+        return result_id in self._rows
+
+    @property
+    def data(self):
+        """View of the stored rows, with the loss in the last column."""
+        return self._data[:self._n]
+
+    @property
+    def features(self):
+        """View of the encoded hyperparameter values of the stored rows."""
+        return self._data[:self._n, :-1]
+
+    @property
+    def losses(self):
+        """View of the losses of the stored rows."""
+        return self._data[:self._n, -1]
+
+    def update(self, result):
+        """Store, update, or remove the row of a result.
+
+        Parameters
+        ----------
+        result : `pyrameter.models.model.Result`
+            The result to store. Results without a finite loss are removed
+            from the store, as are results with a different number of values
+            than the store width.
+        """
+        row = self._rows.get(result.id)
+        loss = result.loss
+        if loss is None or not np.isfinite(loss) or \
+           len(result.values) != self.width:
+            if row is not None:
+                self._remove(row)
+            return
+
+        if row is None:
+            self._reserve(self._n + 1)
+            row = self._n
+            self._n += 1
+            self._ids.append(result.id)
+            self._rows[result.id] = row
+
+        if self.space is not None:
+            self._data[row, :-1] = self.space.encode(
+                [[value.value for value in result.values]])[0]
+        else:
+            for j, value in enumerate(result.values):
+                x = value.to_numeric()
+                self._data[row, j] = np.nan if x is None else x
+        self._data[row, -1] = loss
+
+    def extend(self, results):
+        """Store the rows of many results.
+
+        Parameters
+        ----------
+        results : list of `pyrameter.models.model.Result`
+            The results to store, as with
+            `pyrameter.store.ResultStore.update`.
+
+        Notes
+        -----
+        If the store has a compiled space, the values of new results with a
+        finite loss are encoded in a single vectorized pass.
+        """
+        fresh = []
+        for result in results:
+            loss = result.loss
+            if self.space is None or result.id in self._rows or \
+               loss is None or not np.isfinite(loss) or \
+               len(result.values) != self.width:
+                self.update(result)
+            else:
+                fresh.append(result)
+        if len(fresh) == 0:
+            return
+
+        self._reserve(self._n + len(fresh))
+        rows = slice(self._n, self._n + len(fresh))
+        self._data[rows, :-1] = self.space.encode(
+            [[value.value for value in result.values] for result in fresh])
+        self._data[rows, -1] = [result.loss for result in fresh]
+        for result in fresh:
+            self._rows[result.id] = self._n
+            self._ids.append(result.id)
+            self._n += 1
+
+    def _reserve(self, n):
+        """Grow the array until it holds at least ``n`` rows."""
+        size = self._data.shape[0]
+        if n <= size:
+            return
+        while size < n:
+            size *= 2
+        grown = np.zeros((size, self.width + 1), dtype=self._data.dtype)
+        grown[:self._n] = self._data[:self._n]
+        self._data = grown
+
+    def _remove(self, row):
+        last = self._n - 1
+        del self._rows[self._ids[row]]
+        if row != last:
+            self._data[row] = self._data[last]
+            self._ids[row] = self._ids[last]
+            self._rows[self._ids[row]] = row
+        self._ids.pop()
+        self._n -= 1
@@ -0,0 +1,145 @@
+"""Precompiled layouts of generated hyperparameter values.
+
+Classes
+-------
+OutputTemplate
+    Maps a row of hyperparameter values onto nested dictionaries, flat
+    dictionaries, or NumPy records in a single pass.
+"""
+import numbers
+
+import numpy as np
+from six import string_types
+
+
+OUTPUT_FORMATS = ('nested', 'flat', 'record')
+
+
+class OutputTemplate(object):
+    """Layout of a model's hyperparameter values.
+
+    Domain paths are split once into a trie of dictionary keys, so that each
+    set of values is laid out by a single walk of the trie.
+
+    Parameters
+    ----------
+    paths : list of str
+        Path to each domain in the search hierarchy, in model order.
+
+    Attributes
+    ----------
+    keys : list of str
+        Flat key of each domain: the non-empty components of its path joined
+        by '/'.
+
+    Notes
+    -----
+    Empty components between the separators of a path are skipped, so
+    '/a/b' is nested as ``{'a': {'b': value}}`` and flattened to 'a/b'.
+
+    The record dtype is built from the first set of values and reused for
+    later sets with the same value types. It is rebuilt when the types
+    change, or when a string is longer than its field.
+    """
+    def __init__(self, paths):
+        self.keys = []
+        self._trie = []
+        for i, path in enumerate(paths):
+            parts = path.split('/')
+            parts = [p for p in parts[:-1] if p != ''] + parts[-1:]
+            self.keys.append('/'.join(parts))
+
+            node = self._trie
+            for p in parts[:-1]:
+                child = None
+                for key, val in node:
+                    if key == p and isinstance(val, list):
+                        child = val
+                if child is None:
+                    child = []
+                    node.append((p, child))
+                node = child
+            node.append((parts[-1], i))
+
+        self._record_types = None
+        self._record_dtype = None
+        self._record_strings = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def fill(self, values, output='nested'):
+        """Lay out a set of hyperparameter values.
+
+        Parameters
+        ----------
+        values : list
+            One value per domain, in model order.
+        output : {'nested','flat','record'}
+            The layout to create. Default 'nested'.
+
+        Returns
+        -------
+        params : dict or `numpy.record`
+            The values laid out as requested.
+
+        Raises
+        ------
+        ValueError
+            Raised if ``output`` is not a supported layout.
+        """
+        if output == 'nested':
+            return self.nested(values)
+        elif output == 'flat':
+            return self.flat(values)
+        elif output == 'record':
+            return self.record(values)
+        msg = 'Invalid output format {}. Expected one of {}.'
+        raise ValueError(msg.format(output, OUTPUT_FORMATS))
+
+    def nested(self, values):
+        """Lay out values as nested dictionaries following the domain paths."""
+        return self._fill(self._trie, values)
+
+    def _fill(self, node, values):
+        out = {}
+        for key, val in node:
+            out[key] = self._fill(val, values) if isinstance(val, list) \
+                else values[val]
+        return out
+
+    def flat(self, values):
+        """Lay out values as a dictionary indexed by flat key."""
+        return dict(zip(self.keys, values))
+
+    def record(self, values):
+        """Lay out values as a NumPy record with one field per flat key.
+
+        Numeric and string values are stored with their NumPy types, all
+        other values as objects.
+        """
+        types = tuple(type(val) for val in values)
+        if types != self._record_types or \
+           any(len(values[i]) > width for i, width in self._record_strings):
+            self._build_record_dtype(values, types)
+        try:
+            arr = np.array([tuple(values)], dtype=self._record_dtype)
+        except (OverflowError, ValueError, TypeError):
+            # E.g. an integer too large for the type of the first record
+            self._build_record_dtype(values, types)
+            arr = np.array([tuple(values)], dtype=self._record_dtype)
+        return arr.view(np.recarray)[0]
+
+    def _build_record_dtype(self, values, types):
+        self._record_dtype = np.dtype([(key, self._dtype(val))
+                                       for key, val in zip(self.keys, values)])
+        self._record_types = types
+        self._record_strings = [(i, len(values[i]))
+                                for i in range(len(values))
+                                if self._record_dtype[i].kind in 'SU']
+
+    @staticmethod
+    def _dtype(value):
+        if isinstance(value, (numbers.Number, np.generic, string_types)):
+            return np.asarray(value).dtype
+        return object
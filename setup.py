@@ -18,20 +18,21 @@ setup(
         'License :: MIT',
         'Topic :: Machine Learning :: Hyperparameter Optimization',
         'Topic :: Distributed Systems :: Task Allocation',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
         'Operating System :: POSIX',
         'Operating System :: Unix',
         'Operating System :: MacOS',
     ],
     keywords='machine_learning hyperparameters',
+    python_requires='>=3.5',
     install_requires=[
-        'scipy>=0.18.1',
-        'numpy>=1.12.0',
+        'scipy>=1.4.0',
+        'numpy>=1.17.0',
         'scikit-learn>=0.18.1',
         'sqlalchemy>=1.1.11',
         'pymongo',
@@ -56,6 +56,33 @@ class TestModel(object):
     def test_to_json(self):
         pass
 
+    def test_signature(self):
+        d1 = DiscreteDomain([1, 2, 3], path='/a')
+        d2 = ExhaustiveDomain([1, 2], path='/b')
+        m1 = self.__model_class__(domains=[d1, d2])
+        m2 = self.__model_class__(domains=[d2.bind('/b'), d1])
+        assert m1.signature == m2.signature
+        assert m1 == m2
+        assert self.__model_class__() == self.__model_class__()
+
+        # Iteration state is ignored
+        d2.generate()
+        m1._signature = None
+        assert m1.signature == m2.signature
+
+        # Adding or merging domains changes the signature
+        m2.add_domain(DiscreteDomain([1], path='/c'))
+        assert m1 != m2
+        m1.merge(self.__model_class__(
+            domains=[DiscreteDomain([1], path='/c')]))
+        assert m1 == m2
+
+        assert self.__model_class__(domains=[d1]) != \
+            self.__model_class__(domains=[d1.bind('/c')])
+        assert self.__model_class__(domains=[d1]) != \
+            self.__model_class__(domains=[DiscreteDomain([1, 2], path='/a')])
+        assert m1 != 'model'
+
 
 class TestResult(object):
     def test_init(self):
@@ -159,3 +186,20 @@ class TestValue(object):
             assert v.to_json() == {'value': val,
                                    'domain': d2.id,
                                    'result': r2.id}
+
+
+class TestCompactResults(object):
+    def test_slots(self):
+        m = Model()
+        d = Domain()
+        r = Result(m)
+        v = Value(1, d, r)
+        r.add_value(v)
+
+        # No per-instance __dict__, but results can still be weakly referenced
+        for obj in [r, v]:
+            assert not hasattr(obj, '__dict__')
+            with pytest.raises(AttributeError):
+                obj.extra = 1
+        assert v.result() is r
+        assert r.model() is m
@@ -1,13 +1,16 @@
 import pytest
 
 from pyrameter.models import get_model_class, RandomSearchModel, TPEModel, \
-                             GPBayesModel
+                             GPBayesModel, QuasiRandomSearchModel, \
+                             HaltonSearchModel
 from pyrameter.models.model_factory import InvalidModelError
 
 
 def test_get_model_class():
     model_classes = {
         'random': RandomSearchModel,
+        'sobol': QuasiRandomSearchModel,
+        'halton': HaltonSearchModel,
         'tpe': TPEModel,
         'gp': GPBayesModel,
     }
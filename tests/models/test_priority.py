@@ -0,0 +1,308 @@
+import pytest
+
+from pyrameter import Scope, build
+from pyrameter.domain import ContinuousDomain
+from pyrameter.modelgroup import ModelGroup
+from pyrameter.models import RandomSearchModel
+from pyrameter.models.model import Result, Value
+from pyrameter.models.priority import GPLengthScalePriority, \
+                                      DEFAULT_ESTIMATOR
+
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+import scipy.stats
+from scipy.stats import uniform
+
+
+class RecordingEstimator(object):
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, features, losses, random_state):
+        self.calls.append((features.shape, losses.shape))
+        return float(len(self.calls))
+
+
+def add_results(m, n, loss=None):
+    d = m.domains[0]
+    for i in range(n):
+        x = float(i) / n
+        m.add_result(Result(m, loss=np.sin(6 * x) if loss is None else loss,
+                            values=[Value(x, d)]))
+
+
+class TestGPLengthScalePriority(object):
+    def test_call(self):
+        rs = np.random.default_rng(0)
+        x = rs.random((50, 2))
+        y = np.sin(6 * x[:, 0])
+
+        est = GPLengthScalePriority(n_bootstraps=4, subsample=20)
+        p = est(x, y, np.random.default_rng(1))
+        assert isinstance(p, float)
+        assert p >= 0
+        assert p == est(x, y, np.random.default_rng(1))
+
+        # Works with legacy random states and tiny inputs
+        assert est(x[:2], y[:2], np.random.RandomState(1)) >= 0
+
+    def test_unfitted(self):
+        rs = np.random.default_rng(0)
+        x = rs.random((50, 2))
+        y = np.sin(6 * x[:, 0])
+
+        # Initial length scales are read as the log-scale kernel parameter
+        est = GPLengthScalePriority(n_bootstraps=5, fitted=False)
+        rs = np.random.default_rng(2)
+        scales = []
+        for _ in range(5):
+            rs.choice(50, size=40, replace=False)
+            scales.append(1.0 / np.log(rs.uniform(0.1, 2.0)))
+        p = est(x, y, np.random.default_rng(2))
+        assert np.isclose(p, max(scales) - min(scales))
+
+    def test_ranking(self):
+        # The default estimator ranks models like the 50-fit estimator of
+        # Kinnison et al. once there are more results than it subsamples. The
+        # cap is scaled down from the default to keep the reference fits fast.
+        rs = np.random.default_rng(0)
+        data = []
+        for k in range(8):
+            x = rs.random((160, 2))
+            y = np.sin(0.5 * (k + 1) * x[:, 0]) + np.cos(0.25 * k * x[:, 1])
+            data.append((x, y))
+
+        default = GPLengthScalePriority(subsample=64)
+        full = GPLengthScalePriority(n_bootstraps=50, subsample=None)
+        a = [default(x, y, np.random.default_rng(0)) for x, y in data]
+        b = [full(x, y, np.random.default_rng(0)) for x, y in data]
+        assert scipy.stats.spearmanr(a, b)[0] >= 0.8
+
+
+class TestModelPriority(object):
+    def test_priority(self):
+        m = RandomSearchModel(domains=[ContinuousDomain(uniform, path='/a')],
+                              priority_update_freq=5)
+        assert m.priority_estimator is DEFAULT_ESTIMATOR
+        est = RecordingEstimator()
+        m.priority_estimator = est
+
+        add_results(m, 4)
+        assert m.recompute_priority is False
+        assert m.priority == 1.0
+
+        add_results(m, 1)
+        assert m.recompute_priority is True
+        assert m.priority == 1.0
+        assert est.calls == [((5, 1), (5,))]
+
+        # Recomputed only once per update
+        assert m.recompute_priority is False
+        assert m.priority == 1.0
+        assert len(est.calls) == 1
+        add_results(m, 5)
+        assert m.priority == 2.0
+
+        # Updates can be disabled
+        m = RandomSearchModel(domains=[ContinuousDomain(uniform, path='/a')],
+                              priority_update_freq=0)
+        m.priority_estimator = est
+        add_results(m, 10)
+        assert m.priority == 1.0
+        assert len(est.calls) == 2
+
+    def test_group_estimator(self, tmpdir):
+        est = RecordingEstimator()
+        s = Scope(a=ContinuousDomain(uniform), b=ContinuousDomain(uniform),
+                  exclusive=True)
+        g = ModelGroup(models=s.split(), priority_estimator=est)
+        assert all(m.priority_estimator is est for m in g.models.values())
+        m = g.models[g.model_ids[0]]
+        assert m.copy().priority_estimator is est
+
+        g = build(s, db=str(tmpdir), priority_estimator=est)
+        assert all(m.priority_estimator is est for m in g.models.values())
+
+
+class SlowEstimator(object):
+    def __init__(self):
+        self.threads = []
+
+    def __call__(self, features, losses, random_state):
+        self.threads.append(threading.current_thread())
+        time.sleep(0.05)
+        return float(features.shape[0])
+
+
+class TestPriorityRefresh(object):
+    def make_group(self, est):
+        s = Scope(a=ContinuousDomain(uniform), b=ContinuousDomain(uniform),
+                  exclusive=True)
+        models = s.split()
+        for m in models:
+            m.priority_update_freq = 5
+        return ModelGroup(models=models, priority_estimator=est), models
+
+    def test_refresh_priorities(self):
+        est = SlowEstimator()
+        g, models = self.make_group(est)
+        add_results(models[0], 5)
+        assert g.refresh_priorities() == 1
+        assert models[0].priority == 5.0
+        assert g.refresh_priorities() == 0
+
+    def test_background_refresh(self):
+        est = SlowEstimator()
+        g, models = self.make_group(est)
+        g.start_priority_refresh(interval=0.01)
+        try:
+            assert all(m.defer_priority for m in models)
+            add_results(models[1], 10)
+
+            # Sorting reads the published priorities without blocking
+            g.sort_models()
+            assert models[1].priority in [1.0, 10.0]
+
+            deadline = time.time() + 5
+            while models[1].priority != 10.0 and time.time() < deadline:
+                time.sleep(0.01)
+            assert models[1].priority == 10.0
+            assert threading.current_thread() not in est.threads
+
+            # Models added later are refreshed in the background too
+            m = RandomSearchModel(
+                domains=[ContinuousDomain(uniform, path='/c')],
+                priority_update_freq=5)
+            g.add_model(m)
+            assert m.defer_priority
+        finally:
+            g.stop_priority_refresh()
+
+        assert g._refresher is None
+        assert not any(m.defer_priority for m in g.models.values())
+
+    def test_concurrent_results(self):
+        # Stores built and read by the refresher stay consistent with results
+        # added and registered at the same time
+        g, models = self.make_group(RowCountEstimator())
+        m = models[0]
+        m.priority_update_freq = 1
+        g.start_priority_refresh(interval=0.0001)
+        try:
+            d = m.domains[0]
+            for i in range(300):
+                if i % 50 == 0:
+                    # Drops the store, which is then rebuilt lazily
+                    m.merge(RandomSearchModel())
+                r = Result(m, values=[Value(float(i), d)])
+                m.add_result(r)
+                m.register_result(r.id, float(i))
+        finally:
+            g.stop_priority_refresh()
+
+        assert len(m.store) == 300
+        assert np.all(np.sort(m.store.losses) == np.arange(300))
+        assert np.all(m.store.features[:, 0] == m.store.losses)
+        assert m.priority == 300.0
+
+        # Locks are recreated rather than pickled
+        m = models[1]
+        m2 = pickle.loads(pickle.dumps(m))
+        assert m2._lock is not m._lock
+        assert m2.copy()._lock is not m2._lock
+
+
+class RowCountEstimator(object):
+    def __call__(self, features, losses, random_state):
+        return float(features.shape[0] + random_state.integers(1))
+
+
+class CrashingEstimator(object):
+    def __call__(self, features, losses, random_state):
+        os._exit(1)
+
+
+class TestParallelPriority(object):
+    def make_group(self, est, n_jobs):
+        s = Scope(a=ContinuousDomain(uniform), b=ContinuousDomain(uniform),
+                  c=ContinuousDomain(uniform), exclusive=True)
+        models = s.split()
+        for i, m in enumerate(models):
+            m.priority_update_freq = 5
+            add_results(m, 5 * (i + 1))
+        return ModelGroup(models=models, priority_estimator=est,
+                          n_jobs=n_jobs), models
+
+    def test_refresh_parallel(self):
+        g, models = self.make_group(RowCountEstimator(), 2)
+        assert g.refresh_priorities() == 3
+        assert [m.priority for m in models] == [5.0, 10.0, 15.0]
+        assert not any(m.recompute_priority for m in models)
+        assert g.refresh_priorities() == 0
+
+        # Sorting fans the stale models out before ranking
+        add_results(models[0], 20)
+        g.sort_models()
+        assert models[0].priority == 25.0
+        g.close()
+
+    def test_executor(self):
+        g, models = self.make_group(RowCountEstimator(), 2)
+        assert g._executor is None
+        g.refresh_priorities()
+        pool = g._executor
+        assert pool is not None
+
+        # Later passes reuse the same worker processes
+        for m in models:
+            add_results(m, 5)
+        assert g.refresh_priorities() == 3
+        assert g._executor is pool
+
+        # Closing shuts the pool down, the next pass starts a new one
+        g.close()
+        assert g._executor is None
+        for m in models:
+            add_results(m, 5)
+        with g:
+            assert g.refresh_priorities() == 3
+            assert g._executor is not None and g._executor is not pool
+        assert g._executor is None
+
+        # Changing the number of processes replaces the pool
+        for m in models:
+            add_results(m, 5)
+        g.refresh_priorities()
+        pool = g._executor
+        for m in models:
+            add_results(m, 5)
+        g.refresh_priorities(n_jobs=3)
+        assert g._executor is not pool and g._executor_size == 3
+        g.close()
+
+    def test_executor_broken(self):
+        g, models = self.make_group(CrashingEstimator(), 2)
+        with pytest.warns(UserWarning):
+            assert g.refresh_priorities() == 0
+        assert g._executor is None
+
+        g.priority_estimator = RowCountEstimator()
+        for m in models:
+            m.priority_estimator = g.priority_estimator
+            add_results(m, 5)
+        with g:
+            assert g.refresh_priorities() == 3
+
+    def test_refresh_parallel_fallback(self):
+        # Lambdas cannot be sent to worker processes
+        g, models = self.make_group(lambda x, y, rs: float(x.shape[0]), -1)
+        assert g.refresh_priorities() == 3
+        assert [m.priority for m in models] == [5.0, 10.0, 15.0]
+
+    def test_build_n_jobs(self, tmpdir):
+        g = build({'a': ContinuousDomain(uniform)}, db=str(tmpdir), n_jobs=2)
+        assert g.n_jobs == 2
@@ -0,0 +1,83 @@
+import pytest
+from test_model import TestModel
+
+from pyrameter.models import QuasiRandomSearchModel, HaltonSearchModel
+from pyrameter.models.model import Model
+from pyrameter import ContinuousDomain, DiscreteDomain, ExhaustiveDomain
+
+import numpy as np
+from scipy.stats import norm, uniform
+
+
+class TestQuasiRandomSearchModel(TestModel):
+    __model_class__ = QuasiRandomSearchModel
+
+    def test_init(self):
+        m = self.__model_class__()
+        assert m.scramble is True
+        assert m.qmc_seed is None
+
+        m = self.__model_class__(scramble=False, qmc_seed=5)
+        assert m.scramble is False
+        assert m.qmc_seed == 5
+
+        super(TestQuasiRandomSearchModel, self).test_init()
+
+    def test_generate(self):
+        d1 = ContinuousDomain(uniform, path='a', loc=0.0, scale=1.0)
+        d2 = DiscreteDomain(list(range(4)), path='b')
+        d3 = ContinuousDomain(norm, path='c')
+
+        # Halton strata are only even to within one point for most seeds
+        m = self.__model_class__(domains=[d1, d2, d3], qmc_seed=0)
+        params = m.generate(size=64)
+        assert len(params) == 64
+        a = np.array([p[0] for p in params])
+        b = np.array([p[1] for p in params])
+        c = np.array([p[2] for p in params])
+        assert np.all(a >= 0) and np.all(a < 1)
+        assert np.all(np.isfinite(c))
+
+        # Low-discrepancy points fill each stratum evenly.
+        assert np.all(np.abs(np.histogram(a, bins=8, range=(0, 1))[0] - 8) <= 1)
+        assert np.all(np.abs(np.bincount(b, minlength=4) - 16) <= 1)
+
+        for _ in range(10):
+            p = m()[-1]
+            assert 'a' in p and 'b' in p and 'c' in p
+
+        assert self.__model_class__().generate() == []
+        assert self.__model_class__().generate(size=2) == [[], []]
+
+    def test_resume(self):
+        d1 = ContinuousDomain(uniform, path='a')
+        d2 = ExhaustiveDomain(list(range(10)), path='b')
+
+        m = self.__model_class__(domains=[d1, d2], qmc_seed=1)
+        for _ in range(8):
+            m()
+        spec = m.to_json()
+        expected = m.generate(size=4)
+
+        # A restored model continues from the number of points drawn.
+        restored = Model.from_json(spec)
+        assert isinstance(restored, self.__model_class__)
+        assert restored.qmc_seed == 1
+        assert len(restored.results) == 8
+        assert restored.generate(size=4) == expected
+
+        # Points are not repeated when results are not recorded
+        restored = Model.from_json(m.to_json())
+        assert restored.draws == 12
+        assert restored.generate(size=4) != expected
+
+        # Specs without a draw count resume from the number of results
+        del spec['model_parameters']['draws']
+        assert Model.from_json(spec).generate(size=4) == expected
+        m = self.__model_class__(domains=[d1], qmc_seed=1)
+        assert m.generate(size=4) != m.generate(size=4)
+        assert m.draws == 8
+
+
+class TestHaltonSearchModel(TestQuasiRandomSearchModel):
+    __model_class__ = HaltonSearchModel
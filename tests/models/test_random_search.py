@@ -2,7 +2,10 @@ import pytest
 from test_model import TestModel
 
 from pyrameter.models import RandomSearchModel
-from pyrameter import ContinuousDomain, DiscreteDomain
+from pyrameter.models.model import Model
+from pyrameter import ContinuousDomain, DiscreteDomain, ExhaustiveDomain
+
+import itertools
 
 from scipy.stats import uniform
 
@@ -61,3 +64,167 @@ class TestRandomSearchModel(TestModel):
             assert p['B']['a'] >= 0 and p['B']['a'] < 1
             assert 'b' in p['A']
             assert p['A']['b'] >= 0 and p['A']['b'] < 1000
+
+    def test_generate_batch(self):
+        d1 = ContinuousDomain(uniform, path='a', loc=0.0, scale=1.0)
+        d2 = DiscreteDomain(list(range(1000)), path='b')
+
+        m = self.__model_class__(domains=[d1, d2])
+        params = m.generate(size=100)
+        assert len(params) == 100
+        for p in params:
+            assert len(p) == 2
+            assert p[0] >= 0 and p[0] < 1
+            assert p[1] in range(1000)
+
+        m = self.__model_class__()
+        assert m.generate(size=3) == [[], [], []]
+
+    def test_generate_grid(self):
+        d1 = ExhaustiveDomain([1, 2, 3], path='a')
+        d2 = ContinuousDomain(uniform, path='b')
+        d3 = ExhaustiveDomain(['x', 'y'], path='c')
+        ref = list(itertools.product([1, 2, 3], ['x', 'y']))
+
+        # Single generation walks the full Cartesian product
+        m = self.__model_class__(domains=[d1, d2, d3])
+        points = [(p['a'], p['c']) for p in [m()[-1] for _ in range(12)]]
+        assert points == ref + ref
+
+        # Batch generation resumes from the number of results
+        params = m.generate(size=6)
+        assert [(p[0], p[2]) for p in params] == ref
+        for p in params:
+            assert p[1] >= 0 and p[1] < 1
+
+        # Shards cover disjoint parts of the grid
+        seen = []
+        for shard in range(4):
+            m = self.__model_class__(domains=[d1, d2, d3])
+            m.set_shard(shard, 4)
+            for _ in range(len(m.grid[1])):
+                p = m()[-1]
+                seen.append((p['a'], p['c']))
+        assert sorted(seen) == sorted(ref)
+
+        with pytest.raises(ValueError):
+            m.set_shard(4, 4)
+
+        # Surplus shards are empty, but only for exhaustive domains
+        m = self.__model_class__(domains=[d1, d2, d3])
+        m.set_shard(9, 10)
+        assert len(m.grid[1]) == 0
+        with pytest.raises(IndexError):
+            m.generate()
+        m = self.__model_class__(domains=[d2])
+        m.set_shard(9, 10)
+        assert len(m.generate()) == 1
+        assert len(m.generate(size=3)) == 3
+
+        # The shard is saved with the model
+        m = self.__model_class__(domains=[d1, d2, d3])
+        m.set_shard(2, 4)
+        m2 = Model.from_json(m.to_json())
+        assert (m2.shard, m2.num_shards) == (2, 4)
+        assert m2.grid[1][0] == m.grid[1][0]
+        spec = m.to_json()
+        del spec['shard'], spec['num_shards']
+        assert Model.from_json(spec).num_shards == 1
+
+    def test_generate_compiled(self):
+        m = RandomSearchModel(domains=[
+            ContinuousDomain(uniform, path='a'),
+            DiscreteDomain([1, 2, 3], path='b'),
+            ExhaustiveDomain(['x', 'y'], path='c')])
+        m.seed(5)
+        assert m.compile() is m.compiled
+
+        params = m.generate(size=4)
+        assert len(params) == 4
+        assert [p[2] for p in params] == ['x', 'y', 'x', 'y']
+        for p in params:
+            assert 0 <= p[0] < 1
+            assert p[1] in [1, 2, 3]
+
+        p = m.generate()
+        assert len(p) == 3
+
+        # Adding a domain invalidates the compiled space
+        m.add_domain(DiscreteDomain([4], path='d'))
+        assert len(m.compiled) == 4
+        assert m.generate()[3] == 4
+
+    def test_call(self):
+        m = self.__model_class__(domains=[
+            ContinuousDomain(uniform, path='/a/b'),
+            DiscreteDomain(['x'], path='/a/c'),
+            DiscreteDomain([1], path='/d')])
+
+        rid, params = m()
+        assert m.results[-1].id == rid
+        assert set(params) == {'a', 'd'}
+        assert set(params['a']) == {'b', 'c'}
+        assert params['a']['c'] == 'x' and params['d'] == 1
+
+        rid, params = m(output='flat')
+        assert set(params) == {'a/b', 'a/c', 'd'}
+
+        rid, params = m(output='record')
+        assert params['a/c'] == 'x' and params['d'] == 1
+        assert len(m.results) == 3
+
+        # Resubmitted results are laid out like generated ones
+        rid, params = m()
+        submissions, resubmit = m.register_result(rid, None)
+        assert submissions == 1
+        assert resubmit == params
+
+        # The template follows added domains
+        m.add_domain(DiscreteDomain([2], path='/e/f'))
+        rid, params = m()
+        assert params['e'] == {'f': 2}
+
+    def test_register_result(self):
+        m = self.__model_class__(domains=[DiscreteDomain([1], path='/a')])
+        ids = [m()[0] for _ in range(20)]
+        for i, rid in enumerate(ids):
+            submissions, params = m.register_result(rid, float(i))
+            assert submissions == 1
+            assert params == {}
+            assert m._result_index[rid].loss == float(i)
+
+        with pytest.raises(KeyError):
+            m.register_result('missing', 1.0)
+
+        # Copies share results with their parent, which is updated once
+        c = m.copy(parent_inherits_results=True)
+        rid, _ = c()
+        assert m._result_index[rid] is c._result_index[rid]
+        c.register_result(rid, 1.0)
+        assert m._result_index[rid].submissions == 1
+        assert m._result_index[rid].loss == 1.0
+
+    def test_register_results(self):
+        m = self.__model_class__(domains=[DiscreteDomain([1], path='/a')])
+        c = m.copy(parent_inherits_results=True)
+        ids = [rid for rid, _ in c.generate_batch(10)]
+        registered = c.register_results(
+            [(rid, float(i), None) for i, rid in enumerate(ids)])
+        assert registered == [(1, {})] * 10
+        assert len(m.store) == 10 and len(c.store) == 10
+        assert m.recompute_priority is True
+        assert m._result_index[ids[3]].loss == 3.0
+
+        with pytest.raises(KeyError):
+            c.register_results([(ids[0], 5.0, None), ('missing', 1.0, None)])
+        assert m._result_index[ids[0]].loss == 0.0
+
+    def test_from_json_ids(self):
+        m = self.__model_class__(domains=[DiscreteDomain([1, 2], path='/a')])
+        rid, _ = m()
+        m.register_result(rid, 1.0)
+
+        restored = Model.from_json(m.to_json())
+        assert restored.id == m.id
+        assert [r.id for r in restored.results] == [rid]
+        assert restored.register_result(rid, 2.0) == (1, {})
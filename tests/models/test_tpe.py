@@ -60,3 +60,39 @@ class TestTPEModel(TestModel):
             # assert p['a'] >= -100 and p['a'] < 100
             assert 'b' in p
             assert p['b'] >= -100 and p['b'] <= 100
+
+    def test_generate_batch(self):
+        d1 = ContinuousDomain(uniform, path='a', loc=-100.0, scale=100.0)
+        m = self.__model_class__(domains=[d1])
+        for _ in range(3):
+            batch = m.generate_batch(5)
+            assert len(batch) == 5
+            for result_id, p in batch:
+                assert p['a'] >= -100.0 and p['a'] < 100
+                m.register_result(result_id, p['a'] ** 2)
+        assert len(m.results) == 15
+
+        # Random search is injected at the same positions as single draws
+        assert [m._warming_up(i) for i in range(15, 21)] == \
+            [False, False, False, False, False, True]
+        assert len(m.generate(size=6)) == 6
+
+    def test_seed(self):
+        # Models sharing a domain reproduce their own values from a seed
+        d1 = ContinuousDomain(uniform, path='a', loc=-100.0, scale=100.0)
+        models = [self.__model_class__(domains=[d1]) for _ in range(2)]
+        for m in models:
+            m.seed(3)
+        suggestions = [[], []]
+        for _ in range(15):
+            for m, seen in zip(models, suggestions):
+                p = m()[-1]
+                seen.append(p['a'])
+                m.add_result(Result(m, loss=p['a'] ** 2,
+                                    values=Value(p['a'], d1)))
+        assert suggestions[0] == suggestions[1]
+        assert d1._random_state is None
+
+        # Batches share the fitted mixtures without repeating samples
+        batch = models[0].generate(size=4)
+        assert len(set(p[0] for p in batch)) == 4
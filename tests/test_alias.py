@@ -0,0 +1,37 @@
+import pytest
+
+import numpy as np
+import scipy.stats
+
+from pyrameter.alias import AliasTable
+
+
+class TestAliasTable(object):
+    def test_init(self):
+        t = AliasTable([1, 2, 3, 4])
+        assert len(t) == 4
+        assert np.all(t.prob <= 1.0)
+
+        with pytest.raises(ValueError):
+            AliasTable([])
+        with pytest.raises(ValueError):
+            AliasTable([0, 0])
+
+    def test_sample(self):
+        p = scipy.stats.planck.pmf(np.arange(50), 0.5)
+        p = p / p.sum()
+        t = AliasTable(p)
+
+        rs = np.random.default_rng(0)
+        idx = t.sample(size=200000, random_state=rs)
+        assert idx.min() >= 0 and idx.max() < 50
+        freq = np.bincount(idx, minlength=50) / 200000.0
+        assert np.allclose(freq, p, atol=0.005)
+
+        # Single draws from any random source
+        assert isinstance(t.sample(), int)
+        assert 0 <= t.sample(random_state=np.random.RandomState(1)) < 50
+
+        # Zero weights are never drawn
+        t = AliasTable([0, 1, 0, 3])
+        assert set(t.sample(size=1000, random_state=rs)) == {1, 3}
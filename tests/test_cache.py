@@ -0,0 +1,97 @@
+import pytest
+
+from pyrameter import build, Scope
+from pyrameter import cache as cache_module
+from pyrameter.cache import SpaceCache, schema_version
+from pyrameter.domain import ContinuousDomain, DiscreteDomain
+
+import os
+
+from scipy.stats import uniform
+
+
+def _explode():
+    raise RuntimeError('broken entry')
+
+
+class Exploding(object):
+    def __reduce__(self):
+        return (_explode, ())
+
+
+def spec():
+    return Scope(a=Scope(b=ContinuousDomain(uniform),
+                         c=DiscreteDomain([1, 2, 3]), exclusive=True),
+                 d=Scope(e=DiscreteDomain(['x', 'y']), optional=True))
+
+
+class TestSpaceCache(object):
+    def test_save_load(self, tmpdir):
+        path = os.path.join(str(tmpdir), 'cache')
+        cache = SpaceCache(path)
+        assert os.path.isdir(path)
+
+        s = spec()
+        key = s.content_hash()
+        assert key not in cache
+        assert cache.load(key) is None
+
+        models = s.split()
+        assert cache.save(key, models)
+        assert key in cache
+
+        loaded = cache.load(key)
+        assert [m.id for m in loaded] == [m.id for m in models]
+        for m1, m2 in zip(loaded, models):
+            assert [d.path for d in m1.domains] == \
+                [d.path for d in m2.domains]
+            assert len(m1.generate()) == len(m1.domains)
+
+        # Unusable entries are treated as missing
+        with open(cache.filename('bad'), 'w') as f:
+            f.write('not a pickle')
+        assert cache.load('bad') is None
+
+    def test_save_unpicklable(self, tmpdir):
+        cache = SpaceCache(str(tmpdir))
+        s = Scope(a=ContinuousDomain(uniform, callback=lambda x: x))
+        assert not cache.save('lambda', s.split())
+        assert 'lambda' not in cache
+        assert os.listdir(str(tmpdir)) == []
+
+    def test_build(self, tmpdir):
+        path = str(tmpdir)
+        g1 = build(spec(), db=path, cache_dir=path)
+        assert len([f for f in os.listdir(path) if f.endswith('.pkl')]) == 1
+        g2 = build(spec(), db=path, cache_dir=path)
+        assert g1.model_ids == g2.model_ids
+        assert g2.generate()[0] in g2.model_ids
+
+        g3 = build(spec(), db=path, cache_dir=path, compile=True)
+        assert all(m.compiled is not None for m in g3.models.values())
+        g4 = build(spec(), db=path, cache_dir=path, compile=True)
+        assert all(m._compiled is not None for m in g4.models.values())
+        assert len([f for f in os.listdir(path) if f.endswith('.pkl')]) == 2
+
+        g5 = build(spec(), db=path, cache_dir=path, lazy=True)
+        assert g5.model_ids == g1.model_ids
+
+    def test_schema(self, tmpdir, monkeypatch):
+        cache = SpaceCache(str(tmpdir))
+        assert schema_version() == schema_version()
+        assert schema_version() in cache.filename('key')
+
+        models = spec().split()
+        assert cache.save('key', models)
+        assert cache.load('key') is not None
+
+        # Entries written with another object layout are never read
+        monkeypatch.setattr(cache_module, '_SCHEMA', 'other')
+        assert 'key' not in cache
+        assert cache.load('key') is None
+
+    def test_load_errors(self, tmpdir):
+        cache = SpaceCache(str(tmpdir))
+        assert cache.save('boom', [Exploding()])
+        with pytest.raises(RuntimeError):
+            cache.load('boom')
@@ -0,0 +1,169 @@
+import pytest
+
+from pyrameter.compiled import CompiledSpace, CONTINUOUS, DISCRETE, \
+                               EXHAUSTIVE
+from pyrameter.domain import Domain, ContinuousDomain, DiscreteDomain, \
+                             ExhaustiveDomain
+
+import pickle
+
+import numpy as np
+import scipy.stats
+
+
+class Triangle(scipy.stats.rv_continuous):
+    def _pdf(self, x):
+        return 2.0 * x
+
+
+triangle = Triangle(a=0.0, b=1.0, name='triangle')
+
+
+def make_domains():
+    return [
+        ContinuousDomain(scipy.stats.uniform, path='a', loc=0, scale=1),
+        DiscreteDomain(['x', 'y', 'z'], path='b/c'),
+        ExhaustiveDomain([1, 2], path='d'),
+        ContinuousDomain(scipy.stats.uniform, path='e', loc=0, scale=1),
+        ContinuousDomain(scipy.stats.norm, path='f'),
+    ]
+
+
+class TestCompiledSpace(object):
+    def test_init(self):
+        domains = make_domains()
+        c = CompiledSpace(domains)
+        assert len(c) == 5
+        assert list(c.kinds) == [CONTINUOUS, DISCRETE, EXHAUSTIVE,
+                                 CONTINUOUS, CONTINUOUS]
+        assert list(c.sizes) == [0, 3, 2, 0, 0]
+        assert list(c.offsets) == [0, 0, 3, 0, 0]
+        assert list(c.categories) == ['x', 'y', 'z', 1, 2]
+        assert c.paths == ['a', 'b/c', 'd', 'e', 'f']
+        assert c.layout == [('a',), ('b', 'c'), ('d',), ('e',), ('f',)]
+        assert np.all(c.bounds[1] == [0, 2])
+        assert np.all(c.bounds[0] == [0, 1])
+
+        # Identical distributions are grouped together
+        assert len(c._groups) == 2
+        assert list(c._groups[0][1]) == [0, 3]
+
+        with pytest.raises(TypeError):
+            CompiledSpace([Domain()])
+
+    def test_ppf(self):
+        domains = make_domains()
+        c = CompiledSpace(domains)
+        u = np.random.random((100, 5))
+        cols = c.ppf(u)
+        for j, domain in enumerate(domains):
+            assert len(cols[j]) == 100
+            assert list(cols[j]) == list(domain.ppf(u[:, j]))
+
+        cols = c.ppf(u, columns=[1, 4])
+        assert cols[0] is None and cols[2] is None and cols[3] is None
+        assert list(cols[1]) == list(domains[1].ppf(u[:, 1]))
+
+    def test_sample(self):
+        c = CompiledSpace(make_domains())
+        a = c.sample(50, np.random.default_rng(7))
+        b = c.sample(50, np.random.default_rng(7))
+        for x, y in zip(a, b):
+            assert list(x) == list(y)
+        assert np.all((a[0] >= 0) & (a[0] < 1))
+        assert set(a[1]).issubset({'x', 'y', 'z'})
+        assert set(a[2]).issubset({1, 2})
+
+    def test_callbacks(self):
+        d = ContinuousDomain(scipy.stats.uniform, path='a',
+                             callback=lambda x: x * 10)
+        c = CompiledSpace([d])
+        vals = c.sample(20, np.random.default_rng(1))[0]
+        assert np.all((vals >= 0) & (vals < 10))
+
+    def test_custom_distribution(self):
+        d = ContinuousDomain(triangle, path='a')
+        c = CompiledSpace([d])
+        assert list(c.bounds[0]) == [0.0, 1.0]
+        u = np.array([[0.25], [0.81]])
+        assert np.allclose(c.ppf(u)[0], [0.5, 0.9])
+
+        # Domains with the same arguments but different distributions are
+        # kept apart
+        c = CompiledSpace([d, ContinuousDomain(scipy.stats.uniform, path='b')])
+        assert len(c._groups) == 2
+        assert np.allclose(c.ppf(np.array([[0.25, 0.25]]))[1], [0.25])
+
+        c2 = pickle.loads(pickle.dumps(c))
+        assert np.allclose(c2.ppf(u.repeat(2, axis=1))[0], [0.5, 0.9])
+
+    def test_encode_decode(self):
+        c = CompiledSpace(make_domains())
+        rows = [[0.5, 'y', 2, 0.25, -1.0],
+                [0.1, 'z', 1, 0.75, 3.0],
+                [0.9, 'q', 1, 0.5, 0.0]]
+        features = c.encode(rows)
+        assert features.shape == (3, 5)
+        assert list(features[0]) == [0.5, 1, 1, 0.25, -1.0]
+        assert list(features[1]) == [0.1, 2, 0, 0.75, 3.0]
+        assert np.isnan(features[2, 1])
+
+        cols = c.decode(features[:2])
+        decoded = [list(row) for row in zip(*cols)]
+        assert decoded == rows[:2]
+
+        # Fractional and out-of-range indices snap into the domain
+        cols = c.decode([[0.0, 1.6, -3.0, 0.0, 0.0]])
+        assert cols[1][0] == 'z'
+        assert cols[2][0] == 1
+
+    def test_encode_columns(self):
+        values = [[0.5, 'y', 2, 0.25, -1.0],
+                  [0.1, 'zz', 3, 0.75, 3.0],
+                  [0.9, 'x', 1.0, 0.5, 0.0],
+                  [0.9, 'z', True, 0.5, 0.0]]
+        domains = [
+            ContinuousDomain(scipy.stats.uniform, path='a'),
+            DiscreteDomain(['x', 'y', 'z'], path='b'),
+            DiscreteDomain([3, 1, 2, 1], path='c'),
+            DiscreteDomain([[1, 2], {'a': 1}, 'x'], path='d'),
+            DiscreteDomain([1, 'x'], path='e'),
+        ]
+        c = CompiledSpace(domains)
+        assert c._sorted[3] is None and c._sorted[4] is None
+
+        rows = [[0.5, 'y', 2, [1, 2], 'x'],
+                [0.1, 'zz', 3, {'a': 1}, 1],
+                [0.9, 'x', 1.0, 'x', 'q'],
+                [0.9, 'z', True, [3], 1.0]]
+        features = c.encode(rows)
+        for i, row in enumerate(rows):
+            for j, val in enumerate(row[1:], 1):
+                idx = domains[j].map_to_index(val)
+                expected = np.nan if idx is None else idx
+                assert np.isnan(expected) and np.isnan(features[i, j]) or \
+                       expected == features[i, j]
+
+        # Values of a different type than the domain fall back to lookups
+        features = c.encode([[0.5, 1, 'x', 'x', 'x'],
+                             [0.5, 'x', [1], [1, 2], 1]])
+        assert np.isnan(features[0, 1]) and features[1, 1] == 0
+        assert np.isnan(features[0, 2]) and np.isnan(features[1, 2])
+        assert features[1, 3] == 0
+
+    def test_pickle(self):
+        c = CompiledSpace(make_domains())
+        c2 = pickle.loads(pickle.dumps(c))
+        u = np.random.random((10, 5))
+        for x, y in zip(c.ppf(u), c2.ppf(u)):
+            assert list(x) == list(y)
+
+        # Callbacks are left out of the pickled state
+        domains = make_domains()
+        domains[0].callback = lambda x: x * 10
+        c = CompiledSpace(domains)
+        c2 = pickle.loads(pickle.dumps(c))
+        assert c2.callbacks == [None] * 5
+        assert np.all(c2.ppf(u)[0] < 1)
+        c2.attach(domains)
+        assert np.all(c2.ppf(u)[0] == c.ppf(u)[0])
@@ -35,6 +35,23 @@ class TestDomain(object):
         for case in test_cases:
             assert d.map_to_domain(case) is case
 
+    def test_bind(self):
+        d = self.__domain_class__(self.__default_domain__, path='a')
+        b = d.bind('/x/y')
+        assert b is not d
+        assert b.path == '/x/y'
+        assert d.path == 'a'
+        assert b.domain is d.domain
+        assert b._random_state is None
+
+        # Copies are told apart by id and keep their own streams
+        c = d.bind('/x/z')
+        assert len(set([d.id, b.id, c.id])) == 3
+        b.seed(1)
+        c.seed(2)
+        assert b.random_state is not c.random_state
+        assert d._random_state is None
+
     def test_to_json(self):
         d = self.__domain_class__(self.__default_domain__)
         assert d.to_json() == {'type': d.__class__.__name__, 'path': ''}
@@ -74,6 +91,33 @@ class TestContinuousDomain(TestDomain):
         ref = x.rvs(size=1000)
         assert np.all(src == ref)
 
+    def test_generate_batch(self):
+        d = self.__domain_class__(self.__default_domain__,
+                                  random_state=np.random.RandomState(42))
+        x = self.__default_domain__()
+        x.dist.random_state = np.random.RandomState(42)
+
+        src = d.generate(size=1000)
+        assert isinstance(src, np.ndarray)
+        assert src.shape == (1000,)
+        assert np.all(src == x.rvs(size=1000))
+
+        src = d.generate_batch(1000)
+        assert np.all(src == x.rvs(size=1000))
+
+        d = self.__domain_class__(self.__default_domain__,
+                                  callback=lambda v: v + 10)
+        src = d.generate_batch(100)
+        assert np.all(src >= 10) and np.all(src < 11)
+
+    def test_ppf(self):
+        d = self.__domain_class__(self.__default_domain__)
+        assert d.ppf(0.25) == 0.25
+        assert np.all(d.ppf(np.array([0.0, 0.5, 0.75])) == [0.0, 0.5, 0.75])
+
+        d = self.__domain_class__(norm, loc=1.0)
+        assert d.ppf(0.5) == 1.0
+
     def test_to_json(self):
         d = self.__domain_class__(self.__default_domain__)
         res = {
@@ -100,9 +144,32 @@ class TestDiscreteDomain(TestDomain):
             assert val in self.__default_domain__
             assert idx in range(len(self.__default_domain__))
 
+    def test_generate_batch(self):
+        d = self.__domain_class__(self.__default_domain__)
+        vals, idx = d.generate_batch(1000, index=True)
+        assert vals.shape == (1000,)
+        assert idx.shape == (1000,)
+        for val, i in zip(vals, idx):
+            assert val == self.__default_domain__[i]
+
+        # Ensure that unpackable values are stored as-is
+        d = self.__domain_class__([[1, 2], [3, 4], {'a': 1}])
+        vals = d.generate(size=100)
+        assert vals.shape == (100,)
+        for val in vals:
+            assert val in [[1, 2], [3, 4], {'a': 1}]
+
     def test_map_to_domain(self):
         pass
 
+    def test_ppf(self):
+        d = self.__domain_class__(self.__default_domain__)
+        assert d.ppf(0.0) == 1
+        assert d.ppf(0.39) == 2
+        assert d.ppf(0.99) == 5
+        assert list(d.ppf(np.array([0.0, 0.2, 0.4, 0.6, 0.8]))) == \
+            self.__default_domain__
+
     def test_to_json(self):
         d = self.__domain_class__(self.__default_domain__)
         res = {
@@ -131,6 +198,15 @@ class TestExhaustiveDomain(TestDomain):
             assert val in self.__default_domain__
             assert idx == (i % len(self.__default_domain__))
 
+    def test_generate_batch(self):
+        d = self.__domain_class__(self.__default_domain__)
+        vals, idx = d.generate_batch(12, index=True)
+        assert list(idx) == [i % 5 for i in range(12)]
+        assert list(vals) == [self.__default_domain__[i % 5]
+                              for i in range(12)]
+        assert d.idx == 2
+        assert d.generate() == self.__default_domain__[2]
+
     def test_to_json(self):
         d = self.__domain_class__(self.__default_domain__)
         res = {
@@ -140,3 +216,31 @@ class TestExhaustiveDomain(TestDomain):
             'idx': 0
         }
         assert d.to_json() == res
+
+
+@pytest.mark.parametrize('domain_class', [DiscreteDomain, ExhaustiveDomain])
+def test_map_to_index(domain_class):
+    """Value-to-index lookups shared by discrete and exhaustive domains."""
+    values = [1, 2, 3, 4, 5]
+    d = domain_class(values)
+    for i, val in enumerate(values):
+        assert d.map_to_index(val) == i
+    assert d.map_to_index(-1) is None
+    assert d.map_to_index([1]) is None
+
+    # Test unhashable and duplicate values
+    vals = [[1, 2], {'a': [1]}, (1, [2]), 'x', [1, 2], {1, 2}]
+    d = domain_class(vals)
+    assert d.map_to_index([1, 2]) == 0
+    assert d.map_to_index({'a': [1]}) == 1
+    assert d.map_to_index((1, [2])) == 2
+    assert d.map_to_index('x') == 3
+    assert d.map_to_index({1, 2}) == 5
+    assert d.map_to_index((1, 2)) is None
+    assert d.map_to_index({'a': (1,)}) is None
+
+    # Test values that cannot be hashed at all
+    arr = np.arange(3)
+    d = domain_class([1, arr])
+    assert d.map_to_index(1) == 0
+    assert d.map_to_index('a') is None
@@ -0,0 +1,73 @@
+import pytest
+
+from pyrameter.grid import Grid
+
+import itertools
+
+import numpy as np
+
+
+class TestGrid(object):
+    def test_init(self):
+        g = Grid([2, 3, 4])
+        assert g.total == 24
+        assert len(g) == 24
+        assert g.shard == 0
+        assert g.num_shards == 1
+
+        g = Grid([])
+        assert g.total == 1
+        assert len(g) == 1
+        assert g[0] == []
+
+        with pytest.raises(ValueError):
+            Grid([2], shard=1, num_shards=1)
+        with pytest.raises(ValueError):
+            Grid([2], shard=-1, num_shards=2)
+        with pytest.raises(ValueError):
+            Grid([2], num_shards=0)
+
+    def test_config(self):
+        radices = [2, 3, 4]
+        g = Grid(radices)
+        ref = list(itertools.product(*[range(r) for r in radices]))
+        for k in range(g.total):
+            assert tuple(g.config(k)) == ref[k]
+            assert tuple(g[k]) == ref[k]
+
+        # Enumeration wraps around
+        assert tuple(g[24]) == ref[0]
+        assert tuple(g[30]) == ref[6]
+
+    def test_configs(self):
+        radices = [2, 3, 4]
+        g = Grid(radices)
+        ref = np.array(list(itertools.product(*[range(r) for r in radices])))
+        assert np.all(g.configs(0, 24) == ref)
+        assert np.all(g.configs(5, 10) == ref[5:15])
+        assert np.all(g.configs(20, 8) == np.concatenate([ref[20:], ref[:4]]))
+
+        g = Grid([2 ** 40, 2 ** 40])
+        assert np.all(g.configs(2 ** 40 + 1, 2) == [[1, 1], [1, 2]])
+
+    def test_shards(self):
+        radices = [3, 5, 2]
+        total = 30
+        seen = []
+        for s in range(4):
+            g = Grid(radices, shard=s, num_shards=4)
+            points = [tuple(p) for p in g.configs(0, len(g))]
+            assert len(points) == len(g)
+            seen.extend(points)
+        assert len(seen) == total
+        assert len(set(seen)) == total
+
+        # More shards than grid points
+        g = Grid([2], shard=3, num_shards=4)
+        assert len(g) == 0
+        with pytest.raises(IndexError):
+            g[0]
+        with pytest.raises(IndexError):
+            g.configs(0, 1)
+        g = Grid([2], shard=1, num_shards=4)
+        assert [g[i] for i in range(3)] == [[1], [1], [1]]
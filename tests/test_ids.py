@@ -0,0 +1,50 @@
+import pytest
+
+from pyrameter import ids
+from pyrameter.domain import Domain
+from pyrameter.models.model import Model, Result
+
+import multiprocessing
+import os
+
+
+def _child_ids(n):
+    return [ids.new_id() for _ in range(n)]
+
+
+class TestIds(object):
+    def test_id_generator(self):
+        g = ids.IdGenerator()
+        a, b = g(), g()
+        assert isinstance(a, str)
+        assert a != b
+        assert a.split('-')[0] == b.split('-')[0]
+        assert len(a) != 36
+
+        # Separate generators use separate prefixes
+        assert ids.IdGenerator()() != ids.IdGenerator()()
+
+    def test_set_id_generator(self):
+        previous = ids.set_id_generator(ids.uuid_id)
+        try:
+            assert len(Model().id) == 36
+            assert len(Result().id) == 36
+            assert len(Domain().id) == 36
+        finally:
+            ids.set_id_generator(previous)
+
+        ids.set_id_generator()
+        assert isinstance(Model().id, str)
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+    def test_unique_across_processes(self):
+        ctx = multiprocessing.get_context('fork')
+        pool = ctx.Pool(2)
+        try:
+            batches = pool.map(_child_ids, [100] * 4)
+        finally:
+            pool.close()
+            pool.join()
+        batches.append(_child_ids(100))
+        all_ids = [i for batch in batches for i in batch]
+        assert len(set(all_ids)) == len(all_ids)
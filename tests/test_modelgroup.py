@@ -0,0 +1,235 @@
+import pickle
+
+import pytest
+
+import numpy as np
+
+from pyrameter import Scope, ContinuousDomain, DiscreteDomain, build
+from pyrameter.modelgroup import ModelGroup
+from pyrameter.models import RandomSearchModel
+
+from scipy.stats import uniform
+
+
+def wide_scope(n=20):
+    return Scope(a=Scope(exclusive=True,
+                         **{'m{}'.format(i): ContinuousDomain(uniform)
+                            for i in range(n)}),
+                 b=DiscreteDomain([1, 2, 3]))
+
+
+class TestModelGroup(object):
+    def test_init(self):
+        g = ModelGroup()
+        assert len(g) == 0
+        assert g.pending is False
+
+        m = RandomSearchModel()
+        g = ModelGroup(models=m)
+        assert m.id in g
+
+        models = [RandomSearchModel(), RandomSearchModel()]
+        g = ModelGroup(models=models)
+        assert len(g) == 2
+        assert g.model_ids == [m.id for m in models]
+
+    def test_eq(self):
+        g1 = ModelGroup(models=wide_scope().split())
+        g2 = ModelGroup(models=list(reversed(wide_scope().split())))
+        assert g1 == g2
+        assert g1 != ModelGroup(models=wide_scope(n=19).split())
+        assert ModelGroup() == ModelGroup()
+        assert g1 != ModelGroup()
+        assert g1 != 'group'
+
+    def test_generate_output(self):
+        g = ModelGroup(models=wide_scope(n=2).split())
+        model_id, result_id, params = g.generate(output='flat')
+        assert len(params) == 2 and 'b' in params
+        model_id, result_id, params = g.generate(model_id=model_id,
+                                                 output='record')
+        assert params['b'] in [1, 2, 3]
+
+    def test_register_result(self):
+        models = wide_scope(n=3).split()
+        g = ModelGroup(models=models)
+        model_id, result_id, params = g.generate()
+        assert g.find_model(result_id) == model_id
+        submissions, params = g.register_result(result_id=result_id, loss=0.5)
+        assert submissions == 1
+        assert g[model_id].results[-1].loss == 0.5
+
+        # Results generated outside of the group are found once
+        rid, _ = models[2]()
+        assert rid not in g._result_models
+        g.register_result(None, rid, 0.25)
+        assert g._result_models[rid] == models[2].id
+        assert models[2].results[-1].loss == 0.25
+
+        # Passing the model id still works
+        g.register_result(models[2].id, rid, 0.125)
+        assert models[2].results[-1].submissions == 2
+
+        with pytest.raises(KeyError):
+            g.register_result(result_id='missing', loss=1.0)
+        with pytest.raises(KeyError):
+            g.register_result(models[0].id, rid, 1.0)
+
+    def test_lazy(self):
+        g = ModelGroup(models=wide_scope().iter_split())
+        assert len(g) == 0
+        assert g.pending is True
+
+        for _ in range(10):
+            model_id, result_id, params = g.generate()
+            assert model_id in g
+            assert 'a' in params and 'b' in params
+        assert 0 < len(g) <= 20
+
+        g._materialize()
+        assert len(g) == 20
+        assert g.pending is False
+
+        # Uniform selection needs every model up front
+        g = ModelGroup(models=wide_scope().iter_split(),
+                       complexity_sort=False, priority_sort=False)
+        g.generate()
+        assert len(g) == 20
+        assert g.pending is False
+
+    def test_lazy_seed(self):
+        def run():
+            g = ModelGroup(models=wide_scope().iter_split())
+            g.seed(42)
+            g._materialize()
+            return [g.generate(model_id=mid)[-1] for mid in g.model_ids]
+
+        assert run() == run()
+
+    def test_build_seed(self):
+        def run(lazy):
+            g = build(wide_scope(), seed=7, lazy=lazy)
+            out = []
+            for model_id, _, params in [g.generate() for _ in range(20)] + \
+                    g.generate_batch(20):
+                out.append(([d.path for d in g[model_id].domains], params))
+            return out
+
+        for lazy in [False, True]:
+            ref = run(lazy)
+            assert run(lazy) == ref
+            assert len(set(tuple(paths) for paths, _ in ref)) > 1
+
+    def test_generate_batch(self):
+        g = ModelGroup(models=wide_scope(n=3).split())
+        batch = g.generate_batch(50, output='flat')
+        assert len(batch) == 50
+        assert len(set(rid for _, rid, _ in batch)) == 50
+        for model_id, result_id, params in batch:
+            assert g.find_model(result_id) == model_id
+            assert g[model_id].results[-1].id in g[model_id]._result_index
+            assert len(params) == 2 and params['b'] in [1, 2, 3]
+        assert sum(len(m.results) for m in g.models.values()) == 50
+
+        mid = g.model_ids[0]
+        batch = g.generate_batch(5, model_id=mid)
+        assert [b[0] for b in batch] == [mid] * 5
+        assert 'a' in batch[0][2]
+        assert g.generate_batch(5, model_id='missing') == []
+        assert g.generate_batch(0) == []
+
+        # Lazy groups create the models selected by the batch
+        g = ModelGroup(models=wide_scope().iter_split())
+        batch = g.generate_batch(20)
+        assert len(batch) == 20
+        assert all(model_id in g for model_id, _, _ in batch)
+
+    def test_register_results(self):
+        models = wide_scope(n=3).split()
+        for m in models:
+            m.priority_update_freq = 100
+        g = ModelGroup(models=models)
+        batch = g.generate_batch(30)
+        registered = g.register_results(
+            [(rid, float(i)) for i, (_, rid, _) in enumerate(batch)] +
+            [(batch[0][1], None, {'retry': True})])
+        assert len(registered) == 31
+        assert all(r == (1, {}) for r in registered[1:30])
+        submissions, params = registered[-1]
+        assert submissions == 2 and 'a' in params and 'b' in params
+
+        stored = 0
+        for model_id in set(b[0] for b in batch):
+            assert g[model_id].recompute_priority is True
+            stored += len(g[model_id].store)
+        assert stored == 29
+        assert g[batch[1][0]]._result_index[batch[1][1]].loss == 1.0
+
+        # Nothing is registered if any result is missing
+        with pytest.raises(KeyError):
+            g.register_results([(batch[1][1], 5.0), ('missing', 1.0)])
+        assert g[batch[1][0]]._result_index[batch[1][1]].loss == 1.0
+        assert g.register_results([]) == []
+
+    def test_register_results_save(self, tmpdir):
+        g = ModelGroup(models=wide_scope(n=2).split(),
+                       backend=str(tmpdir.join('results.json')))
+        batch = g.generate_batch(4)
+        g.register_results([(rid, 0.5) for _, rid, _ in batch], save=True)
+        assert tmpdir.join('results.json').check()
+
+    def test_selection_table(self):
+        g = ModelGroup(models=wide_scope(n=5).split())
+        table = g._selection_table()
+        assert len(table) == 5
+        g.sort_models()
+        g.generate()
+        assert g._selection_table() is table
+
+        # Changing the set of models rebuilds the table
+        g.remove_model(g.model_ids[0])
+        assert len(g._selection_table()) == 4
+        g.priority_sort = g.complexity_sort = False
+        assert np.allclose(g._selection_table().prob, 1.0)
+
+    def test_sort_models(self):
+        g = ModelGroup(models=wide_scope(n=5).split())
+        for i, mid in enumerate(list(g.model_ids)):
+            g[mid].publish_priority(float(i % 3))
+            g[mid].priority_update_freq = -1
+        g.sort_models()
+        assert g._unranked == set()
+        ranks = [g[mid].rank for mid in g.model_ids]
+        assert ranks == sorted(ranks)
+        order = list(g.model_ids)
+
+        # Sorting again without changes keeps the order
+        g.sort_models()
+        assert g.model_ids == order
+
+        # Only the changed model is read and moves to the front
+        g[order[-1]].publish_priority(100.0)
+        assert g._unranked == set([order[-1]])
+        g.sort_models()
+        assert g.model_ids[0] == order[-1]
+
+        # Changes to models a group model was copied from are seen too
+        child = g[order[1]].copy(parent_inherits_results=True)
+        child.id = 'child'
+        g.add_model(child)
+        g.sort_models()
+        g[order[1]].publish_priority(200.0)
+        assert 'child' in g._unranked
+        g.sort_models()
+        assert g._ranking._keys['child'][1][0] == -200.0
+
+        # Watchers are dropped with the model and are not pickled
+        g.remove_model('child')
+        assert len(g[order[1]]._watchers) == 1
+        assert pickle.loads(pickle.dumps(g[order[1]]))._watchers == []
+
+        g.remove_model(order[0])
+        g.complexity_sort = g.priority_sort = False
+        g.sort_models()
+        assert all(m.rank == 1 for m in g.models.values())
+        assert order[0] not in g.model_ids
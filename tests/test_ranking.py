@@ -0,0 +1,59 @@
+import pytest
+
+import numpy as np
+
+from pyrameter.ranking import RankIndex
+
+
+def full_sort(ids, complexity, priority):
+    """Rank models with three stable sorts, as sort_models used to."""
+    ids = list(ids)
+    rank = dict((mid, 1) for mid in ids)
+    ids.sort(key=lambda m: complexity[m], reverse=True)
+    for i, mid in enumerate(ids):
+        rank[mid] *= i
+    ids.sort(key=lambda m: priority[m], reverse=True)
+    for i, mid in enumerate(ids):
+        rank[mid] *= i
+    ids.sort(key=lambda m: rank[m])
+    return ids, [rank[mid] for mid in ids]
+
+
+class TestRankIndex(object):
+    def test_rank(self):
+        rs = np.random.default_rng(0)
+        ids = ['m{}'.format(i) for i in range(200)]
+        complexity = dict((mid, float(rs.integers(5))) for mid in ids)
+        priority = dict((mid, float(rs.integers(3))) for mid in ids)
+
+        index = RankIndex()
+        for mid in ids:
+            assert index.update(mid, complexity[mid], priority[mid])
+        assert len(index) == 200 and 'm0' in index
+        assert index.changed
+
+        # Matches a stable full sort of models in the order they were added
+        order, ranks = index.rank()
+        assert (order, list(ranks)) == full_sort(ids, complexity, priority)
+        assert not index.changed
+
+        # Unchanged models are not moved
+        assert not index.update('m3', complexity['m3'], priority['m3'])
+        assert not index.changed
+
+        for mid in ['m3', 'm50', 'm199']:
+            priority[mid] = 10.0
+            assert index.update(mid, complexity[mid], priority[mid])
+        index.remove('m7')
+        index.remove('missing')
+        ids.remove('m7')
+        order, ranks = index.rank()
+        assert (order, list(ranks)) == full_sort(ids, complexity, priority)
+
+    def test_rank_single(self):
+        index = RankIndex()
+        for i, c in enumerate([1.0, 3.0, 2.0]):
+            index.update('m{}'.format(i), c, 0.0)
+        order, ranks = index.rank(complexity=True, priority=False)
+        assert order == ['m1', 'm2', 'm0']
+        assert list(ranks) == [0, 1, 2]
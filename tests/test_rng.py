@@ -0,0 +1,98 @@
+import pytest
+
+from pyrameter import rng
+from pyrameter.domain import ContinuousDomain, DiscreteDomain
+from pyrameter.models import RandomSearchModel
+
+import copy
+import pickle
+
+import numpy as np
+from scipy.stats import uniform
+
+
+def test_seed():
+    rng.seed(42)
+    a = rng.default_rng().random(10)
+    b = rng.default_rng().random(10)
+    assert not np.all(a == b)
+
+    rng.seed(42)
+    assert np.all(rng.default_rng().random(10) == a)
+    assert np.all(rng.default_rng().random(10) == b)
+
+    root = np.random.SeedSequence(7)
+    assert rng.seed(root) is root
+
+
+def test_spawn():
+    rng.seed(42)
+    child = rng.spawn()
+    assert isinstance(child, np.random.SeedSequence)
+
+    children = rng.spawn(4)
+    assert len(children) == 4
+    draws = [rng.default_rng(c).random() for c in children]
+    assert len(set(draws)) == 4
+
+    parent = np.random.SeedSequence(3)
+    c1 = rng.spawn(2, parent=np.random.SeedSequence(3))
+    c2 = rng.spawn(2, parent=parent)
+    assert rng.default_rng(c1[1]).random() == rng.default_rng(c2[1]).random()
+
+
+def test_default_rng():
+    r = rng.default_rng(1)
+    assert isinstance(r, np.random.Generator)
+    assert r.random() == rng.default_rng(1).random()
+
+    # Streams should be cheap to copy and pickle.
+    assert len(pickle.dumps(r)) < 1024
+    assert copy.deepcopy(r).random() == r.random()
+
+
+def test_integers():
+    for r in [rng.default_rng(1), np.random.RandomState(1)]:
+        i = rng.integers(r, 10)
+        assert 0 <= i < 10
+        ints = rng.integers(r, 10, size=100)
+        assert ints.shape == (100,)
+        assert np.all(ints >= 0) and np.all(ints < 10)
+
+
+def test_domain_streams():
+    d = ContinuousDomain(uniform)
+    assert d._random_state is None
+    d2 = copy.deepcopy(d)
+    assert d.generate() != d2.generate()
+
+    d.seed(3)
+    d2.seed(3)
+    assert np.all(d.generate(size=10) == d2.generate(size=10))
+
+    d = DiscreteDomain(list(range(100)))
+    d2 = DiscreteDomain(list(range(100)))
+    d.seed(3)
+    d2.seed(3)
+    assert np.all(d.generate(size=10) == d2.generate(size=10))
+
+
+def test_model_seed():
+    d1 = ContinuousDomain(uniform, path='a')
+    d2 = DiscreteDomain(list(range(1000)), path='b')
+    m = RandomSearchModel(domains=[d1, d2])
+
+    m.seed(42)
+    a = m.generate(size=10)
+    b = m.generate()
+    m.seed(42)
+    assert m.generate(size=10) == a
+    assert m.generate() == b
+
+    # Domains shared with other models are left alone
+    assert d1._random_state is None and d2._random_state is None
+    m2 = RandomSearchModel(domains=[d1, d2])
+    m2.seed(42)
+    m.seed(42)
+    assert m2.generate(size=10) == a
+    assert m.generate(size=10) == a
@@ -0,0 +1,142 @@
+import pytest
+
+import numpy as np
+from scipy.stats import uniform
+
+from pyrameter import Scope, ContinuousDomain, build
+from pyrameter.modelgroup import ModelGroup
+from pyrameter.scheduler import Scheduler, UCBScheduler, ThompsonScheduler, \
+                                SuccessiveRejectsScheduler, get_scheduler, \
+                                InvalidSchedulerError, MissingBudgetError
+
+
+def scope(n=4):
+    return Scope(exclusive=True,
+                 **{'m{}'.format(i): ContinuousDomain(uniform)
+                    for i in range(n)})
+
+
+def run(group, n, offsets):
+    """Evaluate n results, with losses offset by each model's rank."""
+    rs = np.random.default_rng(0)
+    for _ in range(n):
+        model_id, result_id, params = group.generate()
+        loss = offsets[model_id] + rs.random() * 0.1
+        group.register_result(result_id=result_id, loss=loss)
+
+
+class TestScheduler(object):
+    def test_stats(self):
+        s = Scheduler()
+        with pytest.raises(ValueError):
+            s.select()
+        for i in range(40):
+            s.add_model('m{}'.format(i))
+        s.add_model('m0')
+        assert len(s) == 40 and 'm39' in s
+        assert np.all(s.active)
+
+        s.update('m1', 1.0)
+        s.update('m1', 3.0)
+        s.update('m1', None)
+        s.update('m1', np.inf)
+        s.update('missing', 1.0)
+        assert s.counts[1] == 2
+        assert s.means()[1] == 2.0
+        assert np.isnan(s.means()[0])
+
+        # Re-registered losses replace the previous one
+        s.update('m1', 5.0, previous=3.0)
+        assert s.counts[1] == 2 and s.means()[1] == 3.0
+        assert s.normalized_means()[1] == 0.5
+
+        s.remove_model('m0')
+        assert 'm0' not in s and len(s) == 39
+        assert s.means()[s.model_ids.index('m1')] == 3.0
+
+        with pytest.raises(NotImplementedError):
+            s.select()
+
+    def test_get_scheduler(self):
+        assert isinstance(get_scheduler('ucb'), UCBScheduler)
+        assert isinstance(get_scheduler('thompson'), ThompsonScheduler)
+        s = get_scheduler('successive_rejects', budget=10)
+        assert isinstance(s, SuccessiveRejectsScheduler)
+        assert get_scheduler(s) is s
+        with pytest.raises(InvalidSchedulerError):
+            get_scheduler('planck')
+        with pytest.raises(InvalidSchedulerError):
+            get_scheduler(1)
+
+        # Successive rejects cannot run without a budget
+        with pytest.raises(MissingBudgetError) as err:
+            get_scheduler('successive_rejects')
+        assert 'SuccessiveRejectsScheduler(budget=' in str(err.value)
+        assert get_scheduler('successive_rejects', 10).budget == 10
+        with pytest.raises(MissingBudgetError):
+            build(scope(), scheduler='successive_rejects')
+        g = build(scope(), scheduler=SuccessiveRejectsScheduler(budget=10))
+        assert g.generate()[0] in g
+
+
+class TestPolicies(object):
+    def make_group(self, scheduler):
+        g = ModelGroup(models=scope().split(), scheduler=scheduler)
+        g.seed(1)
+        offsets = {mid: float(i) for i, mid in enumerate(g.model_ids)}
+        return g, offsets
+
+    def counts(self, g):
+        s = g.scheduler
+        return dict(zip(s.model_ids, s.counts))
+
+    def test_ucb(self):
+        g, offsets = self.make_group('ucb')
+        best = min(offsets, key=offsets.get)
+
+        # Every model is tried before any is repeated
+        assert sorted(g.scheduler.select(size=4)) == sorted(g.model_ids)
+        run(g, 200, offsets)
+        counts = self.counts(g)
+        assert counts[best] == max(counts.values())
+        assert all(c >= 1 for c in counts.values())
+
+    def test_thompson(self):
+        g, offsets = self.make_group('thompson')
+        best = min(offsets, key=offsets.get)
+        run(g, 200, offsets)
+        counts = self.counts(g)
+        assert counts[best] > 100
+
+    def test_successive_rejects(self):
+        g, offsets = self.make_group(SuccessiveRejectsScheduler(budget=100))
+        s = g.scheduler
+        assert s.round_size(1) < s.round_size(3)
+        run(g, 100, offsets)
+        best = min(offsets, key=offsets.get)
+        assert s.phase == 4
+        assert list(np.array(s.model_ids)[s.active]) == [best]
+
+    def test_group(self, tmpdir):
+        g = build(scope(), db=str(tmpdir), scheduler='ucb', seed=3)
+        assert len(g.scheduler) == 4
+
+        # Batches and bulk registration update the scheduler
+        batch = g.generate_batch(8)
+        g.register_results([(rid, 1.0) for _, rid, _ in batch])
+        assert g.scheduler.counts.sum() == 8
+        assert g.scheduler.pulls.sum() == 8
+
+        # Losses registered before the scheduler are replayed
+        g = ModelGroup(models=scope().split())
+        model_id, result_id, _ = g.generate()
+        g.register_result(result_id=result_id, loss=2.0)
+        g.set_scheduler('thompson')
+        assert g.scheduler.means()[g.scheduler.model_ids.index(model_id)] \
+            == 2.0
+
+        g.remove_model(model_id)
+        assert model_id not in g.scheduler
+        assert g.generate()[0] != model_id
+        g.set_scheduler(None)
+        assert g.generate()[0] in g
@@ -6,9 +6,21 @@ from pyrameter.domain import Domain, ContinuousDomain, DiscreteDomain, \
                              ExhaustiveDomain
 from pyrameter.models import RandomSearchModel, TPEModel, GPBayesModel
 
+import multiprocessing
+
+import numpy as np
+
 from scipy.stats import uniform
 
 
+class WorkerOnlyDomain(DiscreteDomain):
+    """Domain that fails to bind in worker processes only."""
+    def bind(self, path):
+        if multiprocessing.current_process().name != 'MainProcess':
+            raise TypeError('Cannot bind in a worker.')
+        return super(WorkerOnlyDomain, self).bind(path)
+
+
 class TestScope(object):
     def test_init(self):
         # Test the default initialization.
@@ -657,3 +669,267 @@ class TestScope(object):
                RandomSearchModel()]
         for scope in s.split():
             assert any(map(lambda r: scope == r, res))
+
+    def nested_specs(self):
+        return [
+            Scope(),
+            Scope(a=ContinuousDomain(uniform), b=DiscreteDomain([1, 2, 3])),
+            Scope(a=ContinuousDomain(uniform), b=DiscreteDomain([1, 2, 3]),
+                  exclusive=True, optional=True),
+            Scope(a=Scope(b=ContinuousDomain(uniform),
+                          c=DiscreteDomain([1, 2, 3]), exclusive=True),
+                  d=Scope(e=ExhaustiveDomain([1, 2]), optional=True),
+                  f=Scope(g=Scope(h=1, i=2, exclusive=True),
+                          j=Scope(k=3, optional=True)),
+                  l=4),
+            Scope(a=Scope(b=ContinuousDomain(uniform),
+                          c=Scope(d=1, e=2, exclusive=True)),
+                  f=Scope(g=3, h=Scope(i=4, optional=True)),
+                  exclusive=True),
+            Scope(a={'b': 1, 'c': {'d': 2, 'e': 3, 'exclusive': True}}),
+        ]
+
+    def test_iter_split(self):
+        for s in self.nested_specs():
+            models = s.split()
+            assert len(set(m.id for m in models)) == len(models)
+            eager = [[d.path for d in m.domains] for m in models]
+            lazy = s.iter_split()
+            assert not isinstance(lazy, list)
+            lazy = [[d.path for d in m.domains] for m in lazy]
+            assert lazy == eager
+
+        # Models are created one at a time
+        s = Scope(a=Scope(b=1, c=2, exclusive=True),
+                  d=Scope(e=3, f=4, exclusive=True))
+        models = s.iter_split()
+        assert [d.path for d in next(models).domains] == ['/a/b', '/d/e']
+        assert [d.path for d in next(models).domains] == ['/a/b', '/d/f']
+
+    def test_count_models(self):
+        for s in self.nested_specs():
+            assert s.count_models() == len(s.split())
+
+        assert Scope().count_models() == 1
+        assert Scope(exclusive=True).count_models() == 0
+        assert Scope(exclusive=True, optional=True).count_models() == 1
+
+    def test_total_complexity(self):
+        for s in self.nested_specs():
+            ref = sum(m.complexity for m in s.split())
+            assert abs(s.total_complexity() - ref) < 1e-9
+
+    def test_model_at(self):
+        for s in self.nested_specs():
+            models = s.split()
+            for i in range(len(models)):
+                ref = [(d.path, d.to_json()) for d in models[i].domains]
+                m = s.model_at(i)
+                assert [(d.path, d.to_json()) for d in m.domains] == ref
+                assert isinstance(m, type(models[i]))
+            if models:
+                m = s.model_at(-1)
+                assert [d.path for d in m.domains] == \
+                    [d.path for d in models[-1].domains]
+            with pytest.raises(IndexError):
+                s.model_at(len(models))
+            with pytest.raises(IndexError):
+                s.model_at(-len(models) - 1)
+
+        # Indexing works on trees far too large to split
+        s = Scope(**{'s{}'.format(i): Scope(a=1, b=2, c=3, exclusive=True)
+                     for i in range(40)})
+        assert s.count_models() == 3 ** 40
+        m = s.model_at(3 ** 40 - 1)
+        assert len(m.domains) == 40
+        assert all(d.path.endswith('/c') for d in m.domains)
+
+    def test_model_at_counts_once(self, monkeypatch):
+        # Each scope is tallied once per lookup, however deep it is
+        def chain(depth):
+            if depth == 0:
+                return Scope(a=1, b=2, exclusive=True)
+            return Scope(x=chain(depth - 1), y=chain(depth - 1),
+                         exclusive=depth % 2 == 0, optional=True)
+
+        s = chain(6)
+        tally = Scope._Scope__tally
+        calls = []
+
+        def counting(self, leaf, dedupe):
+            calls.append(self)
+            return tally(self, leaf, dedupe)
+
+        monkeypatch.setattr(Scope, '_Scope__tally', counting)
+        n = s.count_models()
+        assert len(calls) == 2 ** 7 - 1
+        del calls[:]
+        s.model_at(n // 3)
+        assert len(calls) == 2 ** 7 - 1
+        monkeypatch.undo()
+        ref = s.split()[n // 3]
+        assert [d.path for d in s.model_at(n // 3).domains] == \
+            [d.path for d in ref.domains]
+
+    def test_split_shares_domains(self):
+        values = list(range(1000))
+        s = Scope(a=Scope(b=DiscreteDomain(values), c=1, exclusive=True),
+                  d=Scope(e=2, f=3, exclusive=True))
+
+        # Each leaf is bound once and shared by every model containing it.
+        for models in [s.split(), list(s.iter_split()),
+                       [s.model_at(i) for i in range(s.count_models())]]:
+            leaves = {}
+            for m in models:
+                for d in m.domains:
+                    assert leaves.setdefault(d.path, d) is d
+            assert leaves['/a/b'].domain is values
+
+        # Dict children are converted once, so their leaves are shared too
+        s = Scope(a={'b': DiscreteDomain(values), 'c': 1, 'exclusive': True},
+                  d=Scope(e=2, f=3, exclusive=True), model='tpe')
+        assert isinstance(s['a'], Scope)
+        assert s['a'].model is TPEModel
+        assert s == Scope(a=Scope(b=DiscreteDomain(values), c=1,
+                                  exclusive=True),
+                          d=Scope(e=2, f=3, exclusive=True))
+        leaves = {}
+        for m in s.iter_split():
+            for d in m.domains:
+                assert leaves.setdefault(d.path, d) is d
+        assert s['a']._leaves['/a/b'][1] is leaves['/a/b']
+
+    def test_content_hash(self):
+        hashes = [s.content_hash() for s in self.nested_specs()]
+        assert len(set(hashes)) == len(hashes)
+        assert hashes == [s.content_hash() for s in self.nested_specs()]
+
+        # Domain paths and iteration state do not affect the hash
+        d = ExhaustiveDomain([1, 2])
+        s = Scope(a=d)
+        h = s.content_hash()
+        d.generate()
+        s.split()
+        assert s.content_hash() == h
+
+        # Flags, strategy, domain parameters and child order do
+        assert Scope(a=d, optional=True).content_hash() != h
+        assert Scope(a=d, exclusive=True).content_hash() != h
+        assert Scope(a=d, model='tpe').content_hash() != h
+        assert Scope(a=ExhaustiveDomain([1, 3])).content_hash() != h
+        assert Scope(a=ContinuousDomain(uniform, loc=1)).content_hash() != \
+            Scope(a=ContinuousDomain(uniform)).content_hash()
+        assert Scope(('a', 1), ('b', 2)).content_hash() != \
+            Scope(('b', 2), ('a', 1)).content_hash()
+        assert Scope(a={'b': 1}).content_hash() == \
+            Scope(a=Scope(b=1)).content_hash()
+
+    def test_dedupe(self):
+        specs = self.nested_specs() + [
+            Scope(a=Scope(b=1, optional=True), optional=True),
+            Scope(a=Scope(b=1, optional=True), c=Scope(d=2, optional=True),
+                  exclusive=True, optional=True),
+            Scope(a=Scope(b=Scope(c=1, optional=True),
+                          d=Scope(e=2, optional=True)),
+                  f=Scope(g=Scope(exclusive=True, optional=True),
+                          h=Scope(), exclusive=True),
+                  optional=True),
+            Scope(a=Scope(b=Scope(c=1, optional=True),
+                          d=Scope(e=2, optional=True), optional=True),
+                  f=Scope(g=3, h=Scope(optional=True), exclusive=True)),
+        ]
+        for s in specs:
+            for dedupe in [True, False]:
+                models = s.split(dedupe=dedupe)
+                sigs = [m.signature for m in models]
+                if dedupe:
+                    assert len(set(sigs)) == len(sigs)
+                    assert set(sigs) == \
+                        set(m.signature for m in s.split(dedupe=False))
+
+                lazy = list(s.iter_split(dedupe=dedupe))
+                assert [m.signature for m in lazy] == sigs
+
+                assert s.count_models(dedupe=dedupe) == len(models)
+                ref = sum(m.complexity for m in models)
+                assert abs(s.total_complexity(dedupe=dedupe) - ref) < 1e-9
+                assert [s.model_at(i, dedupe=dedupe).signature
+                        for i in range(len(models))] == sigs
+
+        s = Scope(a=Scope(b=1, optional=True), optional=True)
+        assert len(s.split(dedupe=False)) == 3
+        assert len(s.split()) == 2
+        assert len(s.split()[-1].domains) == 0
+
+        # The kept empty model comes last, wherever its duplicates were
+        s = Scope(a=Scope(x=DiscreteDomain([1]), optional=True),
+                  y=DiscreteDomain([2]), exclusive=True)
+        assert [[d.path for d in m.domains] for m in s.split()] == \
+            [['/a/x'], ['/y'], []]
+
+    def test_dedupe_random(self):
+        rng = np.random.RandomState(11)
+
+        def random_scope(depth, counter):
+            children = {}
+            for _ in range(rng.randint(0, 4)):
+                counter[0] += 1
+                name = 'c{}'.format(counter[0])
+                if depth > 0 and rng.rand() < 0.5:
+                    children[name] = random_scope(depth - 1, counter)
+                else:
+                    children[name] = DiscreteDomain([counter[0]])
+            return Scope(exclusive=bool(rng.rand() < 0.5),
+                         optional=bool(rng.rand() < 0.5), **children)
+
+        for _ in range(200):
+            s = random_scope(3, [0])
+            eager = [[d.path for d in m.domains] for m in s.split(dedupe=True)]
+            lazy = [[d.path for d in m.domains]
+                    for m in s.iter_split(dedupe=True)]
+            assert lazy == eager
+            indexed = [[d.path for d in s.model_at(i, dedupe=True).domains]
+                       for i in range(s.count_models(dedupe=True))]
+            assert indexed == eager
+
+    def test_split_parallel(self):
+        specs = self.nested_specs() + [
+            Scope(exclusive=True, **{
+                's{}'.format(i): Scope(a=Scope(b=1, c=2, exclusive=True),
+                                       d=ContinuousDomain(uniform),
+                                       optional=True)
+                for i in range(6)}),
+        ]
+        for s in specs:
+            serial = s.split()
+            parallel = s.split(n_jobs=2)
+            assert [m.signature for m in parallel] == \
+                [m.signature for m in serial]
+            assert [type(m) for m in parallel] == [type(m) for m in serial]
+            assert len(set(m.id for m in parallel)) == len(parallel)
+
+        # Unpicklable sub-scopes are split serially
+        s = Scope(a=Scope(b=ContinuousDomain(uniform, callback=lambda x: x)),
+                  c=Scope(d=1), exclusive=True)
+        assert [[d.path for d in m.domains] for m in s.split(n_jobs=2)] == \
+            [['/a/b'], ['/c/d']]
+
+    def test_split_parallel_fallback(self, monkeypatch):
+        # Falling back splits the whole subtree serially
+        def no_pool(*args, **kwargs):
+            raise AssertionError('Pool created after falling back')
+
+        monkeypatch.setattr(multiprocessing, 'Pool', no_pool)
+        s = Scope(a=Scope(b=ContinuousDomain(uniform, callback=lambda x: x),
+                          x=Scope(d=1), y=Scope(e=2), exclusive=True),
+                  c=Scope(f=3), exclusive=True)
+        assert [[d.path for d in m.domains] for m in s.split(n_jobs=2)] == \
+            [['/a/b'], ['/a/x/d'], ['/a/y/e'], ['/c/f']]
+
+    def test_split_parallel_errors(self):
+        # Errors raised while splitting in a worker are not swallowed
+        s = Scope(a=Scope(b=WorkerOnlyDomain([1])), c=Scope(d=1),
+                  exclusive=True)
+        with pytest.raises(TypeError):
+            s.split(n_jobs=2)
+        assert len(s.split()) == 2
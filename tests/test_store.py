@@ -0,0 +1,119 @@
+import pytest
+
+from pyrameter.store import ResultStore
+from pyrameter.models.model import Model, Result, Value
+from pyrameter.domain import ContinuousDomain, DiscreteDomain
+
+import numpy as np
+from scipy.stats import uniform
+
+
+def make_result(m, d1, d2, a, b, loss=None):
+    return Result(m, loss=loss, values=[Value(a, d1), Value(b, d2)])
+
+
+class TestResultStore(object):
+    def test_update(self):
+        d1 = ContinuousDomain(uniform, path='/a')
+        d2 = DiscreteDomain(['x', 'y', 'z'], path='/b')
+        m = Model(domains=[d1, d2])
+        s = ResultStore(2, capacity=1)
+        assert len(s) == 0
+        assert s.data.shape == (0, 3)
+
+        results = [make_result(m, d1, d2, 0.5, 'y', 1.0),
+                   make_result(m, d1, d2, 0.25, 'z'),
+                   make_result(m, d1, d2, 0.75, 'x', np.inf),
+                   make_result(m, d1, d2, 0.125, 'z', 3.0)]
+        for r in results:
+            s.update(r)
+        assert len(s) == 2
+        assert results[1].id not in s
+        assert np.all(s.features == [[0.5, 1], [0.125, 2]])
+        assert np.all(s.losses == [1.0, 3.0])
+
+        # Views share memory with the store
+        assert np.shares_memory(s.data, s.features)
+        s.data[0, -1] = 2.0
+        assert s.losses[0] == 2.0
+
+        # Registering a loss adds a row, updating one overwrites it
+        results[1].loss = 4.0
+        s.update(results[1])
+        results[0].loss = 5.0
+        s.update(results[0])
+        assert np.all(s.losses == [5.0, 3.0, 4.0])
+
+        # Removing a row moves the last row into its place
+        results[0].loss = None
+        s.update(results[0])
+        assert np.all(s.losses == [4.0, 3.0])
+        assert np.all(s.features[0] == [0.25, 2])
+        results[3].loss = np.nan
+        s.update(results[3])
+        assert np.all(s.losses == [4.0])
+
+        # Mismatched results are not stored
+        s.update(Result(m, loss=1.0, values=[Value(0.5, d1)]))
+        assert len(s) == 1
+
+    def test_model_store(self):
+        d1 = ContinuousDomain(uniform, path='/a')
+        d2 = DiscreteDomain(['x', 'y', 'z'], path='/b')
+        m = Model(domains=[d1, d2])
+        m.add_result(make_result(m, d1, d2, 0.5, 'y', 1.0))
+        r = make_result(m, d1, d2, 0.25, 'x')
+        m.add_result(r)
+
+        # Built from existing results on first access
+        vec = m.results_to_feature_vector()
+        assert vec.dtype == np.float32
+        assert np.all(vec == [[0.5, 1, 1.0]])
+        assert m.results_to_feature_vector().base is m.store._data
+
+        # Kept up to date by registration
+        m.register_result(r.id, 2.0)
+        assert np.all(m.results_to_feature_vector() == [[0.5, 1, 1.0],
+                                                        [0.25, 0, 2.0]])
+        m.add_result(make_result(m, d1, d2, 0.125, 'z', 3.0))
+        assert len(m.store) == 3
+
+        # Parents sharing results are updated too
+        c = m.copy(parent_inherits_results=True)
+        r = make_result(c, d1, d2, 0.0, 'x')
+        c.add_result(r)
+        assert len(m.store) == 3
+        c.register_result(r.id, 4.0)
+        assert len(c.store) == 4
+        assert len(m.store) == 4
+
+        # Adding a domain rebuilds the store
+        m.add_domain(DiscreteDomain([1], path='/c'))
+        assert m.store.width == 3
+        assert len(m.store) == 0
+
+    def test_compiled_store(self):
+        d1 = ContinuousDomain(uniform, path='/a')
+        d2 = DiscreteDomain(['x', 'y', 'z'], path='/b')
+        m = Model(domains=[d1, d2])
+        results = [make_result(m, d1, d2, 0.5, 'y', 1.0),
+                   make_result(m, d1, d2, 0.25, 'q', 2.0),
+                   make_result(m, d1, d2, 0.75, 'x'),
+                   make_result(m, d1, d2, 0.125, 'z', 3.0)]
+        for r in results:
+            m.add_result(r)
+        expected = np.array(m.results_to_feature_vector())
+
+        # Compiling rebuilds the store with the compiled encoder
+        m.compile()
+        assert m.store.space is m.compiled
+        vec = m.results_to_feature_vector()
+        assert np.array_equal(vec, expected, equal_nan=True)
+
+        # Bulk and single updates encode alike
+        s = ResultStore(2, capacity=1, space=m.compiled)
+        s.update(results[0])
+        s.extend(results)
+        assert np.array_equal(s.data, expected, equal_nan=True)
+        m.register_result(results[2].id, 4.0)
+        assert np.all(m.store.data[-1] == [0.75, 0, 4.0])
@@ -0,0 +1,69 @@
+import pytest
+
+from pyrameter.template import OutputTemplate
+
+import numpy as np
+
+
+class TestOutputTemplate(object):
+    def test_init(self):
+        t = OutputTemplate(['/a', '/b/c', '/b/d', 'e', '/f/g/h'])
+        assert len(t) == 5
+        assert t.keys == ['a', 'b/c', 'b/d', 'e', 'f/g/h']
+
+        t = OutputTemplate([])
+        assert len(t) == 0
+        assert t.nested([]) == {}
+
+    def test_nested(self):
+        t = OutputTemplate(['/a', '/b/c', '/b/d', '/f/g/h', ''])
+        params = t.nested([1, 2.0, 'x', [4], None])
+        assert params == {'a': 1, 'b': {'c': 2.0, 'd': 'x'},
+                          'f': {'g': {'h': [4]}}, '': None}
+
+        # Templates are reusable
+        params = t.nested([5, 6, 7, 8, 9])
+        assert params == {'a': 5, 'b': {'c': 6, 'd': 7}, 'f': {'g': {'h': 8}},
+                          '': 9}
+
+    def test_flat(self):
+        t = OutputTemplate(['/a', '/b/c'])
+        assert t.flat([1, 'x']) == {'a': 1, 'b/c': 'x'}
+        assert t.fill([1, 'x'], output='flat') == {'a': 1, 'b/c': 'x'}
+
+    def test_record(self):
+        t = OutputTemplate(['/a', '/b/c', '/d', '/e'])
+        r = t.fill([1, np.float64(2.5), 'xy', {'k': 1}], output='record')
+        assert isinstance(r, np.record)
+        assert r['a'] == 1
+        assert r['b/c'] == 2.5
+        assert r['d'] == 'xy'
+        assert r['e'] == {'k': 1}
+        assert r.dtype['b/c'] == np.float64
+        assert r.dtype['e'] == object
+
+        with pytest.raises(ValueError):
+            t.fill([1, 2, 3, 4], output='tree')
+
+    def test_record_dtype(self):
+        t = OutputTemplate(['/a', '/b', '/c'])
+        r = t.record([1, 'xy', 0.5])
+        dtype = t._record_dtype
+        assert r.dtype == dtype
+
+        # Records with the same types reuse the dtype
+        r = t.record([2, 'z', 1.5])
+        assert t._record_dtype is dtype
+        assert (r['a'], r['b'], r['c']) == (2, 'z', 1.5)
+
+        # Longer strings, other types and overflowing values rebuild it
+        r = t.record([3, 'xyz', 2.5])
+        assert r['b'] == 'xyz'
+        assert t._record_dtype is not dtype
+        r = t.record([4.5, 'x', [1]])
+        assert r['a'] == 4.5 and r['c'] == [1]
+        assert r.dtype['c'] == object
+        r = t.record([1, 'x', 0.5])
+        assert r.dtype['a'] == np.asarray(1).dtype
+        r = t.record([2 ** 70, 'x', 0.5])
+        assert r['a'] == 2 ** 70